@@ -4,11 +4,27 @@ from rest_framework_simplejwt.views import TokenRefreshView
 
 from api.v1.views.auth import RegisterView, LoginView, LogoutView
 from api.v1.views.book import BookViewSet
-from api.v1.views.chapter import ChapterDetailView, ChapterMusicView, MusicLikeView, MusicDeleteView
+from api.v1.views.chapter import (
+    ChapterDetailView,
+    ChapterMusicView,
+    MusicLikeView,
+    MusicDeleteView,
+    MusicTopView,
+)
 from api.v1.views.author import AuthorDetailView, AuthorFollowView
 from api.v1.views.comment import CommentCreateView, CommentDeleteView
+from api.v1.views.genre import GenreFacetsView
+from api.v1.views.health import UpstreamStatusView
 from api.v1.views.playlist import PlaylistDetailView, PlaylistLikeView, PlaylistTracksView
-from api.v1.views.search import MusicSearchView, BookSearchView
+from api.v1.views.search import (
+    MusicSearchView,
+    BookSearchView,
+    SuggestView,
+    AsyncMusicSearchView,
+    AsyncBookSearchView,
+    combined_search_view,
+    federated_music_search_view,
+)
 from api.v1.views.verification import AuthorVerificationView
 from api.v1.views.profile import (
     ProfileMeView,
@@ -16,6 +32,7 @@ from api.v1.views.profile import (
     ProfilePlaylistsView,
     ProfileRecommendationsView,
     ProfileNotificationsView,
+    ProfileNotificationsCountView,
     ProfileNotificationsReadView,
 )
 
@@ -29,10 +46,12 @@ urlpatterns = [
             path("", include(router.urls)),
             path("chapters/<int:pk>/", ChapterDetailView.as_view()),
             path("chapters/<int:pk>/music/", ChapterMusicView.as_view()),
+            path("music/top/", MusicTopView.as_view()),
             path("music/<int:pk>/like/", MusicLikeView.as_view()),
             path("music/<int:pk>/", MusicDeleteView.as_view()),
             path("authors/<slug:slug>/", AuthorDetailView.as_view()),
             path("authors/<slug:slug>/follow/", AuthorFollowView.as_view()),
+            path("genres/facets/", GenreFacetsView.as_view()),
             path("playlists/<slug:slug>/", PlaylistDetailView.as_view()),
             path("playlists/<slug:slug>/like/", PlaylistLikeView.as_view()),
             path("playlists/<slug:slug>/tracks/", PlaylistTracksView.as_view()),
@@ -40,6 +59,12 @@ urlpatterns = [
             path("comments/<int:pk>/", CommentDeleteView.as_view()),
             path("search/music/", MusicSearchView.as_view()),
             path("search/books/", BookSearchView.as_view()),
+            path("search/suggest/", SuggestView.as_view()),
+            path("search/music/async/", AsyncMusicSearchView.as_view()),
+            path("search/music/all/", federated_music_search_view),
+            path("search/books/async/", AsyncBookSearchView.as_view()),
+            path("search/all/", combined_search_view),
+            path("health/upstreams/", UpstreamStatusView.as_view()),
             path("author-verification/", AuthorVerificationView.as_view()),
             path("auth/register/", RegisterView.as_view()),
             path("auth/login/", LoginView.as_view()),
@@ -50,6 +75,7 @@ urlpatterns = [
             path("profile/playlists/", ProfilePlaylistsView.as_view()),
             path("profile/recommendations/", ProfileRecommendationsView.as_view()),
             path("profile/notifications/", ProfileNotificationsView.as_view()),
+            path("profile/notifications/count/", ProfileNotificationsCountView.as_view()),
             path("profile/notifications/read/", ProfileNotificationsReadView.as_view()),
         ]),
     ),
@@ -1,6 +1,8 @@
 import django_filters
+from rest_framework.filters import OrderingFilter
 
 from core.models import Book, Genre
+from core.search import search_books
 
 
 class BookFilter(django_filters.FilterSet):
@@ -19,9 +21,13 @@ class BookFilter(django_filters.FilterSet):
         ).distinct() | queryset.filter(genre_legacy__iexact=value)
 
     def filter_search(self, queryset, name, value):
-        from django.db.models import Q
-        return queryset.filter(
-            Q(translations__title__icontains=value)
-            | Q(author__translations__name__icontains=value)
-            | Q(author_legacy__icontains=value)
-        ).distinct()
+        return search_books(queryset, value)
+
+
+class SearchRankOrderingFilter(OrderingFilter):
+    """Orders ``?search=`` results by relevance unless ``?ordering=`` is given."""
+
+    def get_default_ordering(self, view):
+        if view.request.query_params.get("search", "").strip():
+            return ("-search_rank", "-created_at")
+        return super().get_default_ordering(view)
@@ -7,7 +7,26 @@ from .mixins import LangMixin
 from .music import PlaylistSerializer
 
 
-class BookListSerializer(LangMixin, serializers.ModelSerializer):
+class CardStatsMixin(LangMixin):
+    """
+    Prefers the values annotated by ``BookQuerySet.with_card_stats`` and only
+    falls back to the per-object model accessors when they are missing.
+    """
+
+    def get_title(self, obj: Book) -> str:
+        title = getattr(obj, "card_title", None)
+        return title if title is not None else obj.get_title(self._lang())
+
+    def get_author_name(self, obj: Book) -> str:
+        name = getattr(obj, "card_author_name", None)
+        return name if name is not None else obj.get_author_name(self._lang())
+
+    def get_genre(self, obj: Book) -> str:
+        name = getattr(obj, "card_genre_name", None)
+        return name if name is not None else obj.get_genre_name(self._lang())
+
+
+class BookListSerializer(CardStatsMixin, serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
     author_name = serializers.SerializerMethodField()
     genre = serializers.SerializerMethodField()
@@ -29,23 +48,16 @@ class BookListSerializer(LangMixin, serializers.ModelSerializer):
             "created_at",
         )
 
-    def get_title(self, obj: Book) -> str:
-        return obj.get_title(self._lang())
-
-    def get_author_name(self, obj: Book) -> str:
-        return obj.get_author_name(self._lang())
-
-    def get_genre(self, obj: Book) -> str:
-        return obj.get_genre_name(self._lang())
-
     def get_cover_url(self, obj: Book) -> str | None:
         return obj.get_cover()
 
     def get_chapters_count(self, obj: Book) -> int:
+        if hasattr(obj, "approved_chapters_count"):
+            return obj.approved_chapters_count
         return obj.chapters.filter(is_approved=True).count()
 
 
-class BookDetailSerializer(LangMixin, serializers.ModelSerializer):
+class BookDetailSerializer(CardStatsMixin, serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     author_name = serializers.SerializerMethodField()
@@ -77,18 +89,9 @@ class BookDetailSerializer(LangMixin, serializers.ModelSerializer):
             "playlists",
         )
 
-    def get_title(self, obj: Book) -> str:
-        return obj.get_title(self._lang())
-
     def get_description(self, obj: Book) -> str:
         return obj.get_description(self._lang())
 
-    def get_author_name(self, obj: Book) -> str:
-        return obj.get_author_name(self._lang())
-
-    def get_genre(self, obj: Book) -> str:
-        return obj.get_genre_name(self._lang())
-
     def get_cover_url(self, obj: Book) -> str | None:
         return obj.get_cover()
 
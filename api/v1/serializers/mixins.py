@@ -1,11 +1,15 @@
 from rest_framework import serializers
+from rest_framework.request import Request
+
+
+def resolve_lang(request: Request | None) -> str:
+    if request is not None:
+        lang = request.query_params.get("lang", "").strip().lower()
+        if lang in ("uk", "en"):
+            return lang
+    return "uk"
 
 
 class LangMixin:
     def _lang(self) -> str:
-        request = self.context.get("request")
-        if request is not None:
-            lang = request.query_params.get("lang", "").strip().lower()
-            if lang in ("uk", "en"):
-                return lang
-        return "uk"
+        return resolve_lang(self.context.get("request"))
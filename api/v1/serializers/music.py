@@ -1,12 +1,30 @@
 from rest_framework import serializers
 
-from core.models import MusicRecommendation, Playlist, PlaylistTrack
+from core.models import Like, MusicRecommendation, Playlist, PlaylistTrack
+
+
+class MusicRecommendationListSerializer(serializers.ListSerializer):
+    """Resolves ``is_liked`` for the whole page with a single query."""
+
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, "all") else data)
+        request = self.context.get("request")
+        if request is not None and request.user.is_authenticated:
+            self.child.liked_ids = set(
+                Like.objects.filter(
+                    user=request.user,
+                    music_recommendation_id__in=[item.pk for item in items],
+                ).values_list("music_recommendation_id", flat=True)
+            )
+        return super().to_representation(items)
 
 
 class MusicRecommendationSerializer(serializers.ModelSerializer):
     is_liked = serializers.SerializerMethodField()
     username = serializers.CharField(source="user.username", read_only=True)
 
+    liked_ids: set[int] | None = None
+
     class Meta:
         model = MusicRecommendation
         fields = (
@@ -24,11 +42,15 @@ class MusicRecommendationSerializer(serializers.ModelSerializer):
             "is_liked",
         )
         read_only_fields = ("likes_count", "created_at", "username", "is_liked")
+        list_serializer_class = MusicRecommendationListSerializer
 
     def get_is_liked(self, obj: MusicRecommendation) -> bool:
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
             return False
+        liked_ids = self.context.get("liked_music_ids", self.liked_ids)
+        if liked_ids is not None:
+            return obj.pk in liked_ids
         return obj.likes.filter(user=request.user).exists()
 
 
@@ -8,5 +8,5 @@ class NotificationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Notification
-        fields = ("id", "type", "type_display", "is_read", "created_at", "object_id")
+        fields = ("id", "type", "type_display", "is_read", "count", "created_at", "object_id")
         read_only_fields = fields
@@ -0,0 +1,164 @@
+"""
+Stampede-safe cache fill for the upstream clients.
+
+``get_or_fill`` stores each value together with its soft expiry and how
+long it took to compute. Once a value is soft-expired — or slightly
+earlier, with a probability that grows as expiry nears and with the
+recompute cost (probabilistic early expiration, "XFetch") — one caller
+wins a short-lived lock in the shared cache and refreshes it, while every
+other caller keeps serving the previous value, kept for *grace* seconds
+past the soft TTL. Callers with nothing to serve wait for the winner
+instead of calling upstream themselves; only a caller holding the lock
+ever calls *fill*, so a slow or dead winner (its lock expires after
+``_LOCK_TIMEOUT``) is replaced by one waiter, not all of them.
+
+The last good value is kept for *stale_if_error* seconds in all: if a
+refresh fails — the upstream errors, times out or its circuit breaker is
+open — that value is served instead of the error (stale-while-error).
+
+``aget_or_fill`` is the same for async callers with a coroutine *fill*;
+only the upstream call and the waiting yield to the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STALE_GRACE = 60 * 10
+STALE_IF_ERROR = 60 * 60 * 24
+# Longer than the slowest fill (token fetch + request + 401 retry at 10s each).
+_LOCK_TIMEOUT = 30
+_WAIT = 10.0
+_POLL_INTERVAL = 0.05
+# > 1 favours earlier refreshes, < 1 later ones.
+_BETA = 1.0
+
+_KEY = "fill:{key}"
+_LOCK_KEY = "fill-lock:{key}"
+
+
+def _should_refresh(entry: tuple[Any, float, float]) -> bool:
+    _, expires_at, cost = entry
+    return time.time() - cost * _BETA * math.log(1.0 - random.random()) >= expires_at
+
+
+def _store(key: str, value: Any, ttl: int, stale_if_error: int, started: float) -> None:
+    cost = time.monotonic() - started
+    cache.set(_KEY.format(key=key), (value, time.time() + ttl, cost), max(ttl + stale_if_error, 1))
+
+
+def _fill(key: str, fill: Callable[[], T], ttl: int, stale_if_error: int, entry) -> T:
+    started = time.monotonic()
+    try:
+        value = fill()
+    except Exception:
+        if entry is None:
+            raise
+        logger.warning("Refreshing %s failed, serving the stale value", key, exc_info=True)
+        return entry[0]
+    _store(key, value, ttl, stale_if_error, started)
+    return value
+
+
+async def _afill(key: str, fill: Callable[[], Awaitable[T]], ttl: int, stale_if_error: int, entry) -> T:
+    started = time.monotonic()
+    try:
+        value = await fill()
+    except Exception:
+        if entry is None:
+            raise
+        logger.warning("Refreshing %s failed, serving the stale value", key, exc_info=True)
+        return entry[0]
+    _store(key, value, ttl, stale_if_error, started)
+    return value
+
+
+def get_or_fill(
+    key: str,
+    fill: Callable[[], T],
+    ttl: int,
+    grace: int = STALE_GRACE,
+    stale_if_error: int = STALE_IF_ERROR,
+) -> T:
+    """
+    Cached value of *key*, calling *fill* in at most one process at a time
+    when it is missing or due for refresh. When *fill* raises, the previous
+    value is returned if there is one; otherwise the exception propagates
+    to the caller that ran it.
+    """
+    entry = cache.get(_KEY.format(key=key))
+    if entry is not None and not _should_refresh(entry):
+        return entry[0]
+
+    lock_key = _LOCK_KEY.format(key=key)
+    deadline = time.monotonic() + _WAIT
+    while True:
+        if cache.add(lock_key, 1, _LOCK_TIMEOUT):
+            try:
+                return _fill(key, fill, ttl, stale_if_error, entry)
+            finally:
+                cache.delete(lock_key)
+        if entry is not None and time.time() < entry[1] + grace:
+            return entry[0]  # another process is refreshing it
+        if entry is not None and time.monotonic() >= deadline:
+            return entry[0]  # the refresh is slow; serve the last good value meanwhile
+        time.sleep(_POLL_INTERVAL)
+        fresh = cache.get(_KEY.format(key=key))
+        if fresh is not None and (entry is None or fresh[1] != entry[1]):
+            return fresh[0]
+
+
+async def aget_or_fill(
+    key: str,
+    fill: Callable[[], Awaitable[T]],
+    ttl: int,
+    grace: int = STALE_GRACE,
+    stale_if_error: int = STALE_IF_ERROR,
+) -> T:
+    """``get_or_fill`` for a coroutine *fill*, waiting on the event loop rather than a thread."""
+    entry = cache.get(_KEY.format(key=key))
+    if entry is not None and not _should_refresh(entry):
+        return entry[0]
+
+    lock_key = _LOCK_KEY.format(key=key)
+    deadline = time.monotonic() + _WAIT
+    while True:
+        if cache.add(lock_key, 1, _LOCK_TIMEOUT):
+            try:
+                return await _afill(key, fill, ttl, stale_if_error, entry)
+            finally:
+                cache.delete(lock_key)
+        if entry is not None and time.time() < entry[1] + grace:
+            return entry[0]
+        if entry is not None and time.monotonic() >= deadline:
+            return entry[0]
+        await asyncio.sleep(_POLL_INTERVAL)
+        fresh = cache.get(_KEY.format(key=key))
+        if fresh is not None and (entry is None or fresh[1] != entry[1]):
+            return fresh[0]
+
+
+def forget(key: str) -> None:
+    cache.delete(_KEY.format(key=key))
+
+
+def peek_many(keys: list[str]) -> dict[str, Any]:
+    """Values cached under *keys* that are fresh or within the grace period, without filling anything."""
+    found = cache.get_many([_KEY.format(key=key) for key in keys])
+    now = time.time()
+    return {
+        key: entry[0]
+        for key in keys
+        if (entry := found.get(_KEY.format(key=key))) is not None and now < entry[1] + STALE_GRACE
+    }
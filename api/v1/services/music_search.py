@@ -0,0 +1,175 @@
+"""
+One music search over Spotify and YouTube for the add-music flow.
+
+Both providers are queried concurrently; a YouTube video that is the same
+recording as a Spotify track ("Artist - Title (Official Video)" by
+"ArtistVEVO" vs "Title" by "Artist") is folded into that track, so each
+song is listed once with both links. The merged list is ranked by
+reciprocal rank fusion — a song both providers rank highly comes first —
+plus how much of the query its title and artist cover.
+
+Merged results are cached only when both providers answered; a partial
+answer is returned but not stored, so an outage does not pin it.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+
+from .spotify import SpotifyError, SpotifyTrack, spotify_client
+from .youtube import YouTubeError, YouTubeVideo, normalize, youtube_client
+
+_CACHE_KEY = "music:federated:{query}:{limit}"
+_CACHE_TTL = 60 * 30
+_MIN_QUERY = 3
+_SPOTIFY_LIMIT = 10
+_YOUTUBE_LIMIT = 5
+# Cap for each provider of a combined search, so one slow upstream only costs its own results.
+SOURCE_TIMEOUT = 6.0
+# Reciprocal rank fusion constant: larger values flatten the rank differences.
+_RRF_K = 10
+_QUERY_WEIGHT = 0.05
+
+_NOISE_RE = re.compile(
+    r"[(\[][^)\]]*\b(official|video|audio|lyrics?|visuali[sz]er|hd|hq|4k|mv|remaster(ed)?)\b[^)\]]*[)\]]",
+    re.IGNORECASE,
+)
+_FEAT_RE = re.compile(r"[(\[]?\s*\b(feat|ft|featuring)\b\.?.*$", re.IGNORECASE)
+# Spotify's release suffixes: "Song - Remastered 2011", "Song - Radio Edit".
+_EDITION_RE = re.compile(r"\s+[-–—]\s+[^-–—]*\b(remaster(ed)?|version|edit|mono|stereo)\b.*$", re.IGNORECASE)
+_DASH_RE = re.compile(r"\s+[-–—]\s+")
+_CHANNEL_SUFFIX_RE = re.compile(r"(\s*-\s*topic|vevo|\s+official)$", re.IGNORECASE)
+
+
+@dataclass
+class MusicResult:
+    title: str
+    artist: str
+    spotify: SpotifyTrack | None = None
+    youtube: YouTubeVideo | None = None
+    score: float = 0.0
+    sources: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        spotify, youtube = self.spotify, self.youtube
+        # Prefer YouTube for the recommendation link: it is the only one that embeds.
+        if youtube is not None:
+            link_type, link_url = "youtube", f"https://www.youtube.com/watch?v={youtube.video_id}"
+        else:
+            link_type, link_url = "spotify", spotify.spotify_url
+        return {
+            "title": self.title,
+            "artist": self.artist,
+            "sources": self.sources,
+            "link_type": link_type,
+            "link_url": link_url,
+            "embed_code": youtube.video_id if youtube else "",
+            "cover_url": (spotify.cover_url if spotify else "") or (youtube.thumbnail if youtube else ""),
+            "spotify_id": spotify.spotify_id if spotify else None,
+            "spotify_url": spotify.spotify_url if spotify else None,
+            "preview_url": spotify.preview_url if spotify else None,
+            "youtube_id": youtube.video_id if youtube else None,
+        }
+
+
+def _clean_title(title: str) -> str:
+    return _FEAT_RE.sub("", _EDITION_RE.sub("", _NOISE_RE.sub("", title))).strip(" -–—")
+
+
+def _primary_artist(artist: str) -> str:
+    return normalize(artist.split(",")[0])
+
+
+def _split_video(video: YouTubeVideo) -> tuple[str, str]:
+    """(title, artist) of a video: "Artist - Title" titles first, the uploading channel otherwise."""
+    title = _clean_title(video.title)
+    parts = _DASH_RE.split(title, maxsplit=1)
+    if len(parts) == 2 and parts[1].strip():
+        return parts[1].strip(), parts[0].strip()
+    return title, _CHANNEL_SUFFIX_RE.sub("", video.channel).strip()
+
+
+def merge(query: str, tracks: list[SpotifyTrack], videos: list[YouTubeVideo], limit: int) -> list[MusicResult]:
+    """Dedupe *videos* into *tracks* by normalized title and artist, then rank."""
+    results: list[MusicResult] = []
+    by_key: dict[tuple[str, str], MusicResult] = {}
+    for rank, track in enumerate(tracks):
+        result = MusicResult(title=track.title, artist=track.artist, spotify=track, sources=["spotify"])
+        result.score += 1 / (_RRF_K + rank)
+        by_key.setdefault((normalize(_clean_title(track.title)), _primary_artist(track.artist)), result)
+        results.append(result)
+
+    for rank, video in enumerate(videos):
+        title, artist = _split_video(video)
+        key = (normalize(title), _primary_artist(artist))
+        match = by_key.get(key)
+        if match is None:
+            # Channel names rarely match exactly; accept the artist anywhere in the video text.
+            haystack = normalize(f"{video.title} {video.channel}")
+            match = next(
+                (
+                    result for (track_title, track_artist), result in by_key.items()
+                    if track_title == key[0] and track_artist and track_artist in haystack
+                ),
+                None,
+            )
+        if match is not None and match.youtube is None:
+            match.youtube = video
+            match.sources.append("youtube")
+        elif match is None:
+            match = MusicResult(title=title, artist=artist, youtube=video, sources=["youtube"])
+            by_key[key] = match
+            results.append(match)
+        else:
+            continue  # a second video of an already matched song
+        match.score += 1 / (_RRF_K + rank)
+
+    words = normalize(query).split()
+    for result in results:
+        text = normalize(f"{result.title} {result.artist}")
+        result.score += _QUERY_WEIGHT * sum(word in text for word in words) / max(len(words), 1)
+    results.sort(key=lambda result: result.score, reverse=True)
+    return results[:limit]
+
+
+async def fetch_source(coro, errors: dict[str, str], name: str) -> list:
+    """
+    Await one provider's search, giving up after ``SOURCE_TIMEOUT`` so a slow
+    upstream (retries included) cannot hold up the others; a failure is
+    recorded in *errors* under *name* and yields no results.
+    """
+    try:
+        return await asyncio.wait_for(coro, SOURCE_TIMEOUT)
+    except asyncio.TimeoutError:
+        errors[name] = "timeout"
+    except (SpotifyError, YouTubeError) as exc:
+        errors[name] = str(exc)
+    return []
+
+
+async def afederated_search(query: str, limit: int = 10) -> tuple[list[dict], dict[str, str]]:
+    """Merged results for *query* as dicts, and the error of each provider that failed."""
+    normalized = normalize(query)
+    if len(normalized) < _MIN_QUERY:
+        return [], {}
+    key = _CACHE_KEY.format(query=normalized, limit=limit)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, {}
+
+    errors: dict[str, str] = {}
+    calls = [fetch_source(spotify_client.asearch_tracks(query, limit=_SPOTIFY_LIMIT), errors, "spotify")]
+    if youtube_client.configured:
+        calls.append(fetch_source(youtube_client.asearch(query, limit=_YOUTUBE_LIMIT), errors, "youtube"))
+    else:
+        errors["youtube"] = "YouTube API key not configured."
+    tracks, *rest = await asyncio.gather(*calls)
+    videos = rest[0] if rest else []
+
+    results = [result.as_dict() for result in merge(query, tracks, videos, limit)]
+    if not errors:
+        cache.set(key, results, _CACHE_TTL)
+    return results, errors
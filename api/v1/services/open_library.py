@@ -1,18 +1,18 @@
 from __future__ import annotations
 
-import json
-import urllib.error
-import urllib.parse
-import urllib.request
 from dataclasses import dataclass, field
 from typing import Any
 
-from django.core.cache import cache
+from core.utils.breaker import register_upstream
+from core.utils.http import HttpError, async_http_client, http_client
+from .caching import aget_or_fill, get_or_fill
 
 _SEARCH_TTL = 60 * 60
 _SEARCH_CACHE_PREFIX = "openlibrary:search:"
 _API_BASE = "https://openlibrary.org"
 _COVERS_BASE = "https://covers.openlibrary.org/b"
+_UPSTREAM = register_upstream("openlibrary").name
+_SEARCH_FIELDS = "key,title,author_name,first_publish_year,isbn,description,cover_i,edition_key"
 
 
 @dataclass(frozen=True)
@@ -30,40 +30,45 @@ class OpenLibraryBook:
 class OpenLibraryClient:
     def search(self, query: str, limit: int = 10) -> list[OpenLibraryBook]:
         cache_key = f"{_SEARCH_CACHE_PREFIX}{query.lower()}:{limit}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-        params = urllib.parse.urlencode({
-            "q": query,
-            "limit": str(limit),
-            "fields": "key,title,author_name,first_publish_year,isbn,description,cover_i,edition_key",
-        })
-        url = f"{_API_BASE}/search.json?{params}"
+        try:
+            return get_or_fill(cache_key, lambda: self._fetch_search(query, limit), _SEARCH_TTL)
+        except (HttpError, ValueError):
+            return []
 
+    async def asearch(self, query: str, limit: int = 10) -> list[OpenLibraryBook]:
+        cache_key = f"{_SEARCH_CACHE_PREFIX}{query.lower()}:{limit}"
         try:
-            req = urllib.request.Request(url, headers={"User-Agent": "Songstery/1.0"})
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                data: dict[str, Any] = json.loads(resp.read())
-        except (urllib.error.URLError, urllib.error.HTTPError):
+            return await aget_or_fill(cache_key, lambda: self._afetch_search(query, limit), _SEARCH_TTL)
+        except (HttpError, ValueError):
             return []
 
-        books = [
+    def _fetch_search(self, query: str, limit: int) -> list[OpenLibraryBook]:
+        response = http_client.get(
+            f"{_API_BASE}/search.json", upstream=_UPSTREAM, params=self._search_params(query, limit)
+        )
+        return self._parse_search(response.json())
+
+    async def _afetch_search(self, query: str, limit: int) -> list[OpenLibraryBook]:
+        response = await async_http_client.get(
+            f"{_API_BASE}/search.json", upstream=_UPSTREAM, params=self._search_params(query, limit)
+        )
+        return self._parse_search(response.json())
+
+    @staticmethod
+    def _search_params(query: str, limit: int) -> dict[str, str]:
+        return {"q": query, "limit": str(limit), "fields": _SEARCH_FIELDS}
+
+    def _parse_search(self, data: dict[str, Any]) -> list[OpenLibraryBook]:
+        return [
             book
             for doc in data.get("docs", [])
             if (book := self._parse_doc(doc)) is not None
         ]
 
-        cache.set(cache_key, books, _SEARCH_TTL)
-        return books
-
     def get_book_data(self, open_library_id: str) -> OpenLibraryBook | None:
-        url = f"{_API_BASE}/works/{open_library_id}.json"
         try:
-            req = urllib.request.Request(url, headers={"User-Agent": "Songstery/1.0"})
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                data: dict[str, Any] = json.loads(resp.read())
-        except (urllib.error.URLError, urllib.error.HTTPError):
+            data: dict[str, Any] = http_client.get(f"{_API_BASE}/works/{open_library_id}.json", upstream=_UPSTREAM).json()
+        except (HttpError, ValueError):
             return None
 
         return self._parse_work(open_library_id, data)
@@ -1,20 +1,22 @@
 from __future__ import annotations
 
 import base64
-import json
-import urllib.error
-import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from typing import Any
 
 from django.conf import settings
-from django.core.cache import cache
+
+from core.utils.breaker import register_upstream
+from core.utils.http import HttpError, HttpResponse, async_http_client, http_client
+from .caching import aget_or_fill, forget, get_or_fill
 
 _TOKEN_CACHE_KEY = "spotify:access_token"
-_TOKEN_TTL = 60 * 55
+_TOKEN_TTL = 60 * 50
+# Tokens live an hour; a stale one is still accepted for the rest of it.
+_TOKEN_GRACE = 60 * 5
 _SEARCH_TTL = 60 * 60
 _SEARCH_CACHE_PREFIX = "spotify:search:"
+_UPSTREAM = register_upstream("spotify").name
 
 
 @dataclass(frozen=True)
@@ -40,76 +42,118 @@ class SpotifyClient:
         self._client_id: str = getattr(settings, "SPOTIFY_CLIENT_ID", "")
         self._client_secret: str = getattr(settings, "SPOTIFY_CLIENT_SECRET", "")
 
-    def _fetch_token(self) -> str:
+    def _token_request(self) -> dict[str, Any]:
         if not self._client_id or not self._client_secret:
             raise SpotifyError("Spotify credentials not configured.")
 
         credentials = base64.b64encode(
             f"{self._client_id}:{self._client_secret}".encode()
         ).decode()
-
-        body = urllib.parse.urlencode({"grant_type": "client_credentials"}).encode()
-        req = urllib.request.Request(
-            self._TOKEN_URL,
-            data=body,
-            headers={
+        return {
+            "upstream": _UPSTREAM,
+            "data": b"grant_type=client_credentials",
+            "headers": {
                 "Authorization": f"Basic {credentials}",
                 "Content-Type": "application/x-www-form-urlencoded",
             },
-            method="POST",
-        )
-
-        try:
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                data: dict[str, Any] = json.loads(resp.read())
-        except (urllib.error.URLError, urllib.error.HTTPError) as exc:
-            raise SpotifyError(f"Token request failed: {exc}") from exc
+        }
 
+    @staticmethod
+    def _parse_token(data: dict[str, Any]) -> str:
         token: str = data.get("access_token", "")
         if not token:
             raise SpotifyError("Empty access token received.")
-
-        cache.set(_TOKEN_CACHE_KEY, token, _TOKEN_TTL)
         return token
 
-    def _get_token(self) -> str:
-        token = cache.get(_TOKEN_CACHE_KEY)
-        return token if token else self._fetch_token()
+    def _fetch_token(self) -> str:
+        try:
+            data: dict[str, Any] = http_client.post(self._TOKEN_URL, **self._token_request()).json()
+        except (HttpError, ValueError) as exc:
+            raise SpotifyError(f"Token request failed: {exc}") from exc
+        return self._parse_token(data)
 
-    def _request(self, path: str, params: dict[str, str] | None = None) -> Any:
-        url = f"{self._API_BASE}{path}"
-        if params:
-            url = f"{url}?{urllib.parse.urlencode(params)}"
+    async def _afetch_token(self) -> str:
+        try:
+            data: dict[str, Any] = (await async_http_client.post(self._TOKEN_URL, **self._token_request())).json()
+        except (HttpError, ValueError) as exc:
+            raise SpotifyError(f"Token request failed: {exc}") from exc
+        return self._parse_token(data)
+
+    def _get_token(self) -> str:
+        return get_or_fill(
+            _TOKEN_CACHE_KEY, self._fetch_token, _TOKEN_TTL, grace=_TOKEN_GRACE, stale_if_error=_TOKEN_GRACE
+        )
 
-        req = urllib.request.Request(
-            url,
-            headers={"Authorization": f"Bearer {self._get_token()}"},
+    async def _aget_token(self) -> str:
+        return await aget_or_fill(
+            _TOKEN_CACHE_KEY, self._afetch_token, _TOKEN_TTL, grace=_TOKEN_GRACE, stale_if_error=_TOKEN_GRACE
         )
 
+    def _get(self, url: str, params: dict[str, str] | None) -> HttpResponse:
+        headers = {"Authorization": f"Bearer {self._get_token()}"}
+        return http_client.get(url, params=params, headers=headers, upstream=_UPSTREAM)
+
+    async def _aget(self, url: str, params: dict[str, str] | None) -> HttpResponse:
+        headers = {"Authorization": f"Bearer {await self._aget_token()}"}
+        return await async_http_client.get(url, params=params, headers=headers, upstream=_UPSTREAM)
+
+    @staticmethod
+    def _api_error(exc: HttpError) -> SpotifyError:
+        if exc.status is None:
+            return SpotifyError(f"Network error: {exc}")
+        return SpotifyError(f"Spotify API error {exc.status}")
+
+    def _request(self, path: str, params: dict[str, str] | None = None) -> Any:
+        url = f"{self._API_BASE}{path}"
+        try:
+            try:
+                response = self._get(url, params)
+            except HttpError as exc:
+                if exc.status != 401:
+                    raise
+                forget(_TOKEN_CACHE_KEY)
+                response = self._get(url, params)
+            return response.json()
+        except HttpError as exc:
+            raise self._api_error(exc) from exc
+
+    async def _arequest(self, path: str, params: dict[str, str] | None = None) -> Any:
+        url = f"{self._API_BASE}{path}"
         try:
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                return json.loads(resp.read())
-        except urllib.error.HTTPError as exc:
-            if exc.code == 401:
-                cache.delete(_TOKEN_CACHE_KEY)
-                req.add_header("Authorization", f"Bearer {self._fetch_token()}")
-                with urllib.request.urlopen(req, timeout=10) as resp:
-                    return json.loads(resp.read())
-            raise SpotifyError(f"Spotify API error {exc.code}") from exc
-        except urllib.error.URLError as exc:
-            raise SpotifyError(f"Network error: {exc}") from exc
+            try:
+                response = await self._aget(url, params)
+            except HttpError as exc:
+                if exc.status != 401:
+                    raise
+                forget(_TOKEN_CACHE_KEY)
+                response = await self._aget(url, params)
+            return response.json()
+        except HttpError as exc:
+            raise self._api_error(exc) from exc
 
     def search_tracks(self, query: str, limit: int = 10) -> list[SpotifyTrack]:
         cache_key = f"{_SEARCH_CACHE_PREFIX}{query.lower()}:{limit}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
 
-        data = self._request("/search", {"q": query, "type": "track", "limit": str(limit)})
+        def fetch() -> list[SpotifyTrack]:
+            return self._parse_search(self._request("/search", self._search_params(query, limit)))
+
+        return get_or_fill(cache_key, fetch, _SEARCH_TTL)
+
+    async def asearch_tracks(self, query: str, limit: int = 10) -> list[SpotifyTrack]:
+        cache_key = f"{_SEARCH_CACHE_PREFIX}{query.lower()}:{limit}"
+
+        async def fetch() -> list[SpotifyTrack]:
+            return self._parse_search(await self._arequest("/search", self._search_params(query, limit)))
+
+        return await aget_or_fill(cache_key, fetch, _SEARCH_TTL)
+
+    @staticmethod
+    def _search_params(query: str, limit: int) -> dict[str, str]:
+        return {"q": query, "type": "track", "limit": str(limit)}
+
+    def _parse_search(self, data: dict[str, Any]) -> list[SpotifyTrack]:
         items = data.get("tracks", {}).get("items", [])
-        tracks = [self._parse_track(item) for item in items if item]
-        cache.set(cache_key, tracks, _SEARCH_TTL)
-        return tracks
+        return [self._parse_track(item) for item in items if item]
 
     @staticmethod
     def _parse_track(item: dict[str, Any]) -> SpotifyTrack:
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from core.utils.breaker import register_upstream
+from core.utils.http import HttpError, async_http_client, http_client
+from core.utils.redis_client import get_redis
+from .caching import aget_or_fill, get_or_fill, peek_many
+
+_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+_SEARCH_TTL = 60 * 60 * 6
+_SEARCH_CACHE_PREFIX = "youtube:search:"
+# search.list costs the same quota for 1 or 50 results; fetch enough for prefix reuse.
+_FETCH_SIZE = 25
+_SEARCH_COST = 100
+_MIN_QUERY = 3
+_UPSTREAM = register_upstream("youtube").name
+
+# The Data API quota resets at midnight Pacific time.
+_QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+_QUOTA_KEY = "youtube:quota:{day}"
+_USAGE_KEY = "youtube:usage:{day}"
+_COUNTER_TTL = 60 * 60 * 24 * 8
+
+_PUNCT_RE = re.compile(r"[^\w\s]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class YouTubeVideo:
+    video_id: str
+    title: str
+    channel: str
+    thumbnail: str
+
+    def as_dict(self) -> dict:
+        return {"id": self.video_id, "title": self.title, "channel": self.channel, "thumbnail": self.thumbnail}
+
+
+class YouTubeError(Exception):
+    pass
+
+
+def normalize(query: str) -> str:
+    """Case-, punctuation- and spacing-insensitive form used for cache keys and prefix reuse."""
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", query.casefold())).strip()
+
+
+def _quota_day() -> str:
+    return datetime.now(_QUOTA_TZ).date().isoformat()
+
+
+class YouTubeClient:
+    def __init__(self) -> None:
+        self._api_key: str = getattr(settings, "YOUTUBE_API_KEY", "")
+        self._daily_quota: int = getattr(settings, "YOUTUBE_DAILY_QUOTA", 10000)
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._api_key)
+
+    def search(self, query: str, limit: int = 5) -> list[YouTubeVideo]:
+        """
+        Videos matching *query*. Results are cached per normalized query; a
+        query that extends an already cached one ("dune so" after "dune")
+        is answered by filtering the cached results when that leaves at
+        least *limit* matches, so typing costs one API call, not one per key.
+        """
+        normalized = self._check(query)
+        if normalized is None:
+            return []
+        reused = self._cached(normalized, limit)
+        if reused is not None:
+            return reused
+        return get_or_fill(self._cache_key(normalized), lambda: self._fetch(normalized), _SEARCH_TTL)[:limit]
+
+    async def asearch(self, query: str, limit: int = 5) -> list[YouTubeVideo]:
+        """``search`` for async views; only the API call itself is awaited."""
+        normalized = self._check(query)
+        if normalized is None:
+            return []
+        reused = self._cached(normalized, limit)
+        if reused is not None:
+            return reused
+        videos = await aget_or_fill(self._cache_key(normalized), lambda: self._afetch(normalized), _SEARCH_TTL)
+        return videos[:limit]
+
+    def usage(self, day: str | None = None) -> dict[str, Any]:
+        """Quota units spent and request counters for the quota *day* (today by default)."""
+        day = day or _quota_day()
+        conn = get_redis()
+        counters: dict[str, int] = {}
+        spent = 0
+        if conn is not None:
+            try:
+                pipe = conn.pipeline(transaction=False)
+                pipe.get(_QUOTA_KEY.format(day=day))
+                pipe.hgetall(_USAGE_KEY.format(day=day))
+                raw_spent, raw_counters = pipe.execute()
+                spent = int(raw_spent or 0)
+                counters = {
+                    (name.decode() if isinstance(name, bytes) else name): int(value)
+                    for name, value in raw_counters.items()
+                }
+            except RedisError:
+                pass
+        return {"day": day, "quota_used": spent, "quota_limit": self._daily_quota, **counters}
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _cache_key(normalized: str) -> str:
+        return f"{_SEARCH_CACHE_PREFIX}{normalized}"
+
+    def _check(self, query: str) -> str | None:
+        if not self.configured:
+            raise YouTubeError("YouTube API key not configured.")
+        normalized = normalize(query)
+        return normalized if len(normalized) >= _MIN_QUERY else None
+
+    def _cached(self, normalized: str, limit: int) -> list[YouTubeVideo] | None:
+        """Prefix-reused results, or None when the call should go through the fill (which may hit the cache)."""
+        if peek_many([self._cache_key(normalized)]):
+            self._count("cache_hits")
+            return None
+        reused = self._from_prefix(normalized, limit)
+        if reused is not None:
+            self._count("prefix_hits")
+        return reused
+
+    def _from_prefix(self, normalized: str, limit: int) -> list[YouTubeVideo] | None:
+        prefixes = [normalized[:end].rstrip() for end in range(len(normalized) - 1, _MIN_QUERY - 1, -1)]
+        prefixes = [prefix for prefix in dict.fromkeys(prefixes) if len(prefix) >= _MIN_QUERY]
+        if not prefixes:
+            return None
+        found = peek_many([self._cache_key(prefix) for prefix in prefixes])
+        words = normalized.split()
+        for prefix in prefixes:  # longest first: the closest match
+            videos = found.get(self._cache_key(prefix))
+            if videos is None:
+                continue
+            matches = [
+                video for video in videos
+                if all(word in normalize(f"{video.title} {video.channel}") for word in words)
+            ]
+            return matches[:limit] if len(matches) >= limit else None
+        return None
+
+    def _fetch(self, normalized: str) -> list[YouTubeVideo]:
+        day = self._charge()
+        try:
+            data = http_client.get(_SEARCH_URL, **self._search_request(normalized)).json()
+        except (HttpError, ValueError) as exc:
+            self._failed(day, exc)
+            raise YouTubeError(f"YouTube search failed: {exc}") from exc
+        return self._parse_search(data)
+
+    async def _afetch(self, normalized: str) -> list[YouTubeVideo]:
+        day = self._charge()
+        try:
+            data = (await async_http_client.get(_SEARCH_URL, **self._search_request(normalized))).json()
+        except (HttpError, ValueError) as exc:
+            self._failed(day, exc)
+            raise YouTubeError(f"YouTube search failed: {exc}") from exc
+        return self._parse_search(data)
+
+    def _charge(self) -> str:
+        """Reserve quota for one search; returns the quota day it was charged to."""
+        day = _quota_day()
+        if not self._reserve_quota(day):
+            self._count("quota_rejected")
+            raise YouTubeError("Daily YouTube quota exhausted.")
+        self._count("api_calls")
+        return day
+
+    def _failed(self, day: str, exc: Exception) -> None:
+        self._count("errors")
+        # No status: the breaker rejected the call or it never got an answer, so
+        # keep an outage from using up the day's quota.
+        if isinstance(exc, HttpError) and exc.status is None:
+            self._refund(day)
+
+    def _search_request(self, normalized: str) -> dict[str, Any]:
+        return {
+            "params": {
+                "part": "snippet",
+                "type": "video",
+                "maxResults": _FETCH_SIZE,
+                "q": normalized,
+                "key": self._api_key,
+            },
+            "timeout": 5,
+            # Every attempt that reaches the API costs 100 units, but _charge reserved one.
+            "retries": 0,
+            "upstream": _UPSTREAM,
+        }
+
+    def _parse_search(self, data: dict[str, Any]) -> list[YouTubeVideo]:
+        return [
+            video
+            for item in data.get("items", [])
+            if (video := self._parse_item(item)) is not None
+        ]
+
+    def _reserve_quota(self, day: str) -> bool:
+        """Charge one search against *day*'s quota; False (and nothing charged) if it would exceed it."""
+        conn = get_redis()
+        if conn is None:
+            return True
+        key = _QUOTA_KEY.format(day=day)
+        try:
+            pipe = conn.pipeline()
+            pipe.incrby(key, _SEARCH_COST)
+            pipe.expire(key, _COUNTER_TTL)
+            spent, _ = pipe.execute()
+            if spent > self._daily_quota:
+                conn.decrby(key, _SEARCH_COST)
+                return False
+        except RedisError:
+            pass  # accounting is best effort; never block searches on it
+        return True
+
+    @staticmethod
+    def _refund(day: str) -> None:
+        conn = get_redis()
+        if conn is None:
+            return
+        try:
+            conn.decrby(_QUOTA_KEY.format(day=day), _SEARCH_COST)
+        except RedisError:
+            pass
+
+    @staticmethod
+    def _count(counter: str) -> None:
+        conn = get_redis()
+        if conn is None:
+            return
+        key = _USAGE_KEY.format(day=_quota_day())
+        try:
+            pipe = conn.pipeline(transaction=False)
+            pipe.hincrby(key, counter, 1)
+            pipe.expire(key, _COUNTER_TTL)
+            pipe.execute()
+        except RedisError:
+            pass
+
+    @staticmethod
+    def _parse_item(item: dict[str, Any]) -> YouTubeVideo | None:
+        video_id = item.get("id", {}).get("videoId")
+        if not video_id:
+            return None
+        snippet = item.get("snippet", {})
+        return YouTubeVideo(
+            video_id=video_id,
+            title=snippet.get("title", ""),
+            channel=snippet.get("channelTitle", ""),
+            thumbnail=snippet.get("thumbnails", {}).get("default", {}).get("url", ""),
+        )
+
+
+youtube_client = YouTubeClient()
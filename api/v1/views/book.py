@@ -1,45 +1,55 @@
-from django.db.models import F, QuerySet
+from django.db.models import QuerySet
+from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status
+from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from core.models import Book, BookRating, Chapter, Language, MusicRecommendation, SavedBook
+from core.counters import book_views
+from core.models import Book, Chapter, MusicRecommendation, SavedBook
 from core.models.book import BookTranslation, ChapterTranslation
+from core.ratings import set_book_rating
+from core.refdata import get_language
 from core.utils.slugs import generate_unique_slug
-from api.v1.filters.book import BookFilter
+from core.versions import etag_for
+from api.v1.filters.book import BookFilter, SearchRankOrderingFilter
 from api.v1.filters.pagination import BookCursorPagination, MusicCursorPagination
 from api.v1.filters.permissions import IsOwnerOrStaff
 from api.v1.serializers.book import BookCreateSerializer, BookDetailSerializer, BookListSerializer
 from api.v1.serializers.chapter import ChapterSerializer
+from api.v1.serializers.mixins import resolve_lang
 from api.v1.serializers.music import MusicRecommendationSerializer, PlaylistSerializer
+from api.v1.views.conditional import conditional_get
 
 
 class BookViewSet(ModelViewSet):
     pagination_class = BookCursorPagination
-    filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
+    filter_backends = (DjangoFilterBackend, SearchRankOrderingFilter)
     filterset_class = BookFilter
-    ordering_fields = ("created_at", "views_count", "year")
+    ordering_fields = ("created_at", "views_count", "year", "rating_avg", "rating_count")
     ordering = ("-created_at",)
     lookup_field = "slug"
 
-    def get_queryset(self) -> QuerySet:
+    def _visible_books(self) -> QuerySet:
         user = self.request.user
-        base_qs = (
-            Book.objects
-            if (user.is_authenticated and user.is_staff)
-            else Book.published
-        )
-        return base_qs.select_related(
+        return Book.objects.all() if (user.is_authenticated and user.is_staff) else Book.published.all()
+
+    def get_queryset(self) -> QuerySet:
+        qs = self._visible_books().select_related(
             "author", "genre", "verified_author"
-        ).prefetch_related(
-            "translations",
-            "author__translations",
-            "genre__translations",
-        )
+        ).with_card_stats(resolve_lang(self.request))
+        if self.action == "retrieve":
+            qs = qs.prefetch_related(
+                "translations__language",
+                "author__translations__language",
+                "chapters__translations__language",
+                "playlists__tracks",
+                "playlists__creator",
+            )
+        return qs
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -56,20 +66,43 @@ class BookViewSet(ModelViewSet):
         return [IsAuthenticatedOrReadOnly()]
 
     def retrieve(self, request: Request, *args, **kwargs) -> Response:
-        instance = self.get_object()
-        session_key = f"api_viewed_book_{instance.pk}"
+        # Only the ids the ETag needs; the full prefetch runs on a cache miss.
+        row = (
+            self._visible_books()
+            .filter(slug=kwargs[self.lookup_field])
+            .values_list("pk", "author_id", "genre_id", "views_count")
+            .first()
+        )
+        if row is None:
+            raise Http404
+        pk, author_id, genre_id, views_count = row
+
+        session_key = f"api_viewed_book_{pk}"
         if not request.session.get(session_key):
-            Book.objects.filter(pk=instance.pk).update(views_count=F("views_count") + 1)
+            book_views.incr(pk)
             request.session[session_key] = True
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+            # Without Redis the increment is written straight to the column.
+            views_count = Book.objects.filter(pk=pk).values_list("views_count", flat=True).first()
+
+        refs = [f"book:{pk}"]
+        if author_id:
+            refs.append(f"author:{author_id}")
+        if genre_id:
+            refs.append(f"genre:{genre_id}")
+        etag = etag_for(*refs, vary=(resolve_lang(request), views_count))
+
+        def build() -> Response:
+            serializer = self.get_serializer(self.get_object())
+            return Response(serializer.data)
+
+        return conditional_get(request, etag, build)
 
     def perform_create(self, serializer: BookCreateSerializer) -> None:
         title = serializer.validated_data.get("title", "")
         slug = generate_unique_slug(Book, title)
         book: Book = serializer.save(creator=self.request.user, slug=slug)
 
-        uk = Language.objects.filter(code="uk").first()
+        uk = get_language("uk")
         if uk:
             BookTranslation.objects.create(
                 book=book,
@@ -87,6 +120,7 @@ class BookViewSet(ModelViewSet):
                 request.user == book.creator or request.user.is_staff
         )
         qs = book.chapters.all() if is_privileged else book.chapters.filter(is_approved=True)
+        qs = qs.prefetch_related("translations__language")
         serializer = ChapterSerializer(qs, many=True, context={"request": request})
         return Response(serializer.data)
 
@@ -138,7 +172,5 @@ class BookViewSet(ModelViewSet):
                 {"detail": "Score must be between 1 and 5."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        BookRating.objects.update_or_create(
-            user=request.user, book=book, defaults={"score": score}
-        )
+        set_book_rating(request.user, book, score)
         return Response({"avg_rating": book.average_rating})
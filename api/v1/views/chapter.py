@@ -1,29 +1,55 @@
-from django.db.models import F
+from django.db.models import Prefetch
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.models import Chapter, Like, MusicRecommendation
+from core import leaderboard
+from core.likes import toggle_like
+from core.models import Book, Chapter, MusicRecommendation
+from core.versions import etag_for
 from api.v1.serializers.chapter import ChapterDetailSerializer
+from api.v1.serializers.mixins import resolve_lang
 from api.v1.serializers.music import MusicRecommendationSerializer
+from api.v1.views.conditional import conditional_get
 
 
 class ChapterDetailView(APIView):
     permission_classes = (IsAuthenticatedOrReadOnly,)
 
     def get(self, request: Request, pk: int) -> Response:
-        chapter = get_object_or_404(Chapter, pk=pk)
+        row = Chapter.objects.filter(pk=pk).values_list("is_approved", "book__creator_id").first()
+        if row is None:
+            raise Http404
+        is_approved, creator_id = row
         user = request.user
         is_privileged = user.is_authenticated and (
-                user == chapter.book.creator or user.is_staff
+                user.pk == creator_id or user.is_staff
         )
-        if not chapter.is_approved and not is_privileged:
+        if not is_approved and not is_privileged:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        serializer = ChapterDetailSerializer(chapter, context={"request": request})
-        return Response(serializer.data)
+
+        # is_liked on the tracks depends on who is asking.
+        etag = etag_for(f"chapter:{pk}", vary=(resolve_lang(request), user.pk or ""))
+
+        def build() -> Response:
+            chapter = get_object_or_404(
+                Chapter.objects.select_related("book").prefetch_related(
+                    "translations__language",
+                    Prefetch(
+                        "music_recommendations",
+                        queryset=MusicRecommendation.objects.select_related("user"),
+                    ),
+                ),
+                pk=pk,
+            )
+            serializer = ChapterDetailSerializer(chapter, context={"request": request})
+            return Response(serializer.data)
+
+        return conditional_get(request, etag, build)
 
 
 class ChapterMusicView(APIView):
@@ -44,16 +70,42 @@ class MusicLikeView(APIView):
 
     def post(self, request: Request, pk: int) -> Response:
         music = get_object_or_404(MusicRecommendation, pk=pk)
-        like, created = Like.objects.get_or_create(
-            user=request.user, music_recommendation=music
-        )
-        if created:
-            MusicRecommendation.objects.filter(pk=pk).update(likes_count=F("likes_count") + 1)
-        else:
-            like.delete()
-            MusicRecommendation.objects.filter(pk=pk).update(likes_count=F("likes_count") - 1)
-        music.refresh_from_db(fields=["likes_count"])
-        return Response({"liked": created, "likes_count": music.likes_count})
+        result = toggle_like(request.user, music)
+        return Response({"liked": result.liked, "likes_count": result.likes_count})
+
+
+class MusicTopView(APIView):
+    """
+    ``?period=all|trending`` leaderboard, optionally within either one
+    ``?book=<slug>`` or one ``?mood=<mood>``; at most ``?limit=`` (1–50,
+    default 10) tracks.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def get(self, request: Request) -> Response:
+        period = request.query_params.get("period", leaderboard.ALL_TIME)
+        if period not in leaderboard.BOARDS:
+            return Response({"detail": "Unknown period."}, status=status.HTTP_400_BAD_REQUEST)
+
+        mood = request.query_params.get("mood", "")
+        if mood and mood not in dict(MusicRecommendation.MOOD_CHOICES):
+            return Response({"detail": "Unknown mood."}, status=status.HTTP_400_BAD_REQUEST)
+
+        book_id = None
+        if (slug := request.query_params.get("book")) and mood:
+            return Response({"detail": "Filter by book or by mood, not both."}, status=status.HTTP_400_BAD_REQUEST)
+        if slug:
+            book_id = get_object_or_404(Book.published.only("pk"), slug=slug).pk
+
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 50)
+        except ValueError:
+            limit = 10
+
+        tracks = leaderboard.top_tracks(period, book_id=book_id, mood=mood, limit=limit)
+        serializer = MusicRecommendationSerializer(tracks, many=True, context={"request": request})
+        return Response({"results": serializer.data})
 
 
 class MusicDeleteView(APIView):
@@ -0,0 +1,22 @@
+from collections.abc import Callable
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+def conditional_get(request: Request, etag: str, build: Callable[[], Response]) -> HttpResponseBase:
+    """
+    Answer with ``304 Not Modified`` when *etag* matches ``If-None-Match``,
+    otherwise call *build* for the full response. The ETag is computed from
+    ``core.versions`` before anything is serialized, so a revalidation costs
+    the lookup query and one cache round trip.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = build()
+    response["ETag"] = etag
+    # is_liked differs per (JWT) user; the ETag covers it, shared caches must too.
+    patch_vary_headers(response, ("Authorization",))
+    return response
@@ -0,0 +1,15 @@
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.v1.serializers.mixins import resolve_lang
+from core.facets import genre_facets
+
+
+class GenreFacetsView(APIView):
+    permission_classes = (AllowAny,)
+
+    def get(self, request: Request) -> Response:
+        facets = genre_facets(resolve_lang(request))
+        return Response({"results": [facet.as_dict() for facet in facets]})
@@ -0,0 +1,27 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.v1.services.youtube import youtube_client
+from core.utils.breaker import breaker_states
+from core.utils.http import http_stats
+
+
+class UpstreamStatusView(APIView):
+    """
+    Circuit breaker state (shared by all workers) and this worker's request
+    stats per upstream, plus today's YouTube quota usage.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request: Request) -> Response:
+        stats = http_stats()
+        return Response({
+            "upstreams": {
+                name: {**state, "requests": stats.get(name, {})}
+                for name, state in breaker_states().items()
+            },
+            "youtube_quota": youtube_client.usage(),
+        })
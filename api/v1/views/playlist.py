@@ -1,4 +1,3 @@
-from django.db.models import F
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
@@ -6,17 +5,25 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.models import Like, Playlist, PlaylistTrack
+from core.likes import toggle_like
+from core.models import Playlist, PlaylistTrack
+from core.versions import etag_for
 from api.v1.serializers.music import PlaylistSerializer, PlaylistTrackSerializer
+from api.v1.views.conditional import conditional_get
 
 
 class PlaylistDetailView(APIView):
     permission_classes = (IsAuthenticatedOrReadOnly,)
 
     def get(self, request: Request, slug: str) -> Response:
-        playlist = get_object_or_404(Playlist, slug=slug)
-        serializer = PlaylistSerializer(playlist, context={"request": request})
-        return Response(serializer.data)
+        pk = get_object_or_404(Playlist.objects.values_list("pk", flat=True), slug=slug)
+
+        def build() -> Response:
+            playlist = Playlist.objects.select_related("creator").prefetch_related("tracks").get(pk=pk)
+            serializer = PlaylistSerializer(playlist, context={"request": request})
+            return Response(serializer.data)
+
+        return conditional_get(request, etag_for(f"playlist:{pk}"), build)
 
 
 class PlaylistLikeView(APIView):
@@ -24,14 +31,8 @@ class PlaylistLikeView(APIView):
 
     def post(self, request: Request, slug: str) -> Response:
         playlist = get_object_or_404(Playlist, slug=slug)
-        like, created = Like.objects.get_or_create(user=request.user, playlist=playlist)
-        if created:
-            Playlist.objects.filter(pk=playlist.pk).update(likes_count=F("likes_count") + 1)
-        else:
-            like.delete()
-            Playlist.objects.filter(pk=playlist.pk).update(likes_count=F("likes_count") - 1)
-        playlist.refresh_from_db(fields=["likes_count"])
-        return Response({"liked": created, "likes_count": playlist.likes_count})
+        result = toggle_like(request.user, playlist)
+        return Response({"liked": result.liked, "likes_count": result.likes_count})
 
 
 class PlaylistTracksView(APIView):
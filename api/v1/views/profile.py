@@ -3,9 +3,11 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.models import MusicRecommendation, Notification, Playlist, SavedBook
+from core import unread
+from core.models import Book, MusicRecommendation, Notification, Playlist
 from api.v1.filters.pagination import NotificationCursorPagination
 from api.v1.serializers.book import BookListSerializer
+from api.v1.serializers.mixins import resolve_lang
 from api.v1.serializers.music import MusicRecommendationSerializer, PlaylistSerializer
 from api.v1.serializers.notification import NotificationSerializer
 from api.v1.serializers.user import UserSerializer, UserUpdateSerializer
@@ -34,12 +36,9 @@ class ProfileSavedView(APIView):
     permission_classes = (IsAuthenticated,)
 
     def get(self, request: Request) -> Response:
-        books = [
-            s.book
-            for s in SavedBook.objects.filter(user=request.user)
-            .select_related("book__author", "book__genre")
-            .prefetch_related("book__translations")
-        ]
+        books = Book.objects.filter(savedbook__user=request.user).with_card_stats(
+            resolve_lang(request)
+        )
         serializer = BookListSerializer(books, many=True, context={"request": request})
         return Response(serializer.data)
 
@@ -58,7 +57,7 @@ class ProfileRecommendationsView(APIView):
 
     def get(self, request: Request) -> Response:
         qs = MusicRecommendation.objects.filter(user=request.user).select_related(
-            "chapter__book"
+            "user", "chapter__book"
         )
         serializer = MusicRecommendationSerializer(
             qs, many=True, context={"request": request}
@@ -77,6 +76,18 @@ class ProfileNotificationsView(APIView):
         return paginator.get_paginated_response(serializer.data)
 
 
+class ProfileNotificationsCountView(APIView):
+    """Unread count for badge polling; see ``core.views.notifications.notification_count``."""
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request: Request) -> Response:
+        count = unread.peek(request.user.pk)
+        if count is None:
+            count = Notification.unread_count(request.user)
+        return Response({"unread_count": count})
+
+
 class ProfileNotificationsReadView(APIView):
     permission_classes = (IsAuthenticated,)
 
@@ -1,10 +1,42 @@
+import asyncio
+
+from django.http import HttpRequest, JsonResponse
+from django.views import View
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from api.v1.services.open_library import open_library_client
-from api.v1.services.spotify import SpotifyError, spotify_client
+from api.v1.services.music_search import afederated_search, fetch_source
+from api.v1.services.open_library import OpenLibraryBook, open_library_client
+from api.v1.services.spotify import SpotifyError, SpotifyTrack, spotify_client
+from api.v1.services.youtube import youtube_client
+from core.rate_limit import youtube_search_limit
+from core.suggest import suggest
+
+
+def _track_data(t: SpotifyTrack) -> dict:
+    return {
+        "spotify_id": t.spotify_id,
+        "title": t.title,
+        "artist": t.artist,
+        "album": t.album,
+        "cover_url": t.cover_url,
+        "preview_url": t.preview_url,
+        "spotify_url": t.spotify_url,
+    }
+
+
+def _book_data(b: OpenLibraryBook) -> dict:
+    return {
+        "open_library_id": b.open_library_id,
+        "title": b.title,
+        "author": b.author,
+        "year": b.year,
+        "isbn": b.isbn,
+        "description": b.description,
+        "cover_url": b.cover_url,
+    }
 
 
 class MusicSearchView(APIView):
@@ -20,19 +52,7 @@ class MusicSearchView(APIView):
         except SpotifyError as exc:
             return Response({"error": str(exc), "results": []}, status=502)
 
-        results = [
-            {
-                "spotify_id": t.spotify_id,
-                "title": t.title,
-                "artist": t.artist,
-                "album": t.album,
-                "cover_url": t.cover_url,
-                "preview_url": t.preview_url,
-                "spotify_url": t.spotify_url,
-            }
-            for t in tracks
-        ]
-        return Response({"results": results})
+        return Response({"results": [_track_data(t) for t in tracks]})
 
 
 class BookSearchView(APIView):
@@ -44,16 +64,91 @@ class BookSearchView(APIView):
             return Response({"results": []})
 
         books = open_library_client.search(query, limit=10)
-        results = [
-            {
-                "open_library_id": b.open_library_id,
-                "title": b.title,
-                "author": b.author,
-                "year": b.year,
-                "isbn": b.isbn,
-                "description": b.description,
-                "cover_url": b.cover_url,
-            }
-            for b in books
-        ]
-        return Response({"results": results})
+        return Response({"results": [_book_data(b) for b in books]})
+
+
+class SuggestView(APIView):
+    permission_classes = (AllowAny,)
+
+    def get(self, request: Request) -> Response:
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"results": []})
+        return Response({"results": suggest(query)})
+
+
+# ── Async (ASGI) ──────────────────────────────────────────────────────────────
+# Plain Django async views: DRF's APIView is sync-only. These endpoints are
+# public and read-only, so they need neither DRF authentication nor
+# permissions, and they answer with the same payloads as the views above.
+
+class AsyncMusicSearchView(View):
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        query = request.GET.get("q", "").strip()
+        if len(query) < 2:
+            return JsonResponse({"results": []})
+
+        try:
+            tracks = await spotify_client.asearch_tracks(query, limit=10)
+        except SpotifyError as exc:
+            return JsonResponse({"error": str(exc), "results": []}, status=502)
+        return JsonResponse({"results": [_track_data(t) for t in tracks]})
+
+
+class AsyncBookSearchView(View):
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        query = request.GET.get("q", "").strip()
+        if len(query) < 2:
+            return JsonResponse({"results": []})
+
+        books = await open_library_client.asearch(query, limit=10)
+        return JsonResponse({"results": [_book_data(b) for b in books]})
+
+
+class FederatedMusicSearchView(View):
+    """
+    Spotify and YouTube results for one query as a single deduplicated,
+    ranked list — what the add-music form searches. Answers 502 only when
+    both providers fail.
+    """
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        query = request.GET.get("q", "").strip()[:100]
+        results, errors = await afederated_search(query, limit=10)
+        status = 502 if not results and len(errors) == 2 else 200
+        return JsonResponse({"results": results, "errors": errors}, status=status)
+
+
+class CombinedSearchView(View):
+    """
+    Spotify tracks, YouTube videos and Open Library books for one query,
+    fetched concurrently. A failing or slow source leaves its list empty and
+    is reported under ``errors``; the others are still returned.
+    """
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        query = request.GET.get("q", "").strip()[:100]
+        if len(query) < 2:
+            return JsonResponse({"tracks": [], "videos": [], "books": [], "errors": {}})
+
+        errors: dict[str, str] = {}
+        if youtube_client.configured:
+            videos_call = youtube_client.asearch(query, limit=5)
+        else:
+            videos_call = asyncio.sleep(0, result=[])
+            errors["youtube"] = "YouTube API key not configured."
+        tracks, videos, books = await asyncio.gather(
+            fetch_source(spotify_client.asearch_tracks(query, limit=10), errors, "spotify"),
+            fetch_source(videos_call, errors, "youtube"),
+            fetch_source(open_library_client.asearch(query, limit=10), errors, "openlibrary"),
+        )
+        return JsonResponse({
+            "tracks": [_track_data(t) for t in tracks],
+            "videos": [v.as_dict() for v in videos],
+            "books": [_book_data(b) for b in books],
+            "errors": errors,
+        })
+
+
+federated_music_search_view = youtube_search_limit(FederatedMusicSearchView.as_view())
+combined_search_view = youtube_search_limit(CombinedSearchView.as_view())
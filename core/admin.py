@@ -1,12 +1,18 @@
 from django.contrib import admin
+from django.db.models import Count
 
+from . import jobs, suggest, unread
+from .facets import invalidate_genre_facets
+from .ratings import set_book_rating
+from .versions import bump
 from .models import (
     Author, AuthorTranslation, AuthorVerification,
     Book, BookTranslation, Chapter, ChapterTranslation,
     Genre, GenreTranslation,
+    Job,
     Language,
     MusicRecommendation,
-    Notification,
+    Notification, NotificationArchive,
     Playlist, PlaylistTrack,
     Like, Comment, SavedBook,
     UserProfile,
@@ -94,14 +100,29 @@ class BookAdmin(admin.ModelAdmin):
 
     @admin.action(description="Approve selected books")
     def approve_books(self, request, queryset):
-        updated = queryset.update(is_approved=True)
+        updated = self._set_approved(queryset, True)
         self.message_user(request, f"{updated} book(s) approved.")
 
     @admin.action(description="Reject selected books")
     def reject_books(self, request, queryset):
-        updated = queryset.update(is_approved=False)
+        updated = self._set_approved(queryset, False)
         self.message_user(request, f"{updated} book(s) rejected.")
 
+    @staticmethod
+    def _set_approved(queryset, approved: bool) -> int:
+        # QuerySet.update() sends no signals, so refresh the derived data here.
+        rows = list(queryset.values_list("pk", "author_id"))
+        book_ids = [pk for pk, _ in rows]
+        updated = queryset.update(is_approved=approved)
+        invalidate_genre_facets()
+        suggest.index_books(book_ids)
+        bump(
+            "catalog",
+            *(f"book:{pk}" for pk in book_ids),
+            *(f"author:{author_id}" for _, author_id in rows if author_id),
+        )
+        return updated
+
 
 # ── Chapter ───────────────────────────────────────────────────────────────────
 
@@ -209,6 +230,15 @@ class BookRatingAdmin(admin.ModelAdmin):
     list_display = ["user", "book", "score"]
     list_filter = ["score"]
 
+    def get_readonly_fields(self, request, obj=None):
+        # Moving a rating to another user or book would leave both books' totals wrong.
+        return ["user", "book"] if obj is not None else []
+
+    def save_model(self, request, obj, form, change):
+        # Through core.ratings so the book's rating_sum / rating_count follow.
+        set_book_rating(obj.user, obj.book, obj.score)
+        obj.pk = BookRating.objects.only("pk").get(user=obj.user, book=obj.book).pk
+
 
 # ── Notification ──────────────────────────────────────────────────────────────
 
@@ -221,5 +251,34 @@ class NotificationAdmin(admin.ModelAdmin):
 
     @admin.action(description="Mark selected as read")
     def mark_read(self, request, queryset):
+        per_recipient = queryset.filter(is_read=False).values_list("recipient_id").annotate(n=Count("pk"))
+        for recipient_id, count in per_recipient:
+            unread.adjust(recipient_id, -count)
         updated = queryset.update(is_read=True)
         self.message_user(request, f"{updated} notification(s) marked as read.")
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ["recipient", "type", "count", "created_at", "archived_at"]
+    list_filter = ["type"]
+    search_fields = ["recipient__username"]
+    readonly_fields = ["recipient", "type", "count", "created_at", "archived_at", "content_type", "object_id"]
+
+    def has_add_permission(self, request):
+        return False
+
+
+# ── Background jobs ───────────────────────────────────────────────────────────
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["task", "status", "attempts", "run_at", "locked_by", "created_at"]
+    list_filter = ["status", "task"]
+    readonly_fields = ["locked_at", "locked_by", "last_error", "created_at"]
+    actions = ["requeue_selected"]
+
+    @admin.action(description="Requeue selected dead jobs")
+    def requeue_selected(self, request, queryset):
+        count = jobs.requeue(queryset)
+        self.message_user(request, f"{count} job(s) requeued.")
@@ -7,4 +7,5 @@ class CoreConfig(AppConfig):
 
     def ready(self) -> None:
         import core.models.profile  # noqa: F401 — registers User post_save signals
-        import core.signals  # noqa: F401 — registers Like / Comment notification signals
+        import core.signals  # noqa: F401 — registers notification and search index signals
+        import core.notifications  # noqa: F401 — registers the notification background jobs
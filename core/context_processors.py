@@ -6,4 +6,5 @@ def site(request):
         'SITE_NAME': settings.SITE_NAME,
         'PLAUSIBLE_DOMAIN': getattr(settings, 'PLAUSIBLE_DOMAIN', ''),
         'GOOGLE_SITE_VERIFICATION': getattr(settings, 'GOOGLE_SITE_VERIFICATION', ''),
+        'REALTIME_EVENTS': getattr(settings, 'REALTIME_EVENTS', False),
     }
@@ -0,0 +1,136 @@
+"""
+Write-behind counters for hot integer columns (``Book.views_count`` and,
+with ``LIKES_WRITE_BEHIND``, the ``likes_count`` columns).
+
+Increments are accumulated in a Redis hash on the ``default`` cache
+connection and applied to the database in batched UPDATEs by
+``flush()`` — see the ``flush_counters`` management command — which also
+bumps the cache versions of the flushed like counts. When the
+cache backend is not Redis (local dev, tests) or Redis is unreachable,
+increments are written straight to the database instead.
+"""
+from __future__ import annotations
+
+import logging
+import uuid
+from collections.abc import Callable
+
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from redis.exceptions import RedisError, ResponseError
+
+from core.models import Book, MusicRecommendation, Playlist
+from core.utils.redis_client import get_redis
+from core.versions import bump
+
+logger = logging.getLogger(__name__)
+
+_FLUSH_BATCH_SIZE = 500
+
+
+class BufferedCounter:
+    def __init__(
+        self,
+        model: type[models.Model],
+        field: str,
+        refs: Callable[[list[int]], set[str]] | None = None,
+    ) -> None:
+        self.model = model
+        self.field = field
+        # Cache-version refs covering the given rows, bumped once a flush lands.
+        self.refs = refs
+        self.key = f"counters:{model._meta.label_lower}:{field}"
+
+    def incr(self, pk: int, delta: int = 1) -> None:
+        conn = get_redis()
+        if conn is not None:
+            try:
+                conn.hincrby(self.key, pk, delta)
+                return
+            except RedisError:
+                logger.warning("Counter buffer %s unavailable, writing through", self.key)
+        self._apply({pk: delta})
+
+    def pending(self, pk: int) -> int:
+        """Increments buffered for *pk* that have not been flushed yet."""
+        conn = get_redis()
+        if conn is None:
+            return 0
+        try:
+            return int(conn.hget(self.key, pk) or 0)
+        except RedisError:
+            return 0
+
+    def flush(self) -> int:
+        """
+        Move buffered increments into the database. The hash is renamed
+        atomically before reading, so increments arriving during the flush
+        land in a fresh hash and are picked up next time.
+
+        Returns the number of rows updated.
+        """
+        conn = get_redis()
+        if conn is None:
+            return 0
+
+        snapshot = f"{self.key}:flushing:{uuid.uuid4().hex}"
+        try:
+            conn.rename(self.key, snapshot)
+        except ResponseError:
+            return 0  # nothing buffered
+
+        deltas = {int(pk): int(value) for pk, value in conn.hgetall(snapshot).items() if int(value)}
+        try:
+            updated = self._apply(deltas)
+        except Exception:
+            # Put the increments back so they are not lost.
+            pipe = conn.pipeline()
+            for pk, delta in deltas.items():
+                pipe.hincrby(self.key, pk, delta)
+            pipe.delete(snapshot)
+            pipe.execute()
+            raise
+        conn.delete(snapshot)
+        if self.refs is not None and deltas:
+            # The Like-time bump ran before these deltas reached the database.
+            bump(*self.refs(list(deltas)))
+        return updated
+
+    def _apply(self, deltas: dict[int, int]) -> int:
+        updated = 0
+        pks = list(deltas)
+        with transaction.atomic():
+            for start in range(0, len(pks), _FLUSH_BATCH_SIZE):
+                batch = pks[start:start + _FLUSH_BATCH_SIZE]
+                updated += self.model._default_manager.filter(pk__in=batch).update(**{
+                    self.field: F(self.field) + Case(
+                        *[When(pk=pk, then=Value(deltas[pk])) for pk in batch],
+                        default=Value(0),
+                    ),
+                })
+        return updated
+
+
+def _music_refs(pks: list[int]) -> set[str]:
+    refs = {"music"}
+    for chapter_id, book_id in MusicRecommendation.objects.filter(pk__in=pks).values_list(
+        "chapter_id", "chapter__book_id"
+    ):
+        refs |= {f"chapter:{chapter_id}", f"book:{book_id}"}
+    return refs
+
+
+def _playlist_refs(pks: list[int]) -> set[str]:
+    refs = set()
+    for pk, book_id, chapter_id in Playlist.objects.filter(pk__in=pks).values_list("pk", "book_id", "chapter_id"):
+        refs |= {f"playlist:{pk}", f"book:{book_id}"}
+        if chapter_id:
+            refs.add(f"chapter:{chapter_id}")
+    return refs
+
+
+book_views = BufferedCounter(Book, "views_count")
+music_likes = BufferedCounter(MusicRecommendation, "likes_count", refs=_music_refs)
+playlist_likes = BufferedCounter(Playlist, "likes_count", refs=_playlist_refs)
+
+COUNTERS: list[BufferedCounter] = [book_views, music_likes, playlist_likes]
@@ -0,0 +1,90 @@
+"""
+Genre facets for the catalog: every genre with at least one published book,
+its name per language and its published-book count.
+
+The facet table is computed in two grouped queries and cached under a single
+key until a book is approved, rejected, re-genred or deleted, or a genre or
+genre translation changes (see ``core.signals`` and the book admin actions).
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from core.models import Book, GenreTranslation
+
+_CACHE_KEY = "facets:genres"
+_CACHE_TTL = 60 * 60 * 24  # invalidated explicitly; the TTL only bounds drift
+
+
+@dataclass(frozen=True)
+class GenreFacet:
+    slug: str
+    name: str
+    count: int
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _compute() -> list[dict]:
+    counts = dict(
+        Book.published.exclude(genre__isnull=True)
+        .order_by()
+        .values("genre_id")
+        .annotate(total=Count("pk"))
+        .values_list("genre_id", "total")
+    )
+    rows: dict[int, dict] = {}
+    for genre_id, slug, lang, name in (
+        GenreTranslation.objects.filter(genre_id__in=counts)
+        .order_by("pk")
+        .values_list("genre_id", "genre__slug", "language__code", "name")
+    ):
+        row = rows.setdefault(genre_id, {"slug": slug, "names": {}, "count": counts[genre_id]})
+        row["names"][lang] = name
+
+    # Books that only carry the free-text legacy genre are faceted by that text.
+    legacy = (
+        Book.published.filter(genre__isnull=True)
+        .exclude(genre_legacy="")
+        .order_by()
+        .values("genre_legacy")
+        .annotate(total=Count("pk"))
+        .values_list("genre_legacy", "total")
+    )
+    return list(rows.values()) + [
+        {"slug": "", "names": {}, "legacy": name, "count": total} for name, total in legacy
+    ]
+
+
+def _rows() -> list[dict]:
+    rows = cache.get(_CACHE_KEY)
+    if rows is None:
+        rows = _compute()
+        cache.set(_CACHE_KEY, rows, _CACHE_TTL)
+    return rows
+
+
+def genre_facets(lang: str = "uk") -> list[GenreFacet]:
+    """
+    Genre facets named in *lang* (falling back to any translation), sorted by
+    name. A legacy genre spelled like a real one is merged into it, matching
+    the home page filter, which accepts either.
+    """
+    facets: dict[str, GenreFacet] = {}
+    for row in _rows():
+        names = row["names"]
+        name = row.get("legacy") or names.get(lang) or next(iter(names.values()), row["slug"])
+        previous = facets.get(name.lower())
+        if previous is not None:
+            row = {**row, "slug": previous.slug or row["slug"], "count": previous.count + row["count"]}
+            name = previous.name
+        facets[name.lower()] = GenreFacet(slug=row["slug"], name=name, count=row["count"])
+    return sorted(facets.values(), key=lambda facet: facet.name.lower())
+
+
+def invalidate_genre_facets() -> None:
+    cache.delete(_CACHE_KEY)
@@ -0,0 +1,147 @@
+"""
+Database-backed background jobs for side effects that should not hold up
+a request — outgoing email and in-app notifications.
+
+``enqueue(task, **payload)`` inserts a ``Job`` row in the caller's
+transaction, so a job exists exactly when the change that caused it was
+committed. ``manage.py run_jobs`` claims due rows
+(``SELECT … FOR UPDATE SKIP LOCKED`` where supported, so several workers
+can run side by side), calls the registered function with the payload,
+and deletes the row on success. A failure is retried with exponential
+backoff; after ``max_attempts`` the job is marked ``dead`` and kept with
+its error. A worker that dies mid-job leaves its rows ``running``; they
+are claimed again once ``_LOCK_TIMEOUT`` has passed.
+
+Tasks are plain functions registered with ``@task("name")``. Payloads
+must be JSON-serializable — pass primary keys, not model instances.
+
+With ``JOBS_EAGER`` (the default, for deployments without a worker) jobs
+run inline once the transaction commits, with no retries and no delay.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import random
+import socket
+import traceback
+from collections.abc import Callable
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+_BACKOFF_BASE = 10
+_BACKOFF_MAX = 60 * 60
+# Longer than any task may take; a row locked for longer belongs to a dead worker.
+_LOCK_TIMEOUT = timedelta(minutes=10)
+
+_TASKS: dict[str, tuple[Callable[..., None], int]] = {}
+
+
+def task(name: str, max_attempts: int = 5):
+    """Register the decorated function as the handler of *name*."""
+    def decorator(func: Callable[..., None]) -> Callable[..., None]:
+        _TASKS[name] = (func, max_attempts)
+        return func
+
+    return decorator
+
+
+def enqueue(name: str, *, delay: float = 0, **payload) -> None:
+    if name not in _TASKS:
+        raise KeyError(f"Unknown task {name!r}")
+    if getattr(settings, "JOBS_EAGER", True):
+        func, _ = _TASKS[name]
+        transaction.on_commit(lambda: _run_eagerly(name, func, payload))
+        return
+    Job.objects.create(
+        task=name,
+        payload=payload,
+        max_attempts=_TASKS[name][1],
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def _run_eagerly(name: str, func: Callable[..., None], payload: dict) -> None:
+    try:
+        func(**payload)
+    except Exception:
+        logger.exception("Job %s failed", name)
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(worker: str, batch_size: int = 20) -> list[Job]:
+    """Lock up to *batch_size* due jobs for *worker* and return them."""
+    now = timezone.now()
+    due = Q(status=Job.STATUS_PENDING, run_at__lte=now) | Q(
+        status=Job.STATUS_RUNNING, locked_at__lt=now - _LOCK_TIMEOUT
+    )
+    with transaction.atomic():
+        rows = Job.objects.filter(due).order_by("run_at")
+        if connection.features.has_select_for_update_skip_locked:
+            rows = rows.select_for_update(skip_locked=True)
+        elif connection.features.has_select_for_update:
+            rows = rows.select_for_update()
+        jobs = list(rows[:batch_size])
+        if jobs:
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status=Job.STATUS_RUNNING, locked_at=now, locked_by=worker
+            )
+    return jobs
+
+
+def run(job: Job) -> bool:
+    """Run one claimed job; True if it succeeded."""
+    entry = _TASKS.get(job.task)
+    try:
+        if entry is None:
+            raise KeyError(f"Unknown task {job.task!r}")
+        with transaction.atomic():
+            entry[0](**job.payload)
+    except Exception:
+        _fail(job, traceback.format_exc())
+        return False
+    Job.objects.filter(pk=job.pk).delete()
+    return True
+
+
+def _fail(job: Job, error: str) -> None:
+    attempts = job.attempts + 1
+    if attempts >= job.max_attempts:
+        logger.error("Job %s #%s is dead after %s attempts", job.task, job.pk, attempts)
+        status, run_at = Job.STATUS_DEAD, job.run_at
+    else:
+        delay = min(_BACKOFF_BASE * 2 ** (attempts - 1), _BACKOFF_MAX) * (0.5 + random.random())
+        logger.warning("Job %s #%s failed, retrying in %.0fs", job.task, job.pk, delay)
+        status, run_at = Job.STATUS_PENDING, timezone.now() + timedelta(seconds=delay)
+    Job.objects.filter(pk=job.pk).update(
+        status=status, attempts=attempts, run_at=run_at, locked_at=None, locked_by="", last_error=error
+    )
+
+
+def run_pending(worker: str, batch_size: int = 20) -> tuple[int, int]:
+    """Claim and run one batch; returns (succeeded, failed)."""
+    succeeded = failed = 0
+    for job in claim(worker, batch_size):
+        if run(job):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def requeue(jobs) -> int:
+    """Give dead jobs (a queryset) a fresh set of attempts."""
+    return jobs.filter(status=Job.STATUS_DEAD).update(
+        status=Job.STATUS_PENDING, attempts=0, run_at=timezone.now(), last_error=""
+    )
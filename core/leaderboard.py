@@ -0,0 +1,228 @@
+"""
+Music leaderboards: global, per-book and per-mood rankings of
+``MusicRecommendation``, each kept both all-time (likes) and trending
+(likes decayed with a half-life of ``TRENDING_HALF_LIFE``).
+
+Rankings live in Redis sorted sets, ``leaderboard:music:<board>:<scope>``
+with ``<scope>`` one of ``global``, ``book:<id>`` or ``mood:<mood>``, and
+are adjusted incrementally from the ``Like`` signals in ``core.signals``.
+A like at time *t* adds ``2 ** ((t - epoch) / half_life)`` to the trending
+score, so newer likes outweigh older ones without rescoring anything; the
+epoch is reset by ``rebuild()`` (``manage.py rebuild_leaderboards``, run
+daily) to keep the exponents small.
+
+Without Redis, ``top_tracks`` ranks straight from the database, using the
+like count in the last ``TRENDING_WINDOW`` for the trending board.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+
+from django.db.models import Count, Q, QuerySet
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from core.models import Like, MusicRecommendation
+from core.utils.redis_client import get_redis
+
+ALL_TIME = "all"
+TRENDING = "trending"
+BOARDS = (ALL_TIME, TRENDING)
+
+TRENDING_HALF_LIFE = timedelta(days=3)
+TRENDING_WINDOW = timedelta(days=30)
+
+_KEY = "leaderboard:music:{board}:{scope}"
+_EPOCH_KEY = "leaderboard:music:epoch"
+_MOODS = [mood for mood, _ in MusicRecommendation.MOOD_CHOICES]
+# Trending scores that decayed/cancelled down to float noise are dropped.
+_MIN_TRENDING_SCORE = 1e-6
+
+
+def _scopes(book_id: int | None, mood: str) -> list[str]:
+    scopes = ["global"]
+    if book_id is not None:
+        scopes.append(f"book:{book_id}")
+    if mood:
+        scopes.append(f"mood:{mood}")
+    return scopes
+
+
+def _key(board: str, book_id: int | None = None, mood: str = "") -> str:
+    if book_id is not None:
+        scope = f"book:{book_id}"
+    elif mood:
+        scope = f"mood:{mood}"
+    else:
+        scope = "global"
+    return _KEY.format(board=board, scope=scope)
+
+
+def _weight(liked_at: datetime, epoch: float) -> float:
+    return 2 ** ((liked_at.timestamp() - epoch) / TRENDING_HALF_LIFE.total_seconds())
+
+
+def _epoch(conn) -> float | None:
+    """Epoch of the current boards, or None until ``rebuild()`` has run once."""
+    epoch = conn.get(_EPOCH_KEY)
+    return float(epoch) if epoch is not None else None
+
+
+# ── Updates ──────────────────────────────────────────────────────────────────
+
+def record_like(track_id: int, liked_at: datetime, delta: int) -> None:
+    """Apply a like (*delta* = 1) or unlike (*delta* = -1) made at *liked_at*."""
+    conn = get_redis()
+    if conn is None:
+        return
+    row = MusicRecommendation.objects.filter(pk=track_id).values_list("chapter__book_id", "mood").first()
+    if row is None:
+        return  # the track itself is being deleted
+    try:
+        epoch = _epoch(conn)
+        if epoch is None:
+            return
+        trending = delta * _weight(liked_at, epoch)
+        pipe = conn.pipeline(transaction=False)
+        for scope in _scopes(*row):
+            pipe.zincrby(_KEY.format(board=ALL_TIME, scope=scope), delta, track_id)
+            trending_key = _KEY.format(board=TRENDING, scope=scope)
+            pipe.zincrby(trending_key, trending, track_id)
+            pipe.zremrangebyscore(trending_key, "-inf", _MIN_TRENDING_SCORE)
+        pipe.execute()
+    except RedisError:
+        pass  # rankings catch up on the next rebuild
+
+
+def _scores(tracks: QuerySet, epoch: float) -> tuple[dict[int, int], dict[int, float]]:
+    since = timezone.now() - TRENDING_WINDOW
+    likes = dict(tracks.annotate(total=Count("likes")).values_list("pk", "total"))
+    trending: dict[int, float] = {}
+    for track_id, liked_at in Like.objects.filter(
+        music_recommendation__in=tracks, created_at__gte=since
+    ).values_list("music_recommendation_id", "created_at"):
+        trending[track_id] = trending.get(track_id, 0.0) + _weight(liked_at, epoch)
+    return likes, trending
+
+
+def sync_tracks(track_ids: list[int]) -> None:
+    """Recompute the entries of *track_ids* from the database, e.g. after a mood change."""
+    conn = get_redis()
+    if conn is None:
+        return
+    tracks = MusicRecommendation.objects.filter(pk__in=track_ids)
+    placement = {pk: (book_id, mood) for pk, book_id, mood in tracks.values_list("pk", "chapter__book_id", "mood")}
+    try:
+        epoch = _epoch(conn)
+        if epoch is None:
+            return
+        likes, trending = _scores(tracks, epoch)
+        # A track never changes book, but may change (or lose) its mood.
+        remove_from = [_KEY.format(board=board, scope="global") for board in BOARDS]
+        remove_from += [_KEY.format(board=board, scope=f"mood:{m}") for board in BOARDS for m in _MOODS]
+        pipe = conn.pipeline()
+        for pk in track_ids:
+            for key in remove_from:
+                pipe.zrem(key, pk)
+            if pk not in placement:
+                continue
+            for scope in _scopes(*placement[pk]):
+                pipe.zadd(_KEY.format(board=ALL_TIME, scope=scope), {pk: likes.get(pk, 0)})
+                if trending.get(pk, 0.0) > _MIN_TRENDING_SCORE:
+                    pipe.zadd(_KEY.format(board=TRENDING, scope=scope), {pk: trending[pk]})
+        pipe.execute()
+    except RedisError:
+        pass
+
+
+def rebuild() -> int:
+    """Rebuild every leaderboard from the database under a fresh epoch; returns the track count."""
+    conn = get_redis()
+    if conn is None:
+        return 0
+
+    epoch = time.time()
+    tracks = MusicRecommendation.objects.all()
+    likes, trending = _scores(tracks, epoch)
+    boards: dict[str, dict[int, float]] = {}
+    for pk, book_id, mood in tracks.values_list("pk", "chapter__book_id", "mood"):
+        for scope in _scopes(book_id, mood):
+            boards.setdefault(_KEY.format(board=ALL_TIME, scope=scope), {})[pk] = likes.get(pk, 0)
+            if trending.get(pk, 0.0) > _MIN_TRENDING_SCORE:
+                boards.setdefault(_KEY.format(board=TRENDING, scope=scope), {})[pk] = trending[pk]
+
+    # Build under temporary names and swap in, so readers never see a half-built board.
+    suffix = f":rebuild:{int(epoch)}"
+    pipe = conn.pipeline()
+    for key, members in boards.items():
+        pipe.delete(key + suffix)
+        pipe.zadd(key + suffix, members)
+    pipe.execute()
+
+    stale = set(conn.scan_iter(match=_KEY.format(board="*", scope="*"), count=1000))
+    pipe = conn.pipeline()
+    for key in stale:
+        key = key.decode() if isinstance(key, bytes) else key
+        if key not in boards and ":rebuild:" not in key:
+            pipe.delete(key)
+    for key in boards:
+        pipe.rename(key + suffix, key)
+    pipe.set(_EPOCH_KEY, epoch)
+    pipe.execute()
+    return len(likes)
+
+
+# ── Queries ──────────────────────────────────────────────────────────────────
+
+def _top_from_db(board: str, book_id: int | None, mood: str, limit: int) -> list[MusicRecommendation]:
+    qs = MusicRecommendation.objects.select_related("user", "chapter__book")
+    if book_id is not None:
+        qs = qs.filter(chapter__book_id=book_id)
+    if mood:
+        qs = qs.filter(mood=mood)
+    if board == TRENDING:
+        since = timezone.now() - TRENDING_WINDOW
+        qs = qs.annotate(
+            recent_likes=Count("likes", filter=Q(likes__created_at__gte=since))
+        ).filter(recent_likes__gt=0).order_by("-recent_likes", "-likes_count")
+    else:
+        qs = qs.order_by("-likes_count", "-created_at")
+    return list(qs[:limit])
+
+
+def top_tracks(
+    board: str = ALL_TIME,
+    book_id: int | None = None,
+    mood: str = "",
+    limit: int = 10,
+) -> list[MusicRecommendation]:
+    """
+    Best tracks on *board*, globally or within one book or mood, with
+    ``user`` and ``chapter__book`` loaded.
+    """
+    conn = get_redis()
+    if conn is None:
+        return _top_from_db(board, book_id, mood, limit)
+
+    key = _key(board, book_id, mood)
+    try:
+        pipe = conn.pipeline(transaction=False)
+        pipe.get(_EPOCH_KEY)
+        pipe.zrevrange(key, 0, limit - 1)
+        epoch, ranked = pipe.execute()
+    except RedisError:
+        return _top_from_db(board, book_id, mood, limit)
+    if epoch is None:
+        return _top_from_db(board, book_id, mood, limit)  # boards not built yet
+
+    ids = [int(pk) for pk in ranked]
+
+    tracks = MusicRecommendation.objects.select_related("user", "chapter__book").in_bulk(ids)
+    missing = [pk for pk in ids if pk not in tracks]
+    if missing:
+        try:
+            conn.zrem(key, *missing)
+        except RedisError:
+            pass
+    return [tracks[pk] for pk in ids if pk in tracks]
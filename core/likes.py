@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from core.counters import music_likes, playlist_likes
+from core.models import Like, MusicRecommendation, Playlist
+
+_TARGETS = {
+    MusicRecommendation: ("music_recommendation", music_likes),
+    Playlist: ("playlist", playlist_likes),
+}
+
+
+@dataclass(frozen=True)
+class LikeResult:
+    liked: bool
+    likes_count: int
+
+
+def _supports_update_returning() -> bool:
+    if connection.vendor == "postgresql":
+        return True
+    return connection.vendor == "sqlite" and connection.features.can_return_columns_from_insert
+
+
+def _adjust_likes_count(model: type[models.Model], pk: int, delta: int) -> int:
+    """Apply *delta* to ``likes_count`` and return the new value in one round trip where possible."""
+    if not _supports_update_returning():
+        model.objects.filter(pk=pk).update(likes_count=models.F("likes_count") + delta)
+        return model.objects.filter(pk=pk).values_list("likes_count", flat=True).get()
+
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {qn(model._meta.db_table)} "
+            f"SET {qn('likes_count')} = {qn('likes_count')} + %s "
+            f"WHERE {qn(model._meta.pk.column)} = %s "
+            f"RETURNING {qn('likes_count')}",
+            [delta, pk],
+        )
+        return cursor.fetchone()[0]
+
+
+def toggle_like(user, target: MusicRecommendation | Playlist) -> LikeResult:
+    """
+    Like *target* if *user* has not liked it yet, otherwise remove the like,
+    adjusting ``likes_count`` in the same transaction.
+
+    With ``settings.LIKES_WRITE_BEHIND`` the counter delta goes to the Redis
+    buffer instead (flushed by ``flush_counters``) so popular rows are not
+    locked on every like; ``likes_count`` then includes the pending delta.
+    """
+    field, counter = _TARGETS[type(target)]
+    lookup = {"user": user, field: target}
+
+    with transaction.atomic():
+        deleted, _ = Like.objects.filter(**lookup).delete()
+        if deleted:
+            delta = -1
+        else:
+            try:
+                with transaction.atomic():
+                    Like.objects.create(**lookup)
+                delta = 1
+            except (IntegrityError, ValidationError):
+                # A concurrent request created the same like first.
+                delta = 0
+
+        if getattr(settings, "LIKES_WRITE_BEHIND", False):
+            if delta:
+                counter.incr(target.pk, delta)
+            count = type(target).objects.filter(pk=target.pk).values_list("likes_count", flat=True).get()
+            count += counter.pending(target.pk)
+        else:
+            count = _adjust_likes_count(type(target), target.pk, delta)
+
+    return LikeResult(liked=not deleted, likes_count=count)
+
+
+def reconcile_likes_counts() -> dict[str, int]:
+    """
+    Recompute ``likes_count`` from ``Like`` rows for tracks and playlists,
+    discarding any drift. Buffered deltas are flushed first so they are not
+    applied twice on top of the recomputed values.
+    """
+    updated: dict[str, int] = {}
+    for model, (field, counter) in _TARGETS.items():
+        counter.flush()
+        likes = (
+            Like.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        updated[model._meta.label] = model.objects.update(
+            likes_count=Coalesce(Subquery(likes), 0)
+        )
+    return updated
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from core import retention
+
+
+class Command(BaseCommand):
+    help = "Move read notifications older than NOTIFICATION_READ_TTL_DAYS to the notification archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Archive read notifications older than this many days (default: NOTIFICATION_READ_TTL_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows moved per transaction (default: 1000).")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would be archived.")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = retention.expired(options["days"]).count()
+            self.stdout.write(f"{count} notification(s) would be archived.")
+            return
+        moved = retention.archive_read(options["days"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{moved} notification(s) archived."))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.counters import COUNTERS
+
+
+class Command(BaseCommand):
+    help = "Flush write-behind counters (e.g. Book.views_count) from Redis into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and flush every N seconds (default: flush once and exit).",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        while True:
+            for counter in COUNTERS:
+                updated = counter.flush()
+                if updated:
+                    self.stdout.write(f"{counter.key}: {updated} row(s) updated")
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Book
+from core.ratings import rebuild_rating_totals
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized Book.rating_sum / rating_count columns from BookRating rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--book", action="append", default=[], help="Slug of a book to rebuild (repeatable).")
+
+    def handle(self, *args, **options):
+        qs = Book.objects.all()
+        if options["book"]:
+            qs = qs.filter(slug__in=options["book"])
+        updated = rebuild_rating_totals(qs)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating totals for {updated} book(s)."))
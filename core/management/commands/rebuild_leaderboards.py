@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.leaderboard import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the music leaderboards in Redis and reset the trending epoch. Run daily."
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        if not count:
+            self.stdout.write("Nothing ranked (no Redis connection or no tracks).")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Ranked {count} track(s)."))
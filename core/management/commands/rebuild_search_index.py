@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.search import reindex_books
+
+
+class Command(BaseCommand):
+    help = "Rebuild the catalog full-text search documents for every book."
+
+    def handle(self, *args, **options):
+        count = reindex_books()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} book(s)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.suggest import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Redis autocomplete index, refreshing popularity weights. Run periodically."
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        if not count:
+            self.stdout.write("Nothing indexed (no Redis connection or empty catalog).")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} suggestion(s)."))
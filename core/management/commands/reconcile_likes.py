@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.likes import reconcile_likes_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute MusicRecommendation / Playlist likes_count from Like rows to fix drift."
+
+    def handle(self, *args, **options):
+        for label, updated in reconcile_likes_counts().items():
+            self.stdout.write(self.style.SUCCESS(f"{label}: {updated} row(s) reconciled."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.unread import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute the cached unread-notification counters from the Notification table to fix drift."
+
+    def handle(self, *args, **options):
+        corrected = reconcile()
+        self.stdout.write(self.style.SUCCESS(f"{corrected} unread counter(s) reconciled."))
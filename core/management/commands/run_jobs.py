@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (emails, in-app notifications)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs that are due now and exit (default: keep polling).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when the queue is empty (default: 1).",
+        )
+        parser.add_argument("--batch-size", type=int, default=20, help="Jobs claimed per poll (default: 20).")
+
+    def handle(self, *args, **options):
+        worker = jobs.worker_id()
+        while True:
+            succeeded, failed = jobs.run_pending(worker, options["batch_size"])
+            if succeeded or failed:
+                self.stdout.write(f"{succeeded} job(s) done, {failed} failed")
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def forward(apps, schema_editor):
+    Book = apps.get_model("core", "Book")
+    BookRating = apps.get_model("core", "BookRating")
+
+    ratings = BookRating.objects.filter(book=OuterRef("pk")).order_by().values("book")
+    Book.objects.update(
+        rating_sum=Coalesce(Subquery(ratings.annotate(total=Sum("score")).values("total")), 0),
+        rating_count=Coalesce(Subquery(ratings.annotate(total=Count("pk")).values("total")), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0018_notification"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(forward, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,117 @@
+"""
+Full-text search index for the catalog.
+
+Creates BookSearchDocument plus a database-specific index over its
+``document`` column, then builds a document for every existing book:
+
+* PostgreSQL — GIN index on to_tsvector('simple', document);
+* SQLite     — FTS5 external-content table synced by triggers.
+"""
+from django.db import migrations, models
+import django.db.models.deletion
+
+FTS_TABLE = "core_booksearch_fts"
+
+SQLITE_FORWARD = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        document,
+        content='core_booksearchdocument',
+        content_rowid='book_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_booksearch_ai AFTER INSERT ON core_booksearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.book_id, new.document);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_booksearch_ad AFTER DELETE ON core_booksearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.book_id, old.document);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_booksearch_au AFTER UPDATE ON core_booksearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.book_id, old.document);
+        INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.book_id, new.document);
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS core_booksearch_au",
+    "DROP TRIGGER IF EXISTS core_booksearch_ad",
+    "DROP TRIGGER IF EXISTS core_booksearch_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# Must match the expression Django emits for SearchVector("document", config="simple").
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX IF NOT EXISTS core_booksearch_tsv_idx ON core_booksearchdocument
+    USING gin (to_tsvector('simple'::regconfig, COALESCE(document, '')))
+    """,
+]
+
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS core_booksearch_tsv_idx"]
+
+
+def _run(schema_editor, statements_by_vendor: dict) -> None:
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD})
+
+
+def drop_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD})
+
+
+def build_documents(apps, schema_editor):
+    Book = apps.get_model("core", "Book")
+    BookSearchDocument = apps.get_model("core", "BookSearchDocument")
+
+    books = Book.objects.select_related("author", "genre").prefetch_related(
+        "translations", "author__translations", "genre__translations"
+    )
+    documents = []
+    for book in books:
+        parts = [t.title for t in book.translations.all()]
+        if book.author_id:
+            parts += [t.name for t in book.author.translations.all()]
+        if book.genre_id:
+            parts += [t.name for t in book.genre.translations.all()]
+        parts += [book.author_legacy, book.genre_legacy]
+        document = "\n".join(dict.fromkeys(p.strip() for p in parts if p and p.strip()))
+        documents.append(BookSearchDocument(book_id=book.pk, document=document))
+    BookSearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0019_book_rating_totals"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookSearchDocument",
+            fields=[
+                ("book", models.OneToOneField(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    primary_key=True,
+                    related_name="search_document",
+                    serialize=False,
+                    to="core.book",
+                )),
+                ("document", models.TextField(blank=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={"verbose_name": "Book search document", "verbose_name_plural": "Book search documents"},
+        ),
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(build_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,123 @@
+"""
+Transliteration-aware fuzzy search.
+
+Adds BookSearchDocument.fuzzy (ASCII transliteration of ``document``) and
+a trigram index over it:
+
+* PostgreSQL — pg_trgm GIN index, queried with the ``%>`` operator;
+* SQLite     — FTS5 external-content table with the trigram tokenizer.
+"""
+from importlib import import_module
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+from slugify import slugify
+
+# Add/RemoveField rebuild the table on SQLite, which drops the 0020 sync triggers.
+search_0020 = import_module("core.migrations.0020_book_search_document")
+
+TRGM_TABLE = "core_booksearch_trgm"
+
+# Frozen copy of core.search.fuzzy_key as of this migration.
+_FUZZY_FOLD = str.maketrans({"y": "i", "j": "i", "h": "g", "w": "v"})
+
+
+def fuzzy_key(text: str) -> str:
+    return slugify(text, separator=" ", allow_unicode=False).translate(_FUZZY_FOLD)
+
+
+class PostgresTrigramExtension(TrigramExtension):
+    # CreateExtension only checks the vendor going forwards; unapplying on SQLite
+    # would otherwise query pg_extension.
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+SQLITE_FORWARD = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TRGM_TABLE} USING fts5(
+        fuzzy,
+        content='core_booksearchdocument',
+        content_rowid='book_id',
+        tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_booksearch_trgm_ai AFTER INSERT ON core_booksearchdocument BEGIN
+        INSERT INTO {TRGM_TABLE}(rowid, fuzzy) VALUES (new.book_id, new.fuzzy);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_booksearch_trgm_ad AFTER DELETE ON core_booksearchdocument BEGIN
+        INSERT INTO {TRGM_TABLE}({TRGM_TABLE}, rowid, fuzzy) VALUES ('delete', old.book_id, old.fuzzy);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_booksearch_trgm_au AFTER UPDATE ON core_booksearchdocument BEGIN
+        INSERT INTO {TRGM_TABLE}({TRGM_TABLE}, rowid, fuzzy) VALUES ('delete', old.book_id, old.fuzzy);
+        INSERT INTO {TRGM_TABLE}(rowid, fuzzy) VALUES (new.book_id, new.fuzzy);
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS core_booksearch_trgm_au",
+    "DROP TRIGGER IF EXISTS core_booksearch_trgm_ad",
+    "DROP TRIGGER IF EXISTS core_booksearch_trgm_ai",
+    f"DROP TABLE IF EXISTS {TRGM_TABLE}",
+]
+
+# pg_trgm itself is created by the TrigramExtension operation.
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX IF NOT EXISTS core_booksearch_fuzzy_trgm_idx ON core_booksearchdocument
+    USING gin (fuzzy gin_trgm_ops)
+    """,
+]
+
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS core_booksearch_fuzzy_trgm_idx"]
+
+
+def _run(schema_editor, statements_by_vendor: dict) -> None:
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": search_0020.SQLITE_FORWARD + SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD})
+
+
+def drop_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD})
+
+
+def restore_search_triggers(apps, schema_editor):
+    _run(schema_editor, {"sqlite": search_0020.SQLITE_FORWARD})
+
+
+def fill_fuzzy(apps, schema_editor):
+    BookSearchDocument = apps.get_model("core", "BookSearchDocument")
+    documents = list(BookSearchDocument.objects.only("pk", "document"))
+    for doc in documents:
+        doc.fuzzy = fuzzy_key(doc.document)
+    BookSearchDocument.objects.bulk_update(documents, ["fuzzy"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0020_book_search_document"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddField(
+            model_name="booksearchdocument",
+            name="fuzzy",
+            field=models.TextField(blank=True),
+        ),
+        PostgresTrigramExtension(),
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(fill_fuzzy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0023_notification_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["recipient", "-created_at"], name="core_notif_recip_created_idx"),
+        ),
+        migrations.CreateModel(
+            name="NotificationArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("type", models.CharField(
+                    choices=[
+                        ("like_music", "Music liked"),
+                        ("comment_reply", "Comment reply"),
+                        ("verification_approved", "Verification approved"),
+                        ("verification_rejected", "Verification rejected"),
+                    ],
+                    max_length=30,
+                )),
+                ("count", models.PositiveIntegerField(default=1)),
+                ("created_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                ("object_id", models.PositiveIntegerField(blank=True, null=True)),
+                ("content_type", models.ForeignKey(
+                    blank=True, null=True,
+                    on_delete=django.db.models.deletion.CASCADE,
+                    to="contenttypes.contenttype",
+                )),
+                ("recipient", models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name="archived_notifications",
+                    to=settings.AUTH_USER_MODEL,
+                )),
+            ],
+            options={
+                "verbose_name": "Archived notification",
+                "verbose_name_plural": "Archived notifications",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="notificationarchive",
+            index=models.Index(fields=["recipient", "-created_at"], name="core_notifarch_recip_idx"),
+        ),
+    ]
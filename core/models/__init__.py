@@ -5,7 +5,9 @@ from .book import Book, BookTranslation, Chapter, ChapterTranslation
 from .music import MusicRecommendation, Playlist, PlaylistTrack
 from .interaction import Like, Comment, SavedBook, Follow, BookRating
 from .profile import UserProfile
-from .notification import Notification
+from .notification import Notification, NotificationArchive
+from .job import Job
+from .search import BookSearchDocument
 
 __all__ = [
     "Language",
@@ -28,4 +30,7 @@ __all__ = [
     "BookRating",
     "UserProfile",
     "Notification",
+    "NotificationArchive",
+    "Job",
+    "BookSearchDocument",
 ]
@@ -3,9 +3,10 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 
 from .language import Language
+from .mixins import TranslatableMixin
 
 
-class Author(models.Model):
+class Author(TranslatableMixin, models.Model):
     slug = models.SlugField(unique=True)
     photo_url = models.URLField(blank=True)
     birth_year = models.IntegerField(null=True, blank=True)
@@ -20,18 +21,14 @@ class Author(models.Model):
         return self.get_name()
 
     def get_name(self, lang: str = "uk") -> str:
-        translation = self.translations.filter(language__code=lang).first()
-        if translation:
-            return translation.name
-        fallback = self.translations.first()
-        return fallback.name if fallback else self.slug
+        if self._prefetched_translations() is None:
+            from core.refdata import author_name
+
+            return author_name(self.pk, lang)
+        return self._translated("name", lang, self.slug)
 
     def get_bio(self, lang: str = "uk") -> str:
-        translation = self.translations.filter(language__code=lang).first()
-        if translation:
-            return translation.bio
-        fallback = self.translations.first()
-        return fallback.bio if fallback else ""
+        return self._translated("bio", lang, "")
 
 
 class AuthorTranslation(models.Model):
@@ -1,11 +1,74 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.models import Case, Count, F, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 
+from .author import AuthorTranslation
+from .genre import GenreTranslation
 from .language import Language
+from .mixins import TranslatableMixin
+
+
+def _first_value(qs: models.QuerySet, field: str) -> Subquery:
+    return Subquery(qs.order_by("pk").values(field)[:1])
+
+
+class BookQuerySet(models.QuerySet):
+    def with_card_stats(self, lang: str = "uk") -> "BookQuerySet":
+        """
+        Annotate everything a book card needs so a page of books is a single
+        SELECT: resolved ``card_title`` / ``card_author_name`` /
+        ``card_genre_name`` (requested language, then first translation, then
+        legacy columns), ``approved_chapters_count`` and a sortable ``rating_avg``.
+        """
+        titles = BookTranslation.objects.filter(book=OuterRef("pk"))
+        authors = AuthorTranslation.objects.filter(author=OuterRef("author_id"))
+        genres = GenreTranslation.objects.filter(genre=OuterRef("genre_id"))
+
+        approved_chapters = (
+            Chapter.objects.filter(book=OuterRef("pk"), is_approved=True)
+            .order_by()
+            .values("book")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+
+        return self.annotate(
+            card_title=Coalesce(
+                _first_value(titles.filter(language__code=lang).exclude(title=""), "title"),
+                _first_value(titles, "title"),
+            ),
+            card_author_name=Case(
+                When(author__isnull=True, then=F("author_legacy")),
+                default=Coalesce(
+                    _first_value(authors.filter(language__code=lang), "name"),
+                    _first_value(authors, "name"),
+                    F("author__slug"),
+                    output_field=models.CharField(),
+                ),
+                output_field=models.CharField(),
+            ),
+            card_genre_name=Case(
+                When(genre__isnull=True, then=F("genre_legacy")),
+                default=Coalesce(
+                    _first_value(genres.filter(language__code=lang), "name"),
+                    _first_value(genres, "name"),
+                    F("genre__slug"),
+                    output_field=models.CharField(),
+                ),
+                output_field=models.CharField(),
+            ),
+            approved_chapters_count=Coalesce(Subquery(approved_chapters), 0),
+            rating_avg=Case(
+                When(rating_count=0, then=Value(0.0)),
+                default=F("rating_sum") * 1.0 / F("rating_count"),
+                output_field=FloatField(),
+            ),
+        )
 
 
-class PublishedManager(models.Manager):
+class PublishedManager(models.Manager.from_queryset(BookQuerySet)):
     def get_queryset(self):
         return super().get_queryset().filter(is_approved=True)
 
@@ -15,7 +78,7 @@ class ApprovedChapterManager(models.Manager):
         return super().get_queryset().filter(is_approved=True)
 
 
-class Book(models.Model):
+class Book(TranslatableMixin, models.Model):
     creator = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -66,6 +129,10 @@ class Book(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     views_count = models.IntegerField(default=0)
 
+    # Denormalized from BookRating; maintained by core.ratings.set_book_rating
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+
     # Deduplication / external IDs
     isbn = models.CharField(max_length=20, blank=True, db_index=True)
     open_library_id = models.CharField(max_length=50, blank=True, unique=True, null=True)
@@ -78,7 +145,7 @@ class Book(models.Model):
         related_name="editions",
     )
 
-    objects = models.Manager()
+    objects = BookQuerySet.as_manager()
     published = PublishedManager()
 
     class Meta:
@@ -94,27 +161,28 @@ class Book(models.Model):
     # ------------------------------------------------------------------ #
 
     def get_title(self, lang: str = "uk") -> str:
-        translation = self.translations.filter(language__code=lang).first()
-        if translation and translation.title:
-            return translation.title
-        fallback = self.translations.first()
-        return fallback.title if fallback else f"Book #{self.pk}"
+        return self._translated("title", lang, f"Book #{self.pk}", require_value=True)
 
     def get_description(self, lang: str = "uk") -> str:
-        translation = self.translations.filter(language__code=lang).first()
-        if translation:
-            return translation.description
-        fallback = self.translations.first()
-        return fallback.description if fallback else ""
+        return self._translated("description", lang, "")
 
     def get_author_name(self, lang: str = "uk") -> str:
         if self.author_id:
-            return self.author.get_name(lang)
+            # A loaded author answers from its prefetched translations when there are any.
+            if Book.author.is_cached(self):
+                return self.author.get_name(lang)
+            from core.refdata import author_name
+
+            return author_name(self.author_id, lang)
         return self.author_legacy
 
     def get_genre_name(self, lang: str = "uk") -> str:
         if self.genre_id:
-            return self.genre.get_name(lang)
+            if Book.genre.is_cached(self):
+                return self.genre.get_name(lang)
+            from core.refdata import genre_name
+
+            return genre_name(self.genre_id, lang)
         return self.genre_legacy
 
     # ------------------------------------------------------------------ #
@@ -146,10 +214,9 @@ class Book(models.Model):
 
     @property
     def average_rating(self) -> float:
-        from django.db.models import Avg
-
-        result = self.ratings.aggregate(avg=Avg("score"))
-        return round(result["avg"] or 0, 1)
+        if not self.rating_count:
+            return 0
+        return round(self.rating_sum / self.rating_count, 1)
 
 
 class BookTranslation(models.Model):
@@ -167,7 +234,7 @@ class BookTranslation(models.Model):
         return f"{self.title} [{self.language.code}]"
 
 
-class Chapter(models.Model):
+class Chapter(TranslatableMixin, models.Model):
     book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="chapters")
     number = models.IntegerField(verbose_name="Number")
     is_approved = models.BooleanField(default=False, verbose_name="Approved")
@@ -184,25 +251,13 @@ class Chapter(models.Model):
         return f"Ch.{self.number}: {self.get_title()}"
 
     def get_title(self, lang: str = "uk") -> str:
-        translation = self.translations.filter(language__code=lang).first()
-        if translation and translation.title:
-            return translation.title
-        fallback = self.translations.first()
-        return fallback.title if fallback else f"Chapter {self.number}"
+        return self._translated("title", lang, f"Chapter {self.number}", require_value=True)
 
     def get_description(self, lang: str = "uk") -> str:
-        translation = self.translations.filter(language__code=lang).first()
-        if translation:
-            return translation.description
-        fallback = self.translations.first()
-        return fallback.description if fallback else ""
+        return self._translated("description", lang, "")
 
     def get_mood_tags(self, lang: str = "uk") -> str:
-        translation = self.translations.filter(language__code=lang).first()
-        if translation:
-            return translation.mood_tags
-        fallback = self.translations.first()
-        return fallback.mood_tags if fallback else ""
+        return self._translated("mood_tags", lang, "")
 
     def get_absolute_url(self) -> str:
         return reverse(
@@ -1,9 +1,10 @@
 from django.db import models
 
 from .language import Language
+from .mixins import TranslatableMixin
 
 
-class Genre(models.Model):
+class Genre(TranslatableMixin, models.Model):
     slug = models.SlugField(unique=True)
 
     class Meta:
@@ -15,11 +16,11 @@ class Genre(models.Model):
         return self.slug
 
     def get_name(self, lang: str = "uk") -> str:
-        translation = self.translations.filter(language__code=lang).first()
-        if translation:
-            return translation.name
-        fallback = self.translations.first()
-        return fallback.name if fallback else self.slug
+        if self._prefetched_translations() is None:
+            from core.refdata import genre_name
+
+            return genre_name(self.pk, lang)
+        return self._translated("name", lang, self.slug)
 
 
 class GenreTranslation(models.Model):
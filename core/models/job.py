@@ -0,0 +1,42 @@
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    A queued background task, run by ``manage.py run_jobs`` (see
+    ``core.jobs``). Rows are deleted once their task succeeds; a task that
+    keeps failing ends up ``dead`` with its last error for inspection and
+    can be requeued from the admin.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DEAD = "dead"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DEAD, "Dead"),
+    ]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ["run_at"]
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="core_job_status_run_at_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk} ({self.get_status_display()})"
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import models
+
+
+class TranslatableMixin:
+    """
+    Resolves per-language rows from the ``translations`` reverse relation.
+
+    When the caller has already done ``prefetch_related("translations__language")``
+    the lookup is answered from the prefetched rows without touching the
+    database; otherwise it falls back to the original two-query lookup
+    (requested language first, then the first translation available).
+    """
+
+    def _prefetched_translations(self) -> list[models.Model] | None:
+        cache = getattr(self, "_prefetched_objects_cache", None) or {}
+        if "translations" not in cache:
+            return None
+        return sorted(cache["translations"], key=lambda t: t.pk)
+
+    def get_translation(self, lang: str = "uk") -> models.Model | None:
+        rows = self._prefetched_translations()
+        if rows is None:
+            return self.translations.filter(language__code=lang).first()
+        return next((t for t in rows if t.language.code == lang), None)
+
+    def get_fallback_translation(self) -> models.Model | None:
+        rows = self._prefetched_translations()
+        if rows is None:
+            return self.translations.first()
+        return rows[0] if rows else None
+
+    def _translated(self, field: str, lang: str, default: Any, require_value: bool = False) -> Any:
+        translation = self.get_translation(lang)
+        if translation is not None and (getattr(translation, field) or not require_value):
+            return getattr(translation, field)
+        fallback = self.get_fallback_translation()
+        return getattr(fallback, field) if fallback else default
@@ -20,6 +20,8 @@ class Notification(models.Model):
     recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notifications")
     type = models.CharField(max_length=30, choices=TYPE_CHOICES, db_index=True)
     is_read = models.BooleanField(default=False, db_index=True)
+    # Events coalesced into this row, e.g. the number of people who liked a track.
+    count = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
 
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
@@ -31,16 +33,69 @@ class Notification(models.Model):
         verbose_name_plural = "Notifications"
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["recipient", "is_read"]),
+            models.Index(fields=["recipient", "is_read"], name="core_notif_recip_read_idx"),
+            # Serves the per-user feed (newest first) and its cursor pagination.
+            models.Index(fields=["recipient", "-created_at"], name="core_notif_recip_created_idx"),
         ]
 
     def __str__(self) -> str:
         return f"[{self.get_type_display()}] → {self.recipient.username}"
 
+    def mark_read(self) -> bool:
+        """Mark this notification read; False if it already was."""
+        from core import unread
+
+        updated = Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True)
+        self.is_read = True
+        unread.adjust(self.recipient_id, -updated)
+        return bool(updated)
+
     @classmethod
     def mark_all_read(cls, user: User) -> int:
-        return cls.objects.filter(recipient=user, is_read=False).update(is_read=True)
+        from core import unread
+
+        # Decremented rather than zeroed: a notification created meanwhile stays counted.
+        count = cls.objects.filter(recipient=user, is_read=False).update(is_read=True)
+        unread.adjust(user.pk, -count)
+        return count
 
     @classmethod
     def unread_count(cls, user: User) -> int:
-        return cls.objects.filter(recipient=user, is_read=False).count()
+        """From the Redis counter (``core.unread``), seeding it from the table when missing."""
+        from core import unread
+
+        count = unread.get(user.pk)
+        if count is None:
+            count = unread.count_from_db([user.pk])[user.pk]
+            unread.store({user.pk: count})
+        return count
+
+
+class NotificationArchive(models.Model):
+    """
+    Read notifications past ``NOTIFICATION_READ_TTL_DAYS``, moved out of
+    ``Notification`` by ``manage.py archive_notifications`` (see
+    ``core.retention``) so the live table only holds recent history.
+    Rows keep their original primary key.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_notifications")
+    type = models.CharField(max_length=30, choices=Notification.TYPE_CHOICES)
+    count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Archived notification"
+        verbose_name_plural = "Archived notifications"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["recipient", "-created_at"], name="core_notifarch_recip_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"[{self.get_type_display()}] → {self.recipient.username} (archived)"
@@ -0,0 +1,35 @@
+from django.db import models
+
+from .book import Book
+
+
+class BookSearchDocument(models.Model):
+    """
+    Denormalized search text for a book: titles, author names and genre
+    names in every language plus the legacy author/genre columns.
+
+    ``fuzzy`` is the same text transliterated to ASCII and spelling-folded
+    (``core.search.fuzzy_key``) for script- and typo-tolerant matching.
+
+    Rows are maintained by ``core.search.reindex_books`` (wired to signals in
+    ``core.signals``); the database-specific full-text index over
+    ``document`` is created in migration 0020, the trigram index over
+    ``fuzzy`` in 0021.
+    """
+
+    book = models.OneToOneField(
+        Book,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    document = models.TextField(blank=True)
+    fuzzy = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Book search document"
+        verbose_name_plural = "Book search documents"
+
+    def __str__(self) -> str:
+        return f"Search document for book #{self.book_id}"
@@ -1,35 +1,224 @@
+"""
+Email and in-app notifications. Both are delivered by background jobs
+(``core.jobs``), so a slow SMTP server or a failing insert never holds up
+or breaks the request that triggered them; failed deliveries are retried.
+
+Like notifications are coalesced: ``notify_like`` only adds the liker to
+a Redis set for the track, and the first like in a ``LIKE_WINDOW`` schedules
+one ``flush_like_notifications`` job for the end of it. That job folds
+every buffered like into one row per track ("12 people liked your
+track") — bumping the recipient's unread row for the track if there is
+one. Without Redis, or with ``JOBS_EAGER`` (which cannot delay the
+flush), each like gets its own flush job, still merged into the unread
+row. A liker is counted once per track for ``LIKER_SEEN_TTL``, so
+unliking and liking again does not inflate the count.
+"""
+import logging
+
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import F
 from django.template.loader import render_to_string
+from django.utils import timezone
+from redis.exceptions import RedisError
 
+from core import realtime, unread
+from core.jobs import enqueue, task
+from core.utils.redis_client import get_redis
 
-def _send(subject: str, template: str, context: dict, to) -> None:
-    if not to:
-        return
-    body = render_to_string(template, context)
+logger = logging.getLogger(__name__)
+
+LIKE_WINDOW = 60 * 5
+# How long a liker is remembered per track, so unlike/re-like is not counted twice.
+LIKER_SEEN_TTL = 60 * 60 * 24
+
+_PENDING_TRACKS_KEY = "notifications:likes:pending"
+_PENDING_LIKERS_KEY = "notifications:likes:pending:{track_id}"
+_FLUSH_SCHEDULED_KEY = "notifications:likes:flush-scheduled"
+_LIKER_SEEN_KEY = "notifications:likes:seen:{track_id}:{user_id}"
+
+
+@task("send_email")
+def send_email_task(subject: str, body: str, to: list[str]) -> None:
     send_mail(
         subject=subject,
         message=body,
         from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[to] if isinstance(to, str) else to,
-        fail_silently=True,
+        recipient_list=to,
     )
 
 
-def _create_in_app(recipient, notification_type: str, obj=None) -> None:
-    """Create an in-app Notification record; fails silently."""
+@task("create_notification")
+def create_notification_task(
+    recipient_id: int, type: str, content_type_id: int | None = None, object_id: int | None = None
+) -> None:
+    from core.models.notification import Notification
+
+    Notification.objects.create(
+        recipient_id=recipient_id, type=type, content_type_id=content_type_id, object_id=object_id
+    )
+    unread.adjust(recipient_id, 1)
+
+
+@task("seed_unread_count")
+def seed_unread_count_task(user_id: int) -> None:
+    unread.store(unread.count_from_db([user_id]))
+
+
+def _send(subject: str, template: str, context: dict, to) -> None:
+    if not to:
+        return
+    # Rendered now: the context holds model instances, the job payload only JSON.
+    body = render_to_string(template, context)
+    enqueue("send_email", subject=subject, body=body, to=[to] if isinstance(to, str) else list(to))
+
+
+def notify_in_app(recipient_id: int, notification_type: str, obj=None) -> None:
+    """Queue an in-app Notification for *recipient_id*, optionally pointing at *obj*."""
+    enqueue(
+        "create_notification",
+        recipient_id=recipient_id,
+        type=notification_type,
+        content_type_id=ContentType.objects.get_for_model(obj).pk if obj is not None else None,
+        object_id=obj.pk if obj is not None else None,
+    )
+
+
+# ── Coalesced like notifications ─────────────────────────────────────────────
+
+def notify_like(track_id: int, user_id: int) -> None:
+    """Buffer a like of *track_id* by *user_id* for the next coalesced flush."""
+    if not cache.add(_LIKER_SEEN_KEY.format(track_id=track_id, user_id=user_id), 1, LIKER_SEEN_TTL):
+        return  # already counted; a re-like after an unlike is not a new person
+    # Eager jobs run at once, so a buffered like would wait for the next window's first like.
+    conn = None if getattr(settings, "JOBS_EAGER", True) else get_redis()
+    if conn is not None:
+        try:
+            pipe = conn.pipeline(transaction=False)
+            pipe.sadd(_PENDING_LIKERS_KEY.format(track_id=track_id), user_id)
+            pipe.sadd(_PENDING_TRACKS_KEY, track_id)
+            # Outlives the window so a stalled queue cannot schedule a flush per like.
+            pipe.set(_FLUSH_SCHEDULED_KEY, 1, nx=True, ex=LIKE_WINDOW * 2)
+            *_, scheduled = pipe.execute()
+        except RedisError:
+            logger.warning("Like buffer unavailable, queueing the notification directly")
+        else:
+            if scheduled:
+                enqueue("flush_like_notifications", delay=LIKE_WINDOW)
+            return
+    enqueue("flush_like_notifications", likes={str(track_id): [user_id]})
+
+
+@task("flush_like_notifications")
+def flush_like_notifications_task(likes: dict[str, list[int]] | None = None) -> None:
+    if likes is not None:
+        write_like_notifications({int(track_id): set(likers) for track_id, likers in likes.items()})
+        return
+    pending = _drain_pending_likes()
     try:
-        from django.contrib.contenttypes.models import ContentType
-        from core.models.notification import Notification
-
-        kwargs: dict = {"recipient": recipient, "type": notification_type}
-        if obj is not None:
-            kwargs["content_type"] = ContentType.objects.get_for_model(obj)
-            kwargs["object_id"] = obj.pk
-        Notification.objects.create(**kwargs)
+        write_like_notifications(pending)
     except Exception:
-        pass
+        _restore_pending_likes(pending)  # picked up again when the job is retried
+        raise
+
+
+def _drain_pending_likes() -> dict[int, set[int]]:
+    conn = get_redis()
+    if conn is None:
+        return {}
+    # Cleared first: a like buffered from here on schedules the next flush.
+    conn.delete(_FLUSH_SCHEDULED_KEY)
+    pipe = conn.pipeline()
+    pipe.smembers(_PENDING_TRACKS_KEY)
+    pipe.delete(_PENDING_TRACKS_KEY)
+    track_ids = sorted(int(track_id) for track_id in pipe.execute()[0])
+    if not track_ids:
+        return {}
+    pipe = conn.pipeline()
+    for track_id in track_ids:
+        key = _PENDING_LIKERS_KEY.format(track_id=track_id)
+        pipe.smembers(key)
+        pipe.delete(key)
+    results = pipe.execute()
+    return {
+        track_id: {int(user_id) for user_id in likers}
+        for track_id, likers in zip(track_ids, results[::2])
+        if likers
+    }
+
+
+def _restore_pending_likes(pending: dict[int, set[int]]) -> None:
+    conn = get_redis()
+    if conn is None or not pending:
+        return
+    try:
+        pipe = conn.pipeline(transaction=False)
+        for track_id, likers in pending.items():
+            pipe.sadd(_PENDING_LIKERS_KEY.format(track_id=track_id), *likers)
+            pipe.sadd(_PENDING_TRACKS_KEY, track_id)
+        pipe.execute()
+    except RedisError:
+        logger.error("Could not restore %s buffered like(s); their notifications are lost", len(pending))
+
+
+def write_like_notifications(likes: dict[int, set[int]]) -> None:
+    """Add the likers of each track to its owner's unread like notification, creating it if needed."""
+    from core.models import MusicRecommendation
+    from core.models.notification import Notification
+
+    owners = dict(MusicRecommendation.objects.filter(pk__in=likes).values_list("pk", "user_id"))
+    counts = {
+        track_id: len(likers - {owners[track_id]})
+        for track_id, likers in likes.items()
+        if track_id in owners
+    }
+    counts = {track_id: count for track_id, count in counts.items() if count}
+    if not counts:
+        return
+
+    content_type = ContentType.objects.get_for_model(MusicRecommendation)
+    now = timezone.now()
+    with transaction.atomic():
+        # Locking the tracks serializes concurrent flushes for them, so two
+        # cannot both miss the unread row and each create one.
+        list(MusicRecommendation.objects.select_for_update().filter(pk__in=counts).values_list("pk"))
+        unread_rows = {
+            n.object_id: n
+            for n in Notification.objects.filter(
+                type=Notification.TYPE_LIKE_MUSIC,
+                is_read=False,
+                content_type=content_type,
+                object_id__in=counts,
+            ).order_by("created_at")
+        }
+        updated, created = [], []
+        for track_id, count in counts.items():
+            notification = unread_rows.get(track_id)
+            if notification is not None and notification.recipient_id == owners[track_id]:
+                Notification.objects.filter(pk=notification.pk).update(count=F("count") + count, created_at=now)
+                notification.count += count
+                notification.created_at = now
+                updated.append(notification)
+            else:
+                created.append(Notification(
+                    recipient_id=owners[track_id],
+                    type=Notification.TYPE_LIKE_MUSIC,
+                    content_type=content_type,
+                    object_id=track_id,
+                    count=count,
+                ))
+        Notification.objects.bulk_create(created)
+    for notification in created:
+        unread.adjust(notification.recipient_id, 1)
+    # bulk_create skips post_save, so these are published here rather than by core.signals.
+    written = updated + created
+    transaction.on_commit(lambda: [realtime.publish_notification(n) for n in written])
+
 
+# ── Verification ─────────────────────────────────────────────────────────────
 
 def notify_admin_new_verification(verification) -> None:
     if not settings.ADMIN_EMAIL:
@@ -49,7 +238,7 @@ def notify_author_approved(verification) -> None:
         context={"verification": verification, "site_url": settings.SITE_URL},
         to=verification.user.email,
     )
-    _create_in_app(verification.user, "verification_approved", verification)
+    notify_in_app(verification.user_id, "verification_approved", verification)
 
 
 def notify_author_rejected(verification) -> None:
@@ -59,4 +248,4 @@ def notify_author_rejected(verification) -> None:
         context={"verification": verification, "site_url": settings.SITE_URL},
         to=verification.user.email,
     )
-    _create_in_app(verification.user, "verification_rejected", verification)
+    notify_in_app(verification.user_id, "verification_rejected", verification)
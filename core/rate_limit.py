@@ -1,5 +1,6 @@
 from functools import wraps
 
+from asgiref.sync import iscoroutinefunction
 from django.http import JsonResponse
 from django.shortcuts import render
 from django_ratelimit.decorators import ratelimit
@@ -14,6 +15,20 @@ def _handle_ratelimited(request, is_ajax: bool):
 
 def rate_limit(key: str, rate: str, method: str = 'POST', block: bool = True):
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            # Async views answer JSON only: rendering 429.html may touch the
+            # database, and 'user' keys would load the session, both of which
+            # are sync-only. The counter itself is a cache round trip.
+            @wraps(view_func)
+            async def async_wrapped(request, *args, **kwargs):
+                decorated = ratelimit(key=key, rate=rate, method=method, block=block)(view_func)
+                try:
+                    return await decorated(request, *args, **kwargs)
+                except Ratelimited:
+                    return _handle_ratelimited(request, True)
+
+            return async_wrapped
+
         @wraps(view_func)
         def wrapped(request, *args, **kwargs):
             is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
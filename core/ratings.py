@@ -0,0 +1,58 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from core.models import Book, BookRating
+from core.versions import bump
+
+
+def set_book_rating(user, book: Book, score: int) -> Book:
+    """
+    Create or change *user*'s rating of *book* and adjust the denormalized
+    ``rating_sum`` / ``rating_count`` columns in the same transaction.
+
+    The book row is locked first so concurrent ratings of the same book
+    apply their deltas one after another.
+    """
+    with transaction.atomic():
+        Book.objects.select_for_update().only("pk").get(pk=book.pk)
+        previous = (
+            BookRating.objects.filter(user=user, book=book)
+            .values_list("score", flat=True)
+            .first()
+        )
+
+        if previous is None:
+            BookRating.objects.create(user=user, book=book, score=score)
+            Book.objects.filter(pk=book.pk).update(
+                rating_sum=F("rating_sum") + score,
+                rating_count=F("rating_count") + 1,
+            )
+        elif previous != score:
+            BookRating.objects.filter(user=user, book=book).update(score=score)
+            Book.objects.filter(pk=book.pk).update(rating_sum=F("rating_sum") + (score - previous))
+
+        # Totals change through update(), which sends no signals.
+        transaction.on_commit(lambda: bump(f"book:{book.pk}", "catalog"))
+
+    book.refresh_from_db(fields=["rating_sum", "rating_count"])
+    return book
+
+
+def remove_book_rating(book_id: int, score: int) -> None:
+    """Take a deleted rating out of its book's totals (called from the ``post_delete`` signal)."""
+    Book.objects.filter(pk=book_id).update(
+        rating_sum=F("rating_sum") - score,
+        rating_count=F("rating_count") - 1,
+    )
+    transaction.on_commit(lambda: bump(f"book:{book_id}", "catalog"))
+
+
+def rebuild_rating_totals(queryset: QuerySet | None = None) -> int:
+    """Recompute ``rating_sum`` / ``rating_count`` from ``BookRating`` rows."""
+    ratings = BookRating.objects.filter(book=OuterRef("pk")).order_by().values("book")
+    qs = queryset if queryset is not None else Book.objects.all()
+    return qs.update(
+        rating_sum=Coalesce(Subquery(ratings.annotate(total=Sum("score")).values("total")), 0),
+        rating_count=Coalesce(Subquery(ratings.annotate(total=Count("pk")).values("total")), 0),
+    )
@@ -0,0 +1,160 @@
+"""
+Real-time events over Redis pub/sub, streamed to browsers by the SSE view
+``core.views.realtime.event_stream`` (``/events/``).
+
+Publishing is synchronous and happens after commit, from the signal
+handlers in ``core.signals`` and the batched writers in
+``core.notifications``:
+
+* ``realtime:user:<id>``    — ``notification`` events for a user's new or
+  updated (coalesced) notifications;
+* ``realtime:chapter:<id>`` — ``likes`` events with the delta and the new
+  ``likes_count`` of a track on that chapter.
+
+Subscribing is async: each event loop keeps one Redis connection
+(``_Hub``) that is subscribed to the union of the channels its open
+streams need and fans messages out to their queues, so open streams
+cost a queue each, not a Redis connection each.
+
+Everything is off unless ``REALTIME_EVENTS`` is set, which needs the
+ASGI server: under WSGI a stream would hold a worker for as long as the
+page is open. While off — and without Redis — nothing is published and
+the stream answers 204, which tells ``EventSource`` not to reconnect.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import weakref
+
+from django.conf import settings
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from core.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+_USER_CHANNEL = "realtime:user:{user_id}"
+_CHAPTER_CHANNEL = "realtime:chapter:{chapter_id}"
+# Events buffered per stream; a client that falls further behind loses the newest ones.
+_QUEUE_SIZE = 100
+_READ_TIMEOUT = 1.0
+
+
+def user_channel(user_id: int) -> str:
+    return _USER_CHANNEL.format(user_id=user_id)
+
+
+def chapter_channel(chapter_id: int) -> str:
+    return _CHAPTER_CHANNEL.format(chapter_id=chapter_id)
+
+
+def enabled() -> bool:
+    return getattr(settings, "REALTIME_EVENTS", False)
+
+
+def publish(channel: str, event: str, **data) -> None:
+    conn = get_redis() if enabled() else None
+    if conn is None:
+        return
+    try:
+        conn.publish(channel, json.dumps({"event": event, **data}, default=str))
+    except RedisError:
+        logger.warning("Could not publish %s to %s", event, channel)
+
+
+def publish_notification(notification) -> None:
+    publish(
+        user_channel(notification.recipient_id),
+        "notification",
+        id=notification.pk,
+        type=notification.type,
+        type_display=notification.get_type_display(),
+        count=notification.count,
+        object_id=notification.object_id,
+        created_at=notification.created_at.isoformat(),
+    )
+
+
+def publish_like(track_id: int, delta: int) -> None:
+    """Publish a like delta for *track_id* with its current count (including write-behind deltas)."""
+    if not enabled():
+        return
+    from core.counters import music_likes
+    from core.models import MusicRecommendation
+
+    row = MusicRecommendation.objects.filter(pk=track_id).values_list("chapter_id", "likes_count").first()
+    if row is None:
+        return
+    chapter_id, likes_count = row
+    if getattr(settings, "LIKES_WRITE_BEHIND", False):
+        likes_count += music_likes.pending(track_id)
+    publish(chapter_channel(chapter_id), "likes", track=track_id, delta=delta, likes_count=likes_count)
+
+
+class _Hub:
+    """One pub/sub connection per event loop, fanned out to per-stream queues."""
+
+    def __init__(self, url: str) -> None:
+        self._pubsub = aioredis.from_url(url).pubsub(ignore_subscribe_messages=True)
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        self._reader: asyncio.Task | None = None
+
+    async def subscribe(self, channels: list[str]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        new = [channel for channel in channels if channel not in self._queues]
+        for channel in channels:
+            self._queues.setdefault(channel, set()).add(queue)
+        if new:
+            await self._pubsub.subscribe(*new)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+        return queue
+
+    async def unsubscribe(self, channels: list[str], queue: asyncio.Queue) -> None:
+        gone = []
+        for channel in channels:
+            queues = self._queues.get(channel, set())
+            queues.discard(queue)
+            if not queues:
+                self._queues.pop(channel, None)
+                gone.append(channel)
+        if gone:
+            try:
+                await self._pubsub.unsubscribe(*gone)
+            except RedisError:
+                logger.warning("Could not unsubscribe from %s channel(s)", len(gone))
+
+    async def _read(self) -> None:
+        # Runs while any stream is open; the next subscribe() starts it again.
+        while self._queues:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=_READ_TIMEOUT)
+            except (RedisError, OSError):
+                logger.warning("Realtime pub/sub connection lost, reconnecting", exc_info=True)
+                await asyncio.sleep(_READ_TIMEOUT)  # the next read reconnects and resubscribes
+                continue
+            if message is None or message.get("type") != "message":
+                continue
+            channel = message["channel"].decode()
+            for queue in self._queues.get(channel, ()):
+                try:
+                    queue.put_nowait(message["data"].decode())
+                except asyncio.QueueFull:
+                    logger.debug("Dropping an event for a slow stream on %s", channel)
+
+
+_hubs: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Hub] = weakref.WeakKeyDictionary()
+
+
+def hub() -> _Hub | None:
+    """This event loop's hub, or None when the default cache is not Redis."""
+    cache = settings.CACHES["default"]
+    if not cache["BACKEND"].startswith("django_redis."):
+        return None
+    loop = asyncio.get_running_loop()
+    if loop not in _hubs:
+        _hubs[loop] = _Hub(cache["LOCATION"])
+    return _hubs[loop]
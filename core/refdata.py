@@ -0,0 +1,190 @@
+"""
+Reference data — languages, genre names and author names — behind a
+two-tier cache, so the lookups a request makes over and over (the ``uk``
+language when seeding translations, ``{{ book.author }}`` in templates)
+are dictionary reads.
+
+Tier one is a small per-process LRU with a short TTL; tier two is the
+default (Redis) cache; the database is only read on a miss in both.
+Changes are invalidated from ``core.signals``: the shared entry is
+deleted and the key is published on ``refdata:invalidate``, which every
+process subscribes to from a background thread to drop its local copy.
+Without Redis (or while the subscription is down) the local TTL bounds
+how long another process can serve a stale value.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from django.core.cache import cache
+from redis.exceptions import RedisError
+
+from core.models import Author, AuthorTranslation, Genre, GenreTranslation, Language
+from core.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL = "refdata:invalidate"
+_LOCAL_TTL = 60
+_LOCAL_MAXSIZE = 2048
+_SHARED_TTL = 60 * 60
+_RESUBSCRIBE_DELAY = 5
+
+_MISSING = object()
+
+
+class LocalLRU:
+    """Thread-safe LRU of at most *maxsize* entries, each expiring after *ttl* seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_local = LocalLRU(_LOCAL_MAXSIZE, _LOCAL_TTL)
+_listener_pid: int | None = None
+_listener_lock = threading.Lock()
+
+
+def _listen() -> None:
+    while True:
+        conn = get_redis()
+        if conn is None:
+            return
+        try:
+            pubsub = conn.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(_CHANNEL)
+            # Anything published while we were not subscribed is lost.
+            _local.clear()
+            for message in pubsub.listen():
+                data = message["data"]
+                _local.delete(data.decode() if isinstance(data, bytes) else data)
+        except RedisError:
+            logger.warning("Reference data invalidation channel lost, resubscribing")
+            _local.clear()
+            time.sleep(_RESUBSCRIBE_DELAY)
+
+
+def _ensure_listener() -> None:
+    """Start the invalidation subscriber once per process (again after a fork)."""
+    global _listener_pid
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+    with _listener_lock:
+        if _listener_pid == pid:
+            return
+        _listener_pid = pid
+        if get_redis() is not None:
+            threading.Thread(target=_listen, name="refdata-invalidation", daemon=True).start()
+
+
+def _cached(key: str, loader: Callable[[], Any]) -> Any:
+    _ensure_listener()
+    value = _local.get(key, _MISSING)
+    if value is _MISSING:
+        value = cache.get(f"refdata:{key}", _MISSING)
+        if value is _MISSING:
+            value = loader()
+            cache.set(f"refdata:{key}", value, _SHARED_TTL)
+        _local.set(key, value)
+    return value
+
+
+def invalidate(*keys: str) -> None:
+    """Drop *keys* from the shared cache and from every process's local tier."""
+    cache.delete_many([f"refdata:{key}" for key in keys])
+    for key in keys:
+        _local.delete(key)
+    conn = get_redis()
+    if conn is None:
+        return
+    try:
+        pipe = conn.pipeline(transaction=False)
+        for key in keys:
+            pipe.publish(_CHANNEL, key)
+        pipe.execute()
+    except RedisError:
+        logger.warning("Could not publish reference data invalidation for %s", keys)
+
+
+# ── Accessors ────────────────────────────────────────────────────────────────
+
+def language_key(code: str) -> str:
+    return f"language:{code}"
+
+
+def genre_key(genre_id: int) -> str:
+    return f"genre:{genre_id}"
+
+
+def author_key(author_id: int) -> str:
+    return f"author:{author_id}"
+
+
+def get_language(code: str) -> Language | None:
+    return _cached(language_key(code), lambda: Language.objects.filter(code=code).first())
+
+
+def _names(model, translations, field: str, pk: int) -> dict | None:
+    slug = model.objects.filter(pk=pk).values_list("slug", flat=True).first()
+    if slug is None:
+        return None
+    rows = translations.objects.filter(**{field: pk}).order_by("pk").values_list("language__code", "name")
+    return {"slug": slug, "names": list(rows)}
+
+
+def _pick(entry: dict | None, lang: str) -> str:
+    """Same resolution as ``TranslatableMixin._translated``: *lang*, then the first translation, then the slug."""
+    if entry is None:
+        return ""
+    names = entry["names"]
+    for code, name in names:
+        if code == lang:
+            return name
+    return names[0][1] if names else entry["slug"]
+
+
+def genre_name(genre_id: int, lang: str = "uk") -> str:
+    entry = _cached(genre_key(genre_id), lambda: _names(Genre, GenreTranslation, "genre_id", genre_id))
+    return _pick(entry, lang)
+
+
+def author_name(author_id: int, lang: str = "uk") -> str:
+    entry = _cached(author_key(author_id), lambda: _names(Author, AuthorTranslation, "author_id", author_id))
+    return _pick(entry, lang)
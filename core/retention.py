@@ -0,0 +1,51 @@
+"""
+Notification retention: read notifications older than
+``NOTIFICATION_READ_TTL_DAYS`` are moved to ``NotificationArchive`` by
+``manage.py archive_notifications`` (run periodically), keeping the live
+``Notification`` table — and the per-user feed index on
+``(recipient, -created_at)`` — bounded by recent history.
+
+Rows move in batches, each copied and deleted in one transaction, walking
+the primary key so a batch never rescans rows an earlier one handled.
+Unread notifications are never archived, so the unread counters in
+``core.unread`` are unaffected; age is measured from ``created_at``.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Notification, NotificationArchive
+
+_ARCHIVED_FIELDS = ("id", "recipient_id", "type", "count", "created_at", "content_type_id", "object_id")
+
+
+def cutoff(ttl_days: int | None = None):
+    """Read notifications created before this are due for archiving."""
+    if ttl_days is None:
+        ttl_days = settings.NOTIFICATION_READ_TTL_DAYS
+    return timezone.now() - timedelta(days=ttl_days)
+
+
+def expired(ttl_days: int | None = None):
+    return Notification.objects.filter(is_read=True, created_at__lt=cutoff(ttl_days))
+
+
+def archive_read(ttl_days: int | None = None, batch_size: int = 1000) -> int:
+    """Move expired read notifications to the archive; returns how many were moved."""
+    rows = expired(ttl_days).order_by("pk").values(*_ARCHIVED_FIELDS)
+    moved = last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(rows.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return moved
+            NotificationArchive.objects.bulk_create(
+                [NotificationArchive(**row) for row in batch], ignore_conflicts=True
+            )
+            Notification.objects.filter(pk__in=[row["id"] for row in batch]).delete()
+        moved += len(batch)
+        last_pk = batch[-1]["id"]
@@ -0,0 +1,202 @@
+"""
+Catalog search over ``BookSearchDocument``.
+
+``search_books`` is the single query API used by the home page and
+``/api/v1/books/?search=``. It filters a Book queryset to matching books
+and annotates a ``search_rank`` (higher is more relevant):
+
+* PostgreSQL — ``to_tsvector('simple', document)`` with prefix terms,
+  ranked by ``ts_rank`` and backed by a GIN expression index;
+* SQLite     — an FTS5 table kept in sync by triggers, ranked by ``bm25``;
+* anything else — ``icontains`` over the single denormalized column.
+
+On PostgreSQL and SQLite the query is also matched against ``fuzzy`` — the
+document transliterated to ASCII — through a trigram index, so "knyha"
+finds "Книга", "Толкін" finds "Tolkien" and small typos still match.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+from django.db import connection
+from django.db.models import Case, FloatField, Q, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from core.models import Book, BookSearchDocument
+from core.utils.slugs import transliterate
+
+FTS_TABLE = "core_booksearch_fts"
+TRGM_TABLE = "core_booksearch_trgm"
+
+_MAX_TERMS = 8
+_MAX_FUZZY_CANDIDATES = 200
+_MIN_SIMILARITY = 0.5
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+# Letters the common Ukrainian romanizations disagree on (и → y/i, г → h/g, й → j/i).
+_FUZZY_FOLD = str.maketrans({"y": "i", "j": "i", "h": "g", "w": "v"})
+
+
+# ── Indexing ─────────────────────────────────────────────────────────────────
+
+def fuzzy_key(text: str) -> str:
+    """Transliterated, spelling-folded form of *text*: "Книга" and "knyha" both become "kniga"."""
+    return transliterate(text).translate(_FUZZY_FOLD)
+
+
+def build_document(book: Book) -> str:
+    parts: list[str] = [t.title for t in book.translations.all()]
+    if book.author_id:
+        parts += [t.name for t in book.author.translations.all()]
+    if book.genre_id:
+        parts += [t.name for t in book.genre.translations.all()]
+    parts += [book.author_legacy, book.genre_legacy]
+    return "\n".join(dict.fromkeys(p.strip() for p in parts if p and p.strip()))
+
+
+def reindex_books(book_ids: Iterable[int] | None = None) -> int:
+    """Rebuild search documents for *book_ids* (or every book) and return the count."""
+    qs = Book.objects.select_related("author", "genre").prefetch_related(
+        "translations", "author__translations", "genre__translations"
+    )
+    if book_ids is not None:
+        qs = qs.filter(pk__in=list(book_ids))
+
+    documents = []
+    for book in qs:
+        document = build_document(book)
+        documents.append(BookSearchDocument(book=book, document=document, fuzzy=fuzzy_key(document)))
+    BookSearchDocument.objects.bulk_create(
+        documents,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["book"],
+        update_fields=["document", "fuzzy", "updated_at"],
+    )
+    return len(documents)
+
+
+# ── Querying ─────────────────────────────────────────────────────────────────
+
+def _terms(query: str) -> list[str]:
+    return _TERM_RE.findall(query.lower())[:_MAX_TERMS]
+
+
+def _fuzzy_terms(terms: list[str]) -> list[str]:
+    return fuzzy_key(" ".join(terms)).split()
+
+
+def _trigrams(word: str) -> set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def _padded_trigrams(word: str) -> set[str]:
+    # Padded like pg_trgm so word boundaries count and short words still get trigrams.
+    return _trigrams(f"  {word} ")
+
+
+def _word_similarity(fuzzy_terms: list[str], text: str) -> float:
+    """
+    Mean, over query terms, of the share of a term's trigrams found in the
+    closest word of *text* — roughly pg_trgm's ``word_similarity``.
+    """
+    words = [_padded_trigrams(word) for word in set(text.split())]
+    if not words:
+        return 0.0
+    total = 0.0
+    for term in fuzzy_terms:
+        wanted = _padded_trigrams(term)
+        total += max(len(wanted & have) for have in words) / len(wanted)
+    return total / len(fuzzy_terms)
+
+
+def _no_results(queryset: QuerySet) -> QuerySet:
+    return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def _search_postgres(queryset: QuerySet, terms: list[str]) -> QuerySet:
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+
+    vector = SearchVector("search_document__document", config="simple")
+    tsquery = SearchQuery(" & ".join(f"{term}:*" for term in terms), config="simple", search_type="raw")
+    condition = Q(search_vector=tsquery)
+    rank = SearchRank(vector, tsquery)
+
+    fuzzy_terms = _fuzzy_terms(terms)
+    if fuzzy_terms:
+        fuzzy_query = " ".join(fuzzy_terms)
+        # ``%>`` is answered from the pg_trgm GIN index on ``fuzzy``.
+        condition |= Q(search_document__fuzzy__trigram_word_similar=fuzzy_query)
+        rank = rank + TrigramWordSimilarity(fuzzy_query, "search_document__fuzzy")
+
+    return queryset.annotate(search_vector=vector).filter(condition).annotate(search_rank=rank)
+
+
+def _sqlite_fetch(sql: str, params: list) -> list[tuple]:
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _search_sqlite(queryset: QuerySet, terms: list[str]) -> QuerySet:
+    match = " ".join(f'"{term}"*' for term in terms)
+    # The FTS match stays inside the queryset so visibility filters, ordering
+    # and pagination see every hit, not a pre-truncated slice of them.
+    condition = Q(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+    # bm25() is lower-is-better; negate so every backend sorts by -search_rank.
+    rank = Coalesce(
+        RawSQL(
+            f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{Book._meta.db_table}"."id"',
+            [match],
+            output_field=FloatField(),
+        ),
+        Value(0.0),
+    )
+
+    fuzzy_terms = _fuzzy_terms(terms)
+    trigrams = sorted(set().union(*(_trigrams(term) for term in fuzzy_terms)))
+    if trigrams:
+        # Rows sharing any query trigram, best first; only these candidates are scored.
+        candidates = _sqlite_fetch(
+            f"SELECT rowid, fuzzy FROM {TRGM_TABLE} "
+            f"WHERE {TRGM_TABLE} MATCH %s ORDER BY rank LIMIT %s",
+            [" OR ".join(f'"{trigram}"' for trigram in trigrams), _MAX_FUZZY_CANDIDATES],
+        )
+        similar = {}
+        for pk, text in candidates:
+            similarity = _word_similarity(fuzzy_terms, text)
+            if similarity >= _MIN_SIMILARITY:
+                similar[pk] = similarity
+        if similar:
+            condition |= Q(pk__in=list(similar))
+            rank = rank + Case(
+                *[When(pk=pk, then=Value(score)) for pk, score in similar.items()],
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+
+    return queryset.filter(condition).annotate(search_rank=rank)
+
+
+def _search_fallback(queryset: QuerySet, terms: list[str]) -> QuerySet:
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(search_document__document__icontains=term)
+            | Q(search_document__fuzzy__icontains=fuzzy_key(term))
+        )
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def search_books(queryset: QuerySet, query: str) -> QuerySet:
+    """Filter *queryset* to books matching *query*, annotated with ``search_rank``."""
+    terms = _terms(query)
+    if not terms:
+        return _no_results(queryset)
+    if connection.vendor == "postgresql":
+        return _search_postgres(queryset, terms)
+    if connection.vendor == "sqlite":
+        return _search_sqlite(queryset, terms)
+    return _search_fallback(queryset, terms)
@@ -1,32 +1,37 @@
 """
-Django signal handlers for the Notification system.
+Django signal handlers for notifications, book rating totals, the catalog
+search index, the autocomplete index, the genre facet cache, the music
+leaderboards, the cache versions behind cached pages (``core.versions``),
+the reference data cache (``core.refdata``) and real-time events
+(``core.realtime``).
 
 Registered in CoreConfig.ready() — do not import directly elsewhere.
 """
-from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models.interaction import Like, Comment
+from .models.author import Author, AuthorTranslation
+from .models.book import Book, BookTranslation, Chapter, ChapterTranslation
+from .models.genre import Genre, GenreTranslation
+from .models.interaction import BookRating, Like, Comment
+from .models.language import Language
+from .models.music import MusicRecommendation, Playlist, PlaylistTrack
 from .models.notification import Notification
 
+_SEARCH_FIELDS = {"author", "genre", "author_legacy", "genre_legacy"}
+_SUGGEST_FIELDS = {"is_approved", "slug"}
+_FACET_FIELDS = {"is_approved", "genre", "genre_legacy"}
+
 
 @receiver(post_save, sender=Like)
 def notify_on_like(sender, instance: Like, created: bool, **kwargs) -> None:
-    if not created:
-        return
+    # Coalesced and written later by core.notifications; nothing is queried here.
+    if created and instance.music_recommendation_id:
+        from .notifications import notify_like
 
-    if instance.music_recommendation_id:
-        target = instance.music_recommendation
-        recipient = target.user
-        if recipient == instance.user:
-            return
-        Notification.objects.create(
-            recipient=recipient,
-            type=Notification.TYPE_LIKE_MUSIC,
-            content_type=ContentType.objects.get_for_model(target),
-            object_id=target.pk,
-        )
+        track_id, user_id = instance.music_recommendation_id, instance.user_id
+        transaction.on_commit(lambda: notify_like(track_id, user_id))
 
 
 @receiver(post_save, sender=Comment)
@@ -34,13 +39,357 @@ def notify_on_reply(sender, instance: Comment, created: bool, **kwargs) -> None:
     if not created or instance.parent_id is None:
         return
 
-    recipient = instance.parent.user
-    if recipient == instance.user:
+    from .notifications import notify_in_app
+
+    recipient_id = instance.parent.user_id
+    if recipient_id == instance.user_id:
         return
+    notify_in_app(recipient_id, Notification.TYPE_COMMENT_REPLY, instance)
+
+
+# ── Book ratings ─────────────────────────────────────────────────────────────
+
+@receiver(post_delete, sender=BookRating)
+def rating_totals_on_delete(sender, instance: BookRating, **kwargs) -> None:
+    # Ratings are created and changed through core.ratings.set_book_rating; deletes
+    # (including the cascade from a deleted user) only arrive here.
+    from .ratings import remove_book_rating
+
+    remove_book_rating(instance.book_id, instance.score)
+
+
+# ── Search index ─────────────────────────────────────────────────────────────
+
+def _reindex_on_commit(book_ids) -> None:
+    from .search import reindex_books
+
+    ids = list(book_ids)
+    if ids:
+        transaction.on_commit(lambda: reindex_books(ids))
+
+
+@receiver(post_save, sender=Book)
+def reindex_on_book_save(sender, instance: Book, created: bool, update_fields=None, **kwargs) -> None:
+    if update_fields is not None and not _SEARCH_FIELDS & set(update_fields):
+        return
+    _reindex_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=BookTranslation)
+@receiver(post_delete, sender=BookTranslation)
+def reindex_on_book_translation(sender, instance: BookTranslation, **kwargs) -> None:
+    _reindex_on_commit([instance.book_id])
+
+
+@receiver(post_save, sender=AuthorTranslation)
+@receiver(post_delete, sender=AuthorTranslation)
+def reindex_on_author_translation(sender, instance: AuthorTranslation, **kwargs) -> None:
+    _reindex_on_commit(Book.objects.filter(author_id=instance.author_id).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=GenreTranslation)
+@receiver(post_delete, sender=GenreTranslation)
+def reindex_on_genre_translation(sender, instance: GenreTranslation, **kwargs) -> None:
+    _reindex_on_commit(Book.objects.filter(genre_id=instance.genre_id).values_list("pk", flat=True))
+
+
+# ── Autocomplete index ───────────────────────────────────────────────────────
+
+def _suggest_on_commit(kind: str, pk: int) -> None:
+    from . import suggest
+
+    index = {"book": suggest.index_books, "author": suggest.index_authors, "genre": suggest.index_genres}[kind]
+    transaction.on_commit(lambda: index([pk]))
+
+
+@receiver(post_save, sender=Book)
+def suggest_on_book_save(sender, instance: Book, update_fields=None, **kwargs) -> None:
+    if update_fields is not None and not _SUGGEST_FIELDS & set(update_fields):
+        return
+    _suggest_on_commit("book", instance.pk)
+
+
+@receiver(post_delete, sender=Book)
+def suggest_on_book_delete(sender, instance: Book, **kwargs) -> None:
+    _suggest_on_commit("book", instance.pk)
+
+
+@receiver(post_save, sender=BookTranslation)
+@receiver(post_delete, sender=BookTranslation)
+def suggest_on_book_translation(sender, instance: BookTranslation, **kwargs) -> None:
+    _suggest_on_commit("book", instance.book_id)
+
+
+@receiver(post_save, sender=AuthorTranslation)
+@receiver(post_delete, sender=AuthorTranslation)
+def suggest_on_author_translation(sender, instance: AuthorTranslation, **kwargs) -> None:
+    _suggest_on_commit("author", instance.author_id)
+
+
+@receiver(post_save, sender=GenreTranslation)
+@receiver(post_delete, sender=GenreTranslation)
+def suggest_on_genre_translation(sender, instance: GenreTranslation, **kwargs) -> None:
+    _suggest_on_commit("genre", instance.genre_id)
+
+
+# ── Genre facets ─────────────────────────────────────────────────────────────
+
+def _invalidate_facets_on_commit() -> None:
+    from .facets import invalidate_genre_facets
+
+    transaction.on_commit(invalidate_genre_facets)
+
+
+@receiver(post_save, sender=Book)
+def invalidate_facets_on_book_save(sender, instance: Book, update_fields=None, **kwargs) -> None:
+    if update_fields is not None and not _FACET_FIELDS & set(update_fields):
+        return
+    _invalidate_facets_on_commit()
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=GenreTranslation)
+@receiver(post_delete, sender=GenreTranslation)
+def invalidate_facets(sender, **kwargs) -> None:
+    _invalidate_facets_on_commit()
+
+
+# ── Music leaderboards ───────────────────────────────────────────────────────
+
+@receiver(post_save, sender=Like)
+def leaderboard_on_like(sender, instance: Like, created: bool, **kwargs) -> None:
+    if created and instance.music_recommendation_id:
+        from .leaderboard import record_like
+
+        track_id, liked_at = instance.music_recommendation_id, instance.created_at
+        transaction.on_commit(lambda: record_like(track_id, liked_at, 1))
+
+
+@receiver(post_delete, sender=Like)
+def leaderboard_on_unlike(sender, instance: Like, **kwargs) -> None:
+    if instance.music_recommendation_id:
+        from .leaderboard import record_like
+
+        track_id, liked_at = instance.music_recommendation_id, instance.created_at
+        transaction.on_commit(lambda: record_like(track_id, liked_at, -1))
+
+
+@receiver(post_save, sender=MusicRecommendation)
+def leaderboard_on_track_save(sender, instance: MusicRecommendation, update_fields=None, **kwargs) -> None:
+    if update_fields is not None and "mood" not in update_fields:
+        return
+    from .leaderboard import sync_tracks
+
+    transaction.on_commit(lambda: sync_tracks([instance.pk]))
+
+
+@receiver(post_delete, sender=MusicRecommendation)
+def leaderboard_on_track_delete(sender, instance: MusicRecommendation, **kwargs) -> None:
+    from .leaderboard import sync_tracks
+
+    track_id = instance.pk
+    transaction.on_commit(lambda: sync_tracks([track_id]))
+
+
+# ── Cache versions ───────────────────────────────────────────────────────────
+
+def _bump_on_commit(*refs: str) -> None:
+    from .versions import bump
+
+    transaction.on_commit(lambda: bump(*refs))
+
+
+def _chapter_refs(chapter_id: int) -> list[str]:
+    book_id = Chapter.objects.filter(pk=chapter_id).values_list("book_id", flat=True).first()
+    return [f"chapter:{chapter_id}"] + ([f"book:{book_id}"] if book_id else [])
+
+
+def _playlist_refs(playlist: Playlist) -> list[str]:
+    refs = [f"playlist:{playlist.pk}", f"book:{playlist.book_id}"]
+    if playlist.chapter_id:
+        refs.append(f"chapter:{playlist.chapter_id}")
+    return refs
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def bump_on_book(sender, instance: Book, **kwargs) -> None:
+    refs = ["catalog", f"book:{instance.pk}"]
+    if instance.author_id:
+        refs.append(f"author:{instance.author_id}")  # the author's book count
+    _bump_on_commit(*refs)
+
+
+@receiver(post_save, sender=BookTranslation)
+@receiver(post_delete, sender=BookTranslation)
+def bump_on_book_translation(sender, instance: BookTranslation, **kwargs) -> None:
+    _bump_on_commit("catalog", f"book:{instance.book_id}")
+
+
+@receiver(post_save, sender=Chapter)
+@receiver(post_delete, sender=Chapter)
+def bump_on_chapter(sender, instance: Chapter, **kwargs) -> None:
+    _bump_on_commit("catalog", f"chapter:{instance.pk}", f"book:{instance.book_id}")
+
+
+@receiver(post_save, sender=ChapterTranslation)
+@receiver(post_delete, sender=ChapterTranslation)
+def bump_on_chapter_translation(sender, instance: ChapterTranslation, **kwargs) -> None:
+    _bump_on_commit(*_chapter_refs(instance.chapter_id))
+
+
+@receiver(post_save, sender=MusicRecommendation)
+@receiver(post_delete, sender=MusicRecommendation)
+def bump_on_track(sender, instance: MusicRecommendation, **kwargs) -> None:
+    _bump_on_commit("music", *_chapter_refs(instance.chapter_id))
+
+
+@receiver(post_save, sender=Playlist)
+@receiver(post_delete, sender=Playlist)
+def bump_on_playlist(sender, instance: Playlist, **kwargs) -> None:
+    _bump_on_commit(*_playlist_refs(instance))
+
+
+@receiver(post_save, sender=PlaylistTrack)
+@receiver(post_delete, sender=PlaylistTrack)
+def bump_on_playlist_track(sender, instance: PlaylistTrack, **kwargs) -> None:
+    # The book's API detail embeds its playlists' tracks.
+    book_id = Playlist.objects.filter(pk=instance.playlist_id).values_list("book_id", flat=True).first()
+    _bump_on_commit(f"playlist:{instance.playlist_id}", *([f"book:{book_id}"] if book_id else []))
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def bump_on_author(sender, instance: Author, **kwargs) -> None:
+    _bump_on_commit(f"author:{instance.pk}")
+
+
+@receiver(post_save, sender=AuthorTranslation)
+@receiver(post_delete, sender=AuthorTranslation)
+def bump_on_author_translation(sender, instance: AuthorTranslation, **kwargs) -> None:
+    _bump_on_commit(f"author:{instance.author_id}")
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def bump_on_genre(sender, instance: Genre, **kwargs) -> None:
+    _bump_on_commit(f"genre:{instance.pk}")
+
+
+@receiver(post_save, sender=GenreTranslation)
+@receiver(post_delete, sender=GenreTranslation)
+def bump_on_genre_translation(sender, instance: GenreTranslation, **kwargs) -> None:
+    _bump_on_commit(f"genre:{instance.genre_id}")
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_on_comment(sender, instance: Comment, **kwargs) -> None:
+    refs = []
+    if instance.book_id:
+        refs.append(f"book:{instance.book_id}")
+    if instance.chapter_id:
+        refs.append(f"chapter:{instance.chapter_id}")
+    if instance.playlist_id:
+        refs.append(f"playlist:{instance.playlist_id}")
+    _bump_on_commit(*refs)
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def bump_on_like(sender, instance: Like, **kwargs) -> None:
+    if instance.music_recommendation_id:
+        row = (
+            MusicRecommendation.objects.filter(pk=instance.music_recommendation_id)
+            .values_list("chapter_id", "chapter__book_id")
+            .first()
+        )
+        if row is not None:
+            _bump_on_commit("music", f"chapter:{row[0]}", f"book:{row[1]}")
+    elif instance.playlist_id:
+        playlist = Playlist.objects.filter(pk=instance.playlist_id).only("book_id", "chapter_id").first()
+        if playlist is not None:
+            _bump_on_commit(*_playlist_refs(playlist))
+
+
+# ── Reference data ───────────────────────────────────────────────────────────
+
+def _invalidate_refdata_on_commit(*keys: str) -> None:
+    from . import refdata
+
+    transaction.on_commit(lambda: refdata.invalidate(*keys))
+
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def invalidate_refdata_on_language(sender, instance: Language, **kwargs) -> None:
+    from . import refdata
+
+    # Cached names are keyed by language code, so a renamed code touches them all.
+    keys = [refdata.language_key(instance.code)]
+    keys += [refdata.genre_key(pk) for pk in Genre.objects.values_list("pk", flat=True)]
+    keys += [refdata.author_key(pk) for pk in Author.objects.values_list("pk", flat=True)]
+    _invalidate_refdata_on_commit(*keys)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_refdata_on_genre(sender, instance: Genre, **kwargs) -> None:
+    from . import refdata
+
+    _invalidate_refdata_on_commit(refdata.genre_key(instance.pk))
+
+
+@receiver(post_save, sender=GenreTranslation)
+@receiver(post_delete, sender=GenreTranslation)
+def invalidate_refdata_on_genre_translation(sender, instance: GenreTranslation, **kwargs) -> None:
+    from . import refdata
+
+    _invalidate_refdata_on_commit(refdata.genre_key(instance.genre_id))
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_refdata_on_author(sender, instance: Author, **kwargs) -> None:
+    from . import refdata
+
+    _invalidate_refdata_on_commit(refdata.author_key(instance.pk))
+
+
+@receiver(post_save, sender=AuthorTranslation)
+@receiver(post_delete, sender=AuthorTranslation)
+def invalidate_refdata_on_author_translation(sender, instance: AuthorTranslation, **kwargs) -> None:
+    from . import refdata
+
+    _invalidate_refdata_on_commit(refdata.author_key(instance.author_id))
+
+
+# ── Real-time events ─────────────────────────────────────────────────────────
+
+@receiver(post_save, sender=Notification)
+def publish_on_notification(sender, instance: Notification, created: bool, **kwargs) -> None:
+    # Bulk-written like notifications are published by core.notifications.
+    if created:
+        from .realtime import publish_notification
+
+        transaction.on_commit(lambda: publish_notification(instance))
+
+
+@receiver(post_save, sender=Like)
+def publish_on_like(sender, instance: Like, created: bool, **kwargs) -> None:
+    if created and instance.music_recommendation_id:
+        from .realtime import publish_like
+
+        track_id = instance.music_recommendation_id
+        transaction.on_commit(lambda: publish_like(track_id, 1))
+
+
+@receiver(post_delete, sender=Like)
+def publish_on_unlike(sender, instance: Like, **kwargs) -> None:
+    if instance.music_recommendation_id:
+        from .realtime import publish_like
 
-    Notification.objects.create(
-        recipient=recipient,
-        type=Notification.TYPE_COMMENT_REPLY,
-        content_type=ContentType.objects.get_for_model(instance),
-        object_id=instance.pk,
-    )
+        track_id = instance.music_recommendation_id
+        transaction.on_commit(lambda: publish_like(track_id, -1))
@@ -0,0 +1,24 @@
+// Live updates from /events/ (Server-Sent Events): like counts for the
+// tracks of the chapter on the page, and the user's new notifications,
+// re-dispatched as a `songstery:notification` DOM event.
+const chapterId = document.currentScript?.dataset.chapter;
+
+if (window.EventSource) {
+    const query = chapterId ? `?chapter=${encodeURIComponent(chapterId)}` : '';
+    const source = new EventSource(`/events/${query}`);
+
+    source.addEventListener('likes', (e) => {
+        const data = JSON.parse(e.data);
+        document
+            .querySelectorAll(`.like-count[data-music-id="${data.track}"]`)
+            .forEach((el) => {
+                el.textContent = data.likes_count;
+            });
+    });
+
+    source.addEventListener('notification', (e) => {
+        document.dispatchEvent(
+            new CustomEvent('songstery:notification', { detail: JSON.parse(e.data) })
+        );
+    });
+}
@@ -20,7 +20,7 @@ if (trackInput && resultsBox) {
         debounceTimer = setTimeout(async () => {
             try {
                 const response = await fetch(
-                    `/youtube-search/?q=${encodeURIComponent(query)}`
+                    `/api/v1/search/music/all/?q=${encodeURIComponent(query)}`
                 );
                 if (!response.ok) return;
                 const data = await response.json();
@@ -47,12 +47,13 @@ function renderResults(results) {
     resultsBox.innerHTML = results
         .map(
             (r) => `
-        <div class="yt-result" data-id="${escHtml(r.id)}"
-             data-title="${escHtml(r.title)}" data-channel="${escHtml(r.channel)}">
-            <img src="${escHtml(r.thumbnail)}" width="60" height="45" loading="lazy">
+        <div class="yt-result" data-title="${escHtml(r.title)}" data-artist="${escHtml(r.artist)}"
+             data-link-type="${escHtml(r.link_type)}" data-link-url="${escHtml(r.link_url)}"
+             data-embed="${escHtml(r.embed_code)}">
+            <img src="${escHtml(r.cover_url)}" width="60" height="45" loading="lazy">
             <div class="yt-result__body">
                 <div class="yt-result__title">${escHtml(r.title)}</div>
-                <div class="yt-result__channel">${escHtml(r.channel)}</div>
+                <div class="yt-result__channel">${escHtml(r.artist)} · ${r.sources.map(escHtml).join(', ')}</div>
             </div>
         </div>
     `
@@ -65,12 +66,12 @@ function renderResults(results) {
 }
 
 function selectResult(el) {
-    const { id, title, channel } = el.dataset;
+    const { title, artist, linkType, linkUrl, embed } = el.dataset;
     if (trackInput) trackInput.value = title;
-    if (artistInput) artistInput.value = channel;
-    if (embedInput) embedInput.value = id;
-    if (linkInput) linkInput.value = `https://www.youtube.com/watch?v=${id}`;
-    if (linkTypeInput) linkTypeInput.value = 'youtube';
+    if (artistInput) artistInput.value = artist;
+    if (embedInput) embedInput.value = embed;
+    if (linkInput) linkInput.value = linkUrl;
+    if (linkTypeInput) linkTypeInput.value = linkType;
     resultsBox.innerHTML = '';
 }
 
@@ -0,0 +1,236 @@
+"""
+Typeahead suggestions for books, authors and genres.
+
+Every indexed item (``book:<pk>``, ``author:<pk>``, ``genre:<pk>``) is added
+to one Redis sorted set per prefix of each of its names (and of every word
+inside a name), scored by popularity — ``views_count`` for books and the
+summed views of published books for authors and genres. A lookup is then a
+``ZREVRANGE`` per type plus one ``HMGET`` for the display data, all in a
+single pipeline round trip.
+
+The index is updated incrementally from ``core.signals`` when translations
+or books change, and rebuilt wholesale by ``manage.py rebuild_suggest_index``
+(run it periodically so weights follow ``views_count``). Without Redis,
+``suggest`` falls back to ``istartswith`` queries.
+"""
+from __future__ import annotations
+
+import json
+import re
+import time
+from collections.abc import Iterable
+
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+from redis.exceptions import RedisError
+
+from core.models import Author, AuthorTranslation, Book, BookTranslation, Genre, GenreTranslation
+from core.utils.redis_client import get_redis
+
+TYPES = ("book", "author", "genre")
+
+_PREFIX_KEY = "suggest:{type}:{prefix}"
+_ITEM_KEYS = "suggest:keys:{member}"
+_ITEMS_HASH = "suggest:items"
+_MAX_PREFIX = 20
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    return _SPACE_RE.sub(" ", text.lower()).strip()
+
+
+def _prefixes(names: Iterable[str]) -> set[str]:
+    prefixes: set[str] = set()
+    for name in names:
+        normalized = normalize(name)
+        starts = [0] + [m.end() for m in _SPACE_RE.finditer(normalized)]
+        for start in starts:
+            tail = normalized[start:start + _MAX_PREFIX]
+            prefixes.update(tail[:end] for end in range(1, len(tail) + 1))
+    return prefixes
+
+
+# ── Indexing ─────────────────────────────────────────────────────────────────
+
+def _add(pipe, kind: str, pk: int, names: list[str], weight: float, data: dict | None, staging: str = "") -> list[str]:
+    """Queue the keys for one item, each written as *staging* + its name; returns the names."""
+    member = f"{kind}:{pk}"
+    keys_key = _ITEM_KEYS.format(member=member)
+    new_keys = [_PREFIX_KEY.format(type=kind, prefix=prefix) for prefix in _prefixes(names)]
+    for key in new_keys:
+        pipe.zadd(staging + key, {member: weight})
+    if new_keys:
+        pipe.sadd(staging + keys_key, *new_keys)
+        new_keys.append(keys_key)
+    pipe.hset(staging + _ITEMS_HASH, member, json.dumps({**(data or {}), "type": kind, "names": names}))
+    return new_keys + [_ITEMS_HASH]
+
+
+def _write(pipe, kind: str, pk: int, names: list[str], weight: float | None, data: dict | None, old_keys) -> None:
+    member = f"{kind}:{pk}"
+    for key in old_keys:
+        pipe.zrem(key, member)
+    pipe.delete(_ITEM_KEYS.format(member=member))
+    pipe.hdel(_ITEMS_HASH, member)
+    if weight is not None:
+        _add(pipe, kind, pk, names, weight, data)
+
+
+def _apply(entries: list[tuple[str, int, list[str], float | None, dict | None]]) -> int:
+    """Replace the index entries for ``(kind, pk, names, weight, data)``; weight None removes."""
+    conn = get_redis()
+    if conn is None or not entries:
+        return 0
+    try:
+        read = conn.pipeline(transaction=False)
+        for kind, pk, *_ in entries:
+            read.smembers(_ITEM_KEYS.format(member=f"{kind}:{pk}"))
+        old = read.execute()
+
+        write = conn.pipeline()
+        for (kind, pk, names, weight, data), old_keys in zip(entries, old):
+            _write(write, kind, pk, names, weight, data, old_keys)
+        write.execute()
+    except RedisError:
+        return 0
+    return len(entries)
+
+
+def _book_entries(ids: list[int]) -> list:
+    books = {
+        b.pk: b
+        for b in Book.objects.filter(pk__in=ids).prefetch_related("translations__language")
+    }
+    entries = []
+    for pk in ids:
+        book = books.get(pk)
+        if book is None or not book.is_approved:
+            entries.append(("book", pk, [], None, None))
+            continue
+        names = [t.title for t in book.translations.all() if t.title]
+        entries.append(("book", pk, names, book.views_count, {"slug": book.slug, "label": book.get_title()}))
+    return entries
+
+
+def _related_entries(kind: str, model, ids: list[int]) -> list:
+    objects = model.objects.filter(pk__in=ids).annotate(
+        weight=Coalesce(Sum("books__views_count", filter=Q(books__is_approved=True)), 0)
+    ).prefetch_related("translations__language")
+    found = {obj.pk: obj for obj in objects}
+    entries = []
+    for pk in ids:
+        obj = found.get(pk)
+        if obj is None:
+            entries.append((kind, pk, [], None, None))
+            continue
+        names = [t.name for t in obj.translations.all() if t.name]
+        entries.append((kind, pk, names, obj.weight, {"slug": obj.slug, "label": obj.get_name()}))
+    return entries
+
+
+def index_books(book_ids: Iterable[int]) -> int:
+    return _apply(_book_entries(list(book_ids)))
+
+
+def index_authors(author_ids: Iterable[int]) -> int:
+    return _apply(_related_entries("author", Author, list(author_ids)))
+
+
+def index_genres(genre_ids: Iterable[int]) -> int:
+    return _apply(_related_entries("genre", Genre, list(genre_ids)))
+
+
+def rebuild() -> int:
+    """Rebuild the whole index from the database; returns the number of indexed items."""
+    conn = get_redis()
+    if conn is None:
+        return 0
+
+    entries = [
+        entry
+        for entry in (
+            _book_entries(list(Book.published.values_list("pk", flat=True)))
+            + _related_entries("author", Author, list(Author.objects.values_list("pk", flat=True)))
+            + _related_entries("genre", Genre, list(Genre.objects.values_list("pk", flat=True)))
+        )
+        if entry[3] is not None  # deleted since the pks were read
+    ]
+
+    # Build under temporary names and swap in, so lookups never see a half-built index.
+    staging = f"suggest:rebuild:{int(time.time())}:"
+    built: set[str] = set()
+    pipe = conn.pipeline(transaction=False)
+    for kind, pk, names, weight, data in entries:
+        built.update(_add(pipe, kind, pk, names, weight, data, staging))
+    pipe.execute()
+
+    pipe = conn.pipeline()
+    for key in conn.scan_iter(match="suggest:*", count=1000):
+        key = key.decode() if isinstance(key, bytes) else key
+        if key not in built and not key.startswith("suggest:rebuild:"):
+            pipe.unlink(key)
+    for key in built:
+        pipe.rename(staging + key, key)
+    pipe.execute()
+    return len(entries)
+
+
+# ── Querying ─────────────────────────────────────────────────────────────────
+
+def _label(item: dict, prefix: str) -> str:
+    for name in item.get("names", []):
+        if normalize(name).startswith(prefix) or f" {prefix}" in normalize(name):
+            return name
+    return item.get("label", "")
+
+
+def _suggest_db(prefix: str, limit: int) -> list[dict]:
+    books = (
+        BookTranslation.objects.filter(book__is_approved=True, title__istartswith=prefix)
+        .select_related("book")
+        .order_by("-book__views_count")[:limit]
+    )
+    authors = AuthorTranslation.objects.filter(name__istartswith=prefix).select_related("author")[:limit]
+    genres = GenreTranslation.objects.filter(name__istartswith=prefix).select_related("genre")[:limit]
+
+    results: list[dict] = []
+    seen: set[str] = set()
+    rows = (
+        [("book", t.book_id, t.book.slug, t.title) for t in books]
+        + [("author", t.author_id, t.author.slug, t.name) for t in authors]
+        + [("genre", t.genre_id, t.genre.slug, t.name) for t in genres]
+    )
+    for kind, pk, slug, label in rows:
+        if f"{kind}:{pk}" not in seen:
+            seen.add(f"{kind}:{pk}")
+            results.append({"type": kind, "slug": slug, "label": label})
+    return results
+
+
+def suggest(query: str, limit: int = 5) -> list[dict]:
+    """Top *limit* books, then authors, then genres whose names start with *query*."""
+    prefix = normalize(query)[:_MAX_PREFIX]
+    if not prefix:
+        return []
+
+    conn = get_redis()
+    if conn is None:
+        return _suggest_db(prefix, limit)
+
+    try:
+        pipe = conn.pipeline(transaction=False)
+        for kind in TYPES:
+            pipe.zrevrange(_PREFIX_KEY.format(type=kind, prefix=prefix), 0, limit - 1)
+        members = [m for ranked in pipe.execute() for m in ranked]
+        payloads = conn.hmget(_ITEMS_HASH, members) if members else []
+    except RedisError:
+        return _suggest_db(prefix, limit)
+
+    results = []
+    for payload in payloads:
+        if payload is None:
+            continue
+        item = json.loads(payload)
+        results.append({"type": item["type"], "slug": item["slug"], "label": _label(item, prefix)})
+    return results
@@ -0,0 +1,251 @@
+"""
+Tests for ``core.utils.http`` against a local ``http.server`` fake
+upstream, so retries, timeouts, backoff, keep-alive, the breaker and the
+async client's HTTP/1.1 parsing run over real sockets without reaching
+Spotify, Open Library or YouTube.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core.utils.breaker import get_breaker
+from core.utils.http import AsyncHttpClient, HttpClient, HttpError
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "http-tests"}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Routes by path:
+
+    * ``/ok``                 — 200 with a Content-Length JSON body;
+    * ``/status/<n>/<code>``  — *code* for the first *n* hits, then 200;
+    * ``/retry-after``        — 429 with ``Retry-After: 0`` once, then 200;
+    * ``/slow``               — answers after ``server.slow_delay`` seconds;
+    * ``/chunked``            — chunked transfer encoding;
+    * ``/close``              — body delimited by closing the connection.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _hit(self) -> int:
+        with self.server.lock:
+            self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+            return self.server.hits[self.path]
+
+    def _send(self, status: int, body: bytes = b'{"ok": true}', headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        hits = self._hit()
+        if self.path == "/ok":
+            self._send(200)
+        elif self.path.startswith("/status/"):
+            _, _, failures, code = self.path.split("/")
+            self._send(int(code) if hits <= int(failures) else 200)
+        elif self.path == "/retry-after":
+            self._send(429 if hits == 1 else 200, headers={"Retry-After": "0"})
+        elif self.path == "/slow":
+            time.sleep(self.server.slow_delay)
+            self._send(200)
+        elif self.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b'{"parts": ', b'["a", "b"]', b"}"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path == "/close":
+            self.send_response(200)
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(b'{"closed": true}')
+            self.close_connection = True
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+    def do_POST(self):
+        self._hit()
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send(503)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.hits: dict[str, int] = {}
+        self.slow_delay = 1.0
+
+    def handle_error(self, request, client_address):
+        pass  # clients that timed out hang up mid-response
+
+
+class FakeUpstream:
+    """A threaded fake upstream on a free local port."""
+
+    def __init__(self) -> None:
+        self.server = _Server()
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def __enter__(self) -> "FakeUpstream":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def hits(self, path: str) -> int:
+        return self.server.hits.get(path, 0)
+
+    @property
+    def connections(self) -> int:
+        return self.server.connections
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class HttpClientTests(SimpleTestCase):
+    def setUp(self):
+        self.upstream = FakeUpstream().__enter__()
+        self.addCleanup(self.upstream.__exit__)
+        self.client = HttpClient(backoff=0.01, timeout=2.0)
+        # A fresh breaker per test: the name is part of its cache keys.
+        self.name = f"fake-{self._testMethodName}"
+
+    def get(self, path: str, **kwargs):
+        return self.client.get(self.upstream.url(path), upstream=self.name, **kwargs)
+
+    def test_keep_alive_reuses_the_connection(self):
+        for _ in range(3):
+            self.assertEqual(self.get("/ok").json(), {"ok": True})
+        self.assertEqual(self.upstream.connections, 1)
+
+    def test_retries_5xx_then_succeeds(self):
+        response = self.get("/status/2/503")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.upstream.hits("/status/2/503"), 3)
+        self.assertEqual(self.client.stats()[self.name]["retries"], 2)
+
+    def test_gives_up_after_retries(self):
+        with self.assertRaises(HttpError) as ctx:
+            self.get("/status/9/500", retries=2)
+        self.assertEqual(ctx.exception.status, 500)
+        self.assertEqual(self.upstream.hits("/status/9/500"), 3)
+
+    def test_client_errors_are_not_retried(self):
+        with self.assertRaises(HttpError) as ctx:
+            self.get("/missing")
+        self.assertEqual(ctx.exception.status, 404)
+        self.assertEqual(self.upstream.hits("/missing"), 1)
+
+    def test_post_is_not_retried(self):
+        with self.assertRaises(HttpError):
+            self.client.post(self.upstream.url("/submit"), data=b"x", upstream=self.name)
+        self.assertEqual(self.upstream.hits("/submit"), 1)
+
+    def test_honours_retry_after(self):
+        self.client.backoff = 10  # would stall the test if Retry-After were ignored
+        started = time.monotonic()
+        self.assertEqual(self.get("/retry-after").status, 200)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_timeout_raises_without_status(self):
+        started = time.monotonic()
+        with self.assertRaises(HttpError) as ctx:
+            self.get("/slow", timeout=0.2, retries=0)
+        self.assertIsNone(ctx.exception.status)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_timeout_is_retried(self):
+        self.upstream.server.slow_delay = 0.3
+        with self.assertRaises(HttpError):
+            self.get("/slow", timeout=0.1, retries=1)
+        self.assertEqual(self.upstream.hits("/slow"), 2)
+
+    def test_backoff_doubles_per_attempt(self):
+        client = HttpClient(backoff=0.5)
+        with mock.patch("core.utils.http.random.random", return_value=0.5):
+            self.assertEqual([client._delay(attempt, None) for attempt in range(3)], [0.5, 1.0, 2.0])
+        self.assertEqual(client._delay(0, "3"), 3.0)
+        self.assertEqual(client._delay(0, "120"), 5.0)  # capped
+
+    def test_open_breaker_fails_fast(self):
+        get_breaker(self.name).trip()
+        with self.assertRaises(HttpError) as ctx:
+            self.get("/ok")
+        self.assertTrue(ctx.exception.circuit_open)
+        self.assertEqual(self.upstream.hits("/ok"), 0)
+
+    def test_failures_trip_the_breaker(self):
+        breaker = get_breaker(self.name)
+        for _ in range(breaker.failure_threshold):
+            with self.assertRaises(HttpError):
+                self.get("/status/99/502", retries=0)
+        self.assertEqual(breaker.state()["state"], "open")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AsyncHttpClientTests(SimpleTestCase):
+    def setUp(self):
+        self.upstream = FakeUpstream().__enter__()
+        self.addCleanup(self.upstream.__exit__)
+        self.client = AsyncHttpClient(backoff=0.01, timeout=2.0)
+        self.name = f"fake-async-{self._testMethodName}"
+
+    async def get(self, path: str, **kwargs):
+        return await self.client.get(self.upstream.url(path), upstream=self.name, **kwargs)
+
+    async def test_content_length_body(self):
+        response = await self.get("/ok")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertEqual(response.json(), {"ok": True})
+
+    async def test_chunked_body(self):
+        response = await self.get("/chunked")
+        self.assertEqual(response.json(), {"parts": ["a", "b"]})
+
+    async def test_body_until_close(self):
+        self.assertEqual((await self.get("/close")).json(), {"closed": True})
+        self.assertEqual((await self.get("/close")).json(), {"closed": True})
+        self.assertEqual(self.upstream.connections, 2)  # not put back in the pool
+
+    async def test_keep_alive_reuses_the_connection(self):
+        # A chunked body read to the end leaves the connection ready for the next response.
+        for path in ("/ok", "/chunked", "/ok", "/chunked"):
+            self.assertEqual((await self.get(path)).status, 200)
+        self.assertEqual(self.upstream.connections, 1)
+
+    async def test_retries_5xx_then_succeeds(self):
+        self.assertEqual((await self.get("/status/1/503")).status, 200)
+        self.assertEqual(self.upstream.hits("/status/1/503"), 2)
+
+    async def test_timeout_raises_without_status(self):
+        with self.assertRaises(HttpError) as ctx:
+            await self.get("/slow", timeout=0.2, retries=0)
+        self.assertIsNone(ctx.exception.status)
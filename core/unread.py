@@ -0,0 +1,136 @@
+"""
+Per-user unread notification counts kept in Redis, so the badge poll
+(``/notifications/count/``) is one GET instead of a COUNT over the
+user's notifications.
+
+The counter counts unread *rows* (a coalesced "12 people liked your
+track" is one). It is adjusted after commit wherever rows are created or
+marked read — ``core.notifications`` and ``Notification.mark_all_read`` /
+``mark_read`` — and recomputed from the table by ``reconcile()``
+(``manage.py reconcile_unread_counts``, run periodically) to repair
+drift. A missing counter (first use, evicted, or dropped after going
+negative) is seeded from the table on the next ``Notification.unread_count``
+call, or by a queued job when read through ``peek`` (callers that must
+not show a wrong badge then fall back to ``unread_count``).
+
+Without Redis every read falls back to counting the table.
+"""
+from __future__ import annotations
+
+import logging
+
+from django.db import transaction
+from django.db.models import Count
+from redis.exceptions import RedisError
+
+from core.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+_KEY = "notifications:unread:{user_id}"
+_SEED_GUARD_KEY = "notifications:unread:seeding:{user_id}"
+_SEED_GUARD_TTL = 60
+_RECONCILE_BATCH_SIZE = 1000
+
+
+def adjust(user_id: int, delta: int) -> None:
+    """Add *delta* to *user_id*'s counter once the current transaction commits."""
+    if delta:
+        transaction.on_commit(lambda: _adjust(user_id, delta))
+
+
+def _adjust(user_id: int, delta: int) -> None:
+    conn = get_redis()
+    if conn is None:
+        return
+    key = _KEY.format(user_id=user_id)
+    try:
+        # Only counters that exist: incrementing a missing one would start it from zero.
+        pipe = conn.pipeline(transaction=False)
+        pipe.exists(key)
+        pipe.incrby(key, delta)
+        existed, value = pipe.execute()
+        if not existed or value < 0:
+            conn.delete(key)  # re-seeded from the table on next read
+    except RedisError:
+        logger.warning("Unread counter for user %s unavailable", user_id)
+
+
+def get(user_id: int) -> int | None:
+    """The cached count, or None if there is none."""
+    conn = get_redis()
+    if conn is None:
+        return None
+    try:
+        value = conn.get(_KEY.format(user_id=user_id))
+    except RedisError:
+        logger.warning("Unread counter for user %s unavailable", user_id)
+        return None
+    return None if value is None else int(value)
+
+
+def peek(user_id: int) -> int | None:
+    """``get`` for hot paths that must not query the table: a missing counter is seeded by a job."""
+    value = get(user_id)
+    conn = get_redis()
+    if value is None and conn is not None:
+        try:
+            if conn.set(_SEED_GUARD_KEY.format(user_id=user_id), 1, nx=True, ex=_SEED_GUARD_TTL):
+                from core.jobs import enqueue
+
+                enqueue("seed_unread_count", user_id=user_id)
+        except RedisError:
+            pass
+    return value
+
+
+def store(counts: dict[int, int]) -> None:
+    """Overwrite the counters of the given users."""
+    conn = get_redis()
+    if conn is None or not counts:
+        return
+    try:
+        pipe = conn.pipeline(transaction=False)
+        for user_id, count in counts.items():
+            pipe.set(_KEY.format(user_id=user_id), count)
+        pipe.execute()
+    except RedisError:
+        logger.warning("Could not store %s unread counter(s)", len(counts))
+
+
+def count_from_db(user_ids) -> dict[int, int]:
+    from core.models.notification import Notification
+
+    counts = dict.fromkeys(user_ids, 0)
+    counts.update(
+        Notification.objects.filter(recipient_id__in=counts, is_read=False)
+        .values_list("recipient_id")
+        .annotate(n=Count("pk"))
+    )
+    return counts
+
+
+def reconcile() -> int:
+    """Recompute every existing counter from the table; returns how many were corrected."""
+    conn = get_redis()
+    if conn is None:
+        return 0
+    prefix = _KEY.format(user_id="")
+    suffixes = (
+        (key.decode() if isinstance(key, bytes) else key)[len(prefix):]
+        for key in conn.scan_iter(match=f"{prefix}*", count=_RECONCILE_BATCH_SIZE)
+    )
+    user_ids = [int(suffix) for suffix in suffixes if suffix.isdigit()]
+    corrected = 0
+    for start in range(0, len(user_ids), _RECONCILE_BATCH_SIZE):
+        batch = user_ids[start:start + _RECONCILE_BATCH_SIZE]
+        actual = count_from_db(batch)
+        cached = conn.mget([_KEY.format(user_id=user_id) for user_id in batch])
+        drifted = {
+            user_id: count
+            for (user_id, count), value in zip(actual.items(), cached)
+            if value is None or int(value) != count
+        }
+        store(drifted)
+        corrected += len(drifted)
+    return corrected
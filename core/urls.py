@@ -3,9 +3,11 @@ from django.urls import path
 from core import views
 from core.views.notifications import (
     notification_list,
+    notification_count,
     notification_mark_read,
     notification_mark_all_read,
 )
+from core.views.realtime import event_stream
 
 app_name = "core"
 
@@ -47,12 +49,15 @@ urlpatterns = [
 
     # ── Utilities ─────────────────────────────────────────────────────────
     path("youtube-search/", views.youtube_search, name="youtube_search"),
+    path("youtube-search/async/", views.youtube_search_async, name="youtube_search_async"),
 
     # ── Profile ───────────────────────────────────────────────────────────
     path("profile/", views.profile, name="profile"),
 
     # ── Notifications ─────────────────────────────────────────────────────
     path("notifications/", notification_list, name="notifications"),
+    path("notifications/count/", notification_count, name="notifications_count"),
+    path("events/", event_stream, name="event_stream"),
     path("notifications/<int:pk>/read/", notification_mark_read, name="notification_read"),
     path("notifications/read-all/", notification_mark_all_read, name="notifications_read_all"),
 ]
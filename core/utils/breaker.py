@@ -0,0 +1,107 @@
+"""
+Circuit breakers for third-party upstreams.
+
+State lives in the default cache, so all workers trip and recover
+together: after ``failure_threshold`` failures within ``window`` seconds a
+breaker *opens* and calls fail fast with ``CircuitOpenError`` for
+``reset_timeout`` seconds; it is then *half-open* and lets a single probe
+call through, whose success closes it and whose failure opens it again.
+
+Upstreams are registered once at import time (``register_upstream``) so
+``breaker_states()`` can report on all of them, e.g. for monitoring.
+"""
+from __future__ import annotations
+
+import time
+
+from django.core.cache import cache
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        window: int = 60,
+        reset_timeout: int = 30,
+        probe_timeout: int = 30,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self._open_key = f"breaker:{name}:open_until"
+        self._failures_key = f"breaker:{name}:failures"
+        self._probe_key = f"breaker:{name}:probe"
+
+    def check(self) -> bool:
+        """
+        Raise ``CircuitOpenError`` while the breaker is open; otherwise return
+        whether this call is the half-open probe.
+        """
+        open_until = cache.get(self._open_key)
+        if open_until is None:
+            return False
+        if time.time() < open_until or not cache.add(self._probe_key, 1, self.probe_timeout):
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+        return True
+
+    def record_success(self, probe: bool) -> None:
+        if probe:
+            cache.delete_many([self._open_key, self._failures_key, self._probe_key])
+
+    def record_failure(self, probe: bool) -> None:
+        cache.add(self._failures_key, 0, self.window)
+        try:
+            failures = cache.incr(self._failures_key)
+        except ValueError:
+            failures = 1  # the window expired between add() and incr()
+        if probe or failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self) -> None:
+        # Kept well past reset_timeout: only a successful probe closes the breaker.
+        cache.set(self._open_key, time.time() + self.reset_timeout, self.reset_timeout * 20)
+        cache.delete_many([self._failures_key, self._probe_key])
+
+    def state(self) -> dict:
+        values = cache.get_many([self._open_key, self._failures_key])
+        open_until = values.get(self._open_key)
+        if open_until is None:
+            state = CLOSED
+        elif time.time() < open_until:
+            state = OPEN
+        else:
+            state = HALF_OPEN
+        return {
+            "state": state,
+            "recent_failures": values.get(self._failures_key, 0),
+            "open_until": open_until,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def register_upstream(name: str, **options) -> CircuitBreaker:
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name, **options)
+    return breaker
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    return register_upstream(name)
+
+
+def breaker_states() -> dict[str, dict]:
+    return {name: breaker.state() for name, breaker in sorted(_breakers.items())}
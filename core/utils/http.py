@@ -0,0 +1,526 @@
+"""
+Shared outbound HTTP clients for the third-party APIs (Spotify, Open
+Library, YouTube): ``http_client`` for sync code and ``async_http_client``
+for async views under ASGI.
+
+Built on ``http.client`` and asyncio streams so they need no extra
+dependency:
+
+* connections are kept alive and pooled per scheme/host/port, so repeated
+  calls skip the TCP and TLS handshakes;
+* each host has a cap on concurrent requests (``max_per_host``) — callers
+  beyond it wait for a free slot, up to the request timeout;
+* GET requests are retried with exponential backoff and jitter on
+  connection errors, 429 and 5xx (honouring a short ``Retry-After``);
+* every call goes through the upstream's circuit breaker
+  (``core.utils.breaker``) — requests that still fail after their retries
+  count against it, and while it is open calls fail fast;
+* every call is timed into per-upstream counters, see ``http_stats()``.
+
+Calls are grouped per *upstream* — a name such as ``"spotify"`` that may
+span several hosts — defaulting to the host name.
+
+Responses with a 4xx/5xx status raise ``HttpError`` carrying the status;
+transport failures and open circuits raise it with ``status=None``.
+"""
+from __future__ import annotations
+
+import asyncio
+import http.client
+import json
+import logging
+import queue
+import random
+import ssl
+import threading
+import time
+import urllib.parse
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.utils.breaker import CircuitOpenError, get_breaker
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_IDEMPOTENT_METHODS = {"GET", "HEAD"}
+_MAX_RETRY_AFTER = 5.0
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class HttpError(Exception):
+    def __init__(
+        self,
+        message: str,
+        status: int | None = None,
+        body: bytes = b"",
+        circuit_open: bool = False,
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.body = body
+        self.circuit_open = circuit_open
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+@dataclass
+class UpstreamStats:
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    rejected: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total_ms / self.requests, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "statuses": dict(self.statuses),
+        }
+
+
+class _StatsRegistry:
+    def __init__(self) -> None:
+        self._stats: dict[str, UpstreamStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, upstream: str, started: float, status: int | None) -> None:
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            stats = self._stats.setdefault(upstream, UpstreamStats())
+            stats.requests += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            if status is None or status >= 500:
+                stats.errors += 1
+            if status is not None:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        logger.debug("%s %s in %.1f ms", upstream, status or "error", elapsed_ms)
+
+    def count(self, upstream: str, counter: str) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(upstream, UpstreamStats())
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+
+_stats = _StatsRegistry()
+
+
+@dataclass(frozen=True)
+class _Call:
+    method: str
+    scheme: str
+    host: str
+    port: int | None
+    path: str
+    target: str
+    data: bytes | None
+    headers: dict[str, str]
+    timeout: float
+    retries: int
+    upstream: str
+
+
+class _BaseClient:
+    """Request preparation, breaker, retry policy and accounting shared by both clients."""
+
+    def __init__(
+        self,
+        max_per_host: int = 8,
+        timeout: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.2,
+        user_agent: str = "Songstery/1.0",
+    ) -> None:
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.user_agent = user_agent
+
+    def stats(self) -> dict[str, dict]:
+        return _stats.snapshot()
+
+    def _prepare(
+        self,
+        method: str,
+        url: str,
+        params: dict[str, Any] | None,
+        data: bytes | None,
+        headers: dict[str, str] | None,
+        timeout: float | None,
+        retries: int | None,
+        upstream: str | None,
+    ) -> _Call:
+        parts = urllib.parse.urlsplit(url)
+        target = parts.path or "/"
+        query = "&".join(filter(None, [parts.query, urllib.parse.urlencode(params) if params else ""]))
+        if query:
+            target = f"{target}?{query}"
+        if retries is None:
+            retries = self.retries if method in _IDEMPOTENT_METHODS else 0
+        host = parts.hostname or ""
+        return _Call(
+            method=method,
+            scheme=parts.scheme,
+            host=host,
+            port=parts.port,
+            path=parts.path,
+            target=target,
+            data=data,
+            headers={"User-Agent": self.user_agent, "Accept-Encoding": "identity", **(headers or {})},
+            timeout=self.timeout if timeout is None else timeout,
+            retries=retries,
+            upstream=upstream or host,
+        )
+
+    @staticmethod
+    def _admit(call: _Call) -> bool:
+        """Breaker check; returns whether this call is the half-open probe."""
+        try:
+            return get_breaker(call.upstream).check()
+        except CircuitOpenError as exc:
+            _stats.count(call.upstream, "rejected")
+            raise HttpError(str(exc), circuit_open=True) from exc
+
+    def _after_error(self, call: _Call, exc: HttpError, started: float, attempt: int, probe: bool) -> float:
+        """Account a transport failure; return the delay before retrying or re-raise."""
+        _stats.record(call.upstream, started, None)
+        if attempt >= call.retries:
+            get_breaker(call.upstream).record_failure(probe)
+            raise exc
+        delay = self._delay(attempt, None)
+        logger.info(
+            "%s %s://%s%s failed (%s), retrying in %.2fs",
+            call.method, call.scheme, call.host, call.path, exc, delay,
+        )
+        _stats.count(call.upstream, "retries")
+        return delay
+
+    def _after_response(
+        self, call: _Call, response: HttpResponse, started: float, attempt: int, probe: bool
+    ) -> float | None:
+        """Account a response; None means return it, a number is the delay before retrying."""
+        _stats.record(call.upstream, started, response.status)
+        retryable = response.status in _RETRY_STATUSES
+        if response.status < 400 or not retryable or attempt >= call.retries:
+            # A 4xx other than 429 is our mistake, not the upstream failing.
+            breaker = get_breaker(call.upstream)
+            if retryable:
+                breaker.record_failure(probe)
+            else:
+                breaker.record_success(probe)
+            if response.status < 400:
+                return None
+            raise HttpError(
+                f"{call.method} {call.host}{call.path} returned {response.status}",
+                status=response.status,
+                body=response.body,
+            )
+        _stats.count(call.upstream, "retries")
+        return self._delay(attempt, response.headers.get("retry-after"))
+
+    def _delay(self, attempt: int, retry_after: str | None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), _MAX_RETRY_AFTER)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+
+# ── Sync client ──────────────────────────────────────────────────────────────
+
+class _HostPool:
+    """Idle keep-alive connections to one origin plus its concurrency limit."""
+
+    def __init__(self, scheme: str, host: str, port: int | None, max_size: int) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def acquire(self, timeout: float) -> None:
+        if not self._slots.acquire(timeout=timeout):
+            raise HttpError(f"No free connection to {self.host} within {timeout}s")
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def checkout(self, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        """An idle connection if there is one (``reused=True``), else a new one."""
+        try:
+            conn = self._idle.get_nowait()
+            reused = True
+        except queue.Empty:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = cls(self.host, self.port, timeout=timeout)
+            reused = False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, reused
+
+    def checkin(self, conn: http.client.HTTPConnection) -> None:
+        self._idle.put(conn)
+
+
+class HttpClient(_BaseClient):
+    def __init__(self, **options) -> None:
+        super().__init__(**options)
+        self._pools: dict[tuple[str, str, int | None], _HostPool] = {}
+        self._pools_lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("POST", url, **kwargs)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict[str, Any] | None = None,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        upstream: str | None = None,
+    ) -> HttpResponse:
+        call = self._prepare(method, url, params, data, headers, timeout, retries, upstream)
+        probe = self._admit(call)
+        pool = self._pool(call)
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = self._send(pool, call)
+            except HttpError as exc:
+                delay = self._after_error(call, exc, started, attempt, probe)
+            else:
+                delay = self._after_response(call, response, started, attempt, probe)
+                if delay is None:
+                    return response
+            attempt += 1
+            time.sleep(delay)
+
+    def _pool(self, call: _Call) -> _HostPool:
+        key = (call.scheme, call.host, call.port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.setdefault(key, _HostPool(call.scheme, call.host, call.port, self.max_per_host))
+        return pool
+
+    @staticmethod
+    def _send(pool: _HostPool, call: _Call) -> HttpResponse:
+        pool.acquire(call.timeout)
+        try:
+            while True:
+                conn, reused = pool.checkout(call.timeout)
+                try:
+                    conn.request(call.method, call.target, body=call.data, headers=call.headers)
+                    raw = conn.getresponse()
+                    body = raw.read()
+                except (OSError, http.client.HTTPException) as exc:
+                    conn.close()
+                    if reused and not isinstance(exc, TimeoutError):
+                        continue  # the server closed an idle keep-alive connection; dial again
+                    raise HttpError(f"{call.method} {pool.host}: {exc}") from exc
+                if raw.will_close:
+                    conn.close()
+                else:
+                    pool.checkin(conn)
+                return HttpResponse(
+                    status=raw.status,
+                    headers={name.lower(): value for name, value in raw.getheaders()},
+                    body=body,
+                )
+        finally:
+            pool.release()
+
+
+# ── Async client ─────────────────────────────────────────────────────────────
+
+_Stream = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class _AsyncHostPool:
+    def __init__(self, scheme: str, host: str, port: int | None, max_size: int) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port or _DEFAULT_PORTS.get(scheme, 80)
+        self.slots = asyncio.Semaphore(max_size)
+        self._idle: list[_Stream] = []
+
+    async def checkout(self) -> tuple[_Stream, bool]:
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return (reader, writer), True
+            writer.close()
+        context = ssl.create_default_context() if self.scheme == "https" else None
+        stream = await asyncio.open_connection(
+            self.host, self.port, ssl=context, server_hostname=self.host if context else None
+        )
+        return stream, False
+
+    def checkin(self, stream: _Stream) -> None:
+        self._idle.append(stream)
+
+
+class AsyncHttpClient(_BaseClient):
+    """
+    Same behaviour as ``HttpClient`` on asyncio streams (HTTP/1.1 with
+    Content-Length or chunked bodies), so async views wait on upstreams
+    without holding a thread. Pools are kept per event loop.
+
+    Breaker and cache checks stay synchronous: they are sub-millisecond
+    Redis round trips, unlike the upstream calls they guard.
+    """
+
+    def __init__(self, **options) -> None:
+        super().__init__(**options)
+        self._pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict] = weakref.WeakKeyDictionary()
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict[str, Any] | None = None,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        upstream: str | None = None,
+    ) -> HttpResponse:
+        call = self._prepare(method, url, params, data, headers, timeout, retries, upstream)
+        probe = self._admit(call)
+        pool = self._pool(call)
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = await self._send(pool, call)
+            except HttpError as exc:
+                delay = self._after_error(call, exc, started, attempt, probe)
+            else:
+                delay = self._after_response(call, response, started, attempt, probe)
+                if delay is None:
+                    return response
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _pool(self, call: _Call) -> _AsyncHostPool:
+        pools = self._pools.setdefault(asyncio.get_running_loop(), {})
+        key = (call.scheme, call.host, call.port)
+        if key not in pools:
+            pools[key] = _AsyncHostPool(call.scheme, call.host, call.port, self.max_per_host)
+        return pools[key]
+
+    async def _send(self, pool: _AsyncHostPool, call: _Call) -> HttpResponse:
+        try:
+            await asyncio.wait_for(pool.slots.acquire(), call.timeout)
+        except asyncio.TimeoutError:
+            raise HttpError(f"No free connection to {pool.host} within {call.timeout}s") from None
+        try:
+            while True:
+                stream, reused = None, False
+                try:
+                    stream, reused = await asyncio.wait_for(pool.checkout(), call.timeout)
+                    response, keep_alive = await asyncio.wait_for(self._exchange(pool, call, *stream), call.timeout)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as exc:
+                    if stream is not None:
+                        stream[1].close()
+                    if reused and not isinstance(exc, asyncio.TimeoutError):
+                        continue  # the server closed an idle keep-alive connection; dial again
+                    raise HttpError(f"{call.method} {pool.host}: {exc!r}") from exc
+                if keep_alive:
+                    pool.checkin(stream)
+                else:
+                    stream[1].close()
+                return response
+        finally:
+            pool.slots.release()
+
+    @staticmethod
+    async def _exchange(
+        pool: _AsyncHostPool,
+        call: _Call,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> tuple[HttpResponse, bool]:
+        host = pool.host if pool.port == _DEFAULT_PORTS.get(pool.scheme) else f"{pool.host}:{pool.port}"
+        lines = [f"{call.method} {call.target} HTTP/1.1", f"Host: {host}"]
+        lines += [f"{name}: {value}" for name, value in call.headers.items()]
+        if call.data is not None:
+            lines.append(f"Content-Length: {len(call.data)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (call.data or b""))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before the response")
+        version, status, *_ = status_line.decode("latin-1").split(" ", 2)
+        headers: dict[str, str] = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            headers[name] = f"{headers[name]}, {value.strip()}" if name in headers else value.strip()
+
+        keep_alive = version != "HTTP/1.0" and headers.get("connection", "").lower() != "close"
+        if call.method == "HEAD" or status in ("204", "304"):
+            body = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while size := int((await reader.readline()).split(b";")[0].strip() or b"0", 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # trailers
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return HttpResponse(status=int(status), headers=headers, body=body), keep_alive
+
+
+http_client = HttpClient()
+async_http_client = AsyncHttpClient()
+
+
+def http_stats() -> dict[str, dict]:
+    """Per-upstream request counts and latencies of both clients in this process."""
+    return _stats.snapshot()
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+
+def get_redis(alias: str = "default") -> Redis | None:
+    """
+    Return the raw Redis client behind the *alias* cache, or ``None`` when
+    that cache is not django-redis (local dev, tests).
+    """
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection(alias)
+    except NotImplementedError:
+        return None
@@ -32,3 +32,12 @@ def generate_unique_slug(model: type[models.Model], text: str, slug_field: str =
         counter += 1
 
     return slug
+
+
+def transliterate(text: str) -> str:
+    """
+    Lower-case ASCII transliteration of *text* with words separated by single
+    spaces — the same transliteration ``generate_unique_slug`` uses, so
+    "Тіні забутих предків" becomes "tini zabutikh predkiv".
+    """
+    return slugify(text, separator=" ", allow_unicode=False)
@@ -0,0 +1,64 @@
+"""
+Version counters for cached content.
+
+A *ref* names something a page or fragment is built from — ``"book:12"``,
+``"chapter:40"``, ``"playlist:7"`` — or a site-wide aggregate such as
+``"catalog"`` (book lists) and ``"music"`` (the home page charts). Cache keys
+embed the current versions of their refs, and ``core.signals`` bumps a ref
+whenever something it covers changes, so stale entries are simply never
+looked up again and expire on their own.
+
+``etag_for`` turns the same versions into a strong HTTP ETag, so API detail
+endpoints can answer ``If-None-Match`` with 304 without building the body.
+
+Versions live in the default cache. A version that was evicted restarts
+from the current time in nanoseconds rather than from 1, so it can never
+repeat a value an old cache entry was keyed with.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.http import quote_etag
+
+_KEY = "version:{ref}"
+
+
+def _key(ref: str) -> str:
+    return _KEY.format(ref=ref)
+
+
+def get_versions(*refs: str) -> dict[str, int]:
+    """Current version of every ref in one cache round trip, initialising missing ones."""
+    keys = {_key(ref): ref for ref in refs}
+    found = cache.get_many(list(keys))
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        for key, value in missing.items():
+            # add() keeps a version another process initialised concurrently.
+            if not cache.add(key, value, timeout=None):
+                missing[key] = cache.get(key, value)
+        found.update(missing)
+    return {ref: found[key] for key, ref in keys.items()}
+
+
+def bump(*refs: str) -> None:
+    for ref in dict.fromkeys(refs):
+        key = _key(ref)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def etag_for(*refs: str, vary: tuple = ()) -> str:
+    """
+    Quoted strong ETag for a representation built from *refs*. *vary* holds
+    anything else the body depends on — language, requesting user, counters
+    read alongside the lookup.
+    """
+    versions = get_versions(*refs)
+    parts = [f"{ref}={versions[ref]}" for ref in sorted(versions)] + [str(value) for value in vary]
+    return quote_etag(hashlib.md5("|".join(parts).encode()).hexdigest())
@@ -8,6 +8,7 @@ from .main import (  # noqa: F401
     follow_user,
     rate_book,
     youtube_search,
+    youtube_search_async,
     add_comment,
     delete_comment,
     create_book,
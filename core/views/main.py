@@ -1,22 +1,28 @@
-import json
-import urllib.parse
-import urllib.request
-
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
-from django.db.models import F, Q
+from django.db.models import Q
 from django.http import Http404, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
+from django.utils.functional import SimpleLazyObject
 from django.http import HttpResponse
 from django.views.generic import DetailView, TemplateView
 from django.views.static import serve
 
+from api.v1.services.youtube import YouTubeError, youtube_client
+from core import leaderboard
+from core.counters import book_views
+from core.facets import genre_facets
+from core.likes import toggle_like
 from core.notifications import notify_admin_new_verification
+from core.page_cache import AnonymousPageCacheMixin
+from core.ratings import set_book_rating
+from core.refdata import get_language
+from core.search import search_books
 from core.utils.slugs import generate_unique_slug
 from core.forms import (
     AuthorVerificationForm,
@@ -39,7 +45,6 @@ from core.models import (
     ChapterTranslation,
     Comment,
     Follow,
-    Language,
     Like,
     MusicRecommendation,
     Playlist,
@@ -57,23 +62,19 @@ _SORT_MAP = {
     "newest": "-created_at",
     "popular": "-views_count",
     "year": "-year",
-    "title": "translations__title",
+    "rating": "-rating_avg",
+    "title": "card_title",
 }
 
 _SORT_OPTIONS = [
     ("newest", "New"),
     ("popular", "Popular"),
     ("year", "By year"),
+    ("rating", "Top rated"),
     ("title", "A–Z"),
 ]
 
 
-# ── Utility ──────────────────────────────────────────────────────────────────
-
-def _get_uk_language():
-    return Language.objects.filter(code="uk").first()
-
-
 # ── Error / utility views ────────────────────────────────────────────────────
 
 def robots_txt(request):
@@ -115,27 +116,39 @@ def signup(request):
 
 # ── Home ─────────────────────────────────────────────────────────────────────
 
-class HomeView(TemplateView):
+def _popular_music(limit: int) -> list[MusicRecommendation]:
+    """Trending tracks, topped up from the all-time board when few tracks were liked recently."""
+    tracks = leaderboard.top_tracks(leaderboard.TRENDING, limit=limit)
+    if len(tracks) < limit:
+        seen = {track.pk for track in tracks}
+        tracks += [
+            track for track in leaderboard.top_tracks(leaderboard.ALL_TIME, limit=limit * 2)
+            if track.pk not in seen
+        ][:limit - len(tracks)]
+    return tracks
+
+
+class HomeView(AnonymousPageCacheMixin, TemplateView):
     template_name = "core/home.html"
+    # Book cards show view counts, which change without a version bump.
+    page_cache_timeout = 60
+
+    def get_page_refs(self) -> dict[str, str]:
+        return {"catalog": "catalog", "music": "music"}
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         search_query = self.request.GET.get("search", "").strip()
         active_genre = self.request.GET.get("genre", "").strip()
-        current_sort = self.request.GET.get("sort", "newest")
+        current_sort = self.request.GET.get("sort", "relevance" if search_query else "newest")
         user = self.request.user
 
         books_qs = Book.published.all() if not (user.is_authenticated and user.is_staff) else Book.objects.all()
+        books_qs = books_qs.with_card_stats()
 
         if search_query:
-            books_qs = books_qs.filter(
-                Q(translations__title__icontains=search_query)
-                | Q(author__translations__name__icontains=search_query)
-                | Q(author_legacy__icontains=search_query)
-                | Q(genre__translations__name__icontains=search_query)
-                | Q(genre_legacy__icontains=search_query)
-            ).distinct()
+            books_qs = search_books(books_qs, search_query)
 
         if active_genre:
             books_qs = books_qs.filter(
@@ -143,8 +156,10 @@ class HomeView(TemplateView):
             ).distinct()
 
         sort_field = _SORT_MAP.get(current_sort, "-created_at")
-        # title sort goes through translation — use stable secondary sort
-        if current_sort == "title":
+        # title sort goes through the resolved translation — use stable secondary sort
+        if current_sort == "relevance" and search_query:
+            books_qs = books_qs.order_by("-search_rank", "-created_at")
+        elif current_sort == "title":
             books_qs = books_qs.order_by(sort_field, "-created_at")
         else:
             books_qs = books_qs.order_by(sort_field)
@@ -159,44 +174,46 @@ class HomeView(TemplateView):
         paginator = Paginator(books_qs, 8)
         page_obj = paginator.get_page(self.request.GET.get("page"))
 
-        # Genre list: prefer translated names, fall back to legacy
-        genres = sorted(set(
-            list(
-                Book.published
-                .exclude(genre__isnull=True)
-                .values_list("genre__translations__name", flat=True)
-                .exclude(genre__translations__name=None)
-            ) + list(
-                Book.published
-                .filter(genre__isnull=True)
-                .exclude(genre_legacy="")
-                .values_list("genre_legacy", flat=True)
-            )
-        ))
-
         context.update({
             "db_books": page_obj,
             "page_obj": page_obj,
             "search_query": search_query,
             "active_genre": active_genre,
             "current_sort": current_sort,
-            "sort_options": _SORT_OPTIONS,
+            "sort_options": ([("relevance", "Relevance")] if search_query else []) + _SORT_OPTIONS,
             "books_section_title": section_title,
-            "genres": genres,
-            "top_music_db": MusicRecommendation.objects.select_related(
-                "user", "chapter__book"
-            ).order_by("-likes_count")[:6],
+            "genres": genre_facets(),
+            "top_music_db": SimpleLazyObject(lambda: _popular_music(6)),
         })
         return context
 
 
 # ── Book detail ──────────────────────────────────────────────────────────────
 
-class BookDetailView(DetailView):
+def _book_catalog_refs(book: Book) -> dict[str, str]:
+    """Refs of the author and genre a book page shows by name."""
+    refs = {}
+    if book.author_id:
+        refs["author"] = f"author:{book.author_id}"
+    if book.genre_id:
+        refs["genre"] = f"genre:{book.genre_id}"
+    return refs
+
+
+class BookDetailView(AnonymousPageCacheMixin, DetailView):
     model = Book
     template_name = "core/book_detail.html"
     context_object_name = "book"
 
+    def get_page_refs(self) -> dict[str, str]:
+        return {"book": f"book:{self.object.pk}", **_book_catalog_refs(self.object)}
+
+    def on_page_view(self) -> None:
+        session_key = f"viewed_book_{self.object.pk}"
+        if not self.request.session.get(session_key):
+            book_views.incr(self.object.pk)
+            self.request.session[session_key] = True
+
     def get_object(self):
         if "slug" in self.kwargs:
             book = get_object_or_404(Book, slug=self.kwargs["slug"])
@@ -211,20 +228,15 @@ class BookDetailView(DetailView):
         book = self.object
         user = self.request.user
 
-        session_key = f"viewed_book_{book.pk}"
-        if not self.request.session.get(session_key):
-            Book.objects.filter(pk=book.pk).update(views_count=F("views_count") + 1)
-            self.request.session[session_key] = True
-
         is_privileged = user.is_authenticated and (user == book.creator or user.is_staff)
         chapters_qs = book.chapters.all() if is_privileged else book.chapters.filter(is_approved=True)
 
         context.update({
             "chapters": chapters_qs,
             "popular_playlists": book.playlists.filter(is_public=True).order_by("-likes_count")[:5],
-            "top_music": MusicRecommendation.objects.filter(
-                chapter__book=book
-            ).order_by("-likes_count")[:10],
+            "top_music": SimpleLazyObject(
+                lambda: leaderboard.top_tracks(leaderboard.ALL_TIME, book_id=book.pk, limit=10)
+            ),
             "comments": book.comments.filter(parent=None).select_related("user").prefetch_related("replies__user"),
             "comment_form": CommentForm(),
             "book_id": book.pk,
@@ -250,14 +262,22 @@ class BookDetailView(DetailView):
 
 # ── Chapter detail ───────────────────────────────────────────────────────────
 
-class ChapterDetailView(DetailView):
+class ChapterDetailView(AnonymousPageCacheMixin, DetailView):
     model = Chapter
     template_name = "core/chapter_detail.html"
     context_object_name = "chapter"
 
+    def get_page_refs(self) -> dict[str, str]:
+        # The book ref covers sibling chapters (prev/next links).
+        return {
+            "chapter": f"chapter:{self.object.pk}",
+            "book": f"book:{self.object.book_id}",
+            **_book_catalog_refs(self.object.book),
+        }
+
     def get_object(self):
         chapter = get_object_or_404(
-            Chapter,
+            Chapter.objects.select_related("book"),
             book_id=self.kwargs["book_id"],
             number=self.kwargs["chapter_num"],
         )
@@ -312,11 +332,14 @@ class ChapterDetailView(DetailView):
 
 # ── Playlist detail ──────────────────────────────────────────────────────────
 
-class PlaylistDetailView(DetailView):
+class PlaylistDetailView(AnonymousPageCacheMixin, DetailView):
     model = Playlist
     template_name = "core/playlist_detail.html"
     context_object_name = "playlist"
 
+    def get_page_refs(self) -> dict[str, str]:
+        return {"playlist": f"playlist:{self.object.pk}", "book": f"book:{self.object.book_id}"}
+
     def get_object(self):
         if "slug" in self.kwargs:
             return get_object_or_404(Playlist, slug=self.kwargs["slug"])
@@ -420,7 +443,7 @@ def rate_book(request, book_id: int):
     if not 1 <= score <= 5:
         messages.error(request, "Rating must be between 1 and 5.")
         return redirect("core:book_detail", pk=book_id)
-    BookRating.objects.update_or_create(user=request.user, book=book, defaults={"score": score})
+    set_book_rating(request.user, book, score)
     return redirect("core:book_detail", pk=book_id)
 
 
@@ -432,37 +455,33 @@ def youtube_search(request):
     if len(query) < 3:
         return JsonResponse({"results": []})
 
-    api_key = getattr(settings, "YOUTUBE_API_KEY", "")
-    if not api_key:
+    if not youtube_client.configured:
         return JsonResponse({"error": "YouTube API key not configured"}, status=503)
 
-    params = urllib.parse.urlencode({
-        "part": "snippet",
-        "type": "video",
-        "maxResults": 5,
-        "q": query,
-        "key": api_key,
-    })
-    url = f"https://www.googleapis.com/youtube/v3/search?{params}"
-
     try:
-        with urllib.request.urlopen(url, timeout=5) as resp:
-            data = json.loads(resp.read())
-    except Exception:
+        videos = youtube_client.search(query, limit=5)
+    except YouTubeError:
         return JsonResponse({"error": "Search failed"}, status=502)
 
-    results = [
-        {
-            "id": item["id"].get("videoId"),
-            "title": item["snippet"].get("title", ""),
-            "channel": item["snippet"].get("channelTitle", ""),
-            "thumbnail": item["snippet"].get("thumbnails", {}).get("default", {}).get("url", ""),
-        }
-        for item in data.get("items", [])
-        if item.get("id", {}).get("videoId")
-    ]
+    return JsonResponse({"results": [video.as_dict() for video in videos]})
+
+
+@youtube_search_limit
+async def youtube_search_async(request):
+    """``youtube_search`` for ASGI: waits on the API without holding a worker thread."""
+    query = request.GET.get("q", "").strip()[:100]
+    if len(query) < 3:
+        return JsonResponse({"results": []})
+
+    if not youtube_client.configured:
+        return JsonResponse({"error": "YouTube API key not configured"}, status=503)
+
+    try:
+        videos = await youtube_client.asearch(query, limit=5)
+    except YouTubeError:
+        return JsonResponse({"error": "Search failed"}, status=502)
 
-    return JsonResponse({"results": results})
+    return JsonResponse({"results": [video.as_dict() for video in videos]})
 
 
 # ── Comments ──────────────────────────────────────────────────────────────────
@@ -526,7 +545,7 @@ def create_book(request):
             book.save()
 
             # Seed initial Ukrainian translation
-            uk = _get_uk_language()
+            uk = get_language("uk")
             if uk:
                 BookTranslation.objects.create(
                     book=book,
@@ -564,7 +583,7 @@ def save_book(request, book_id: int):
 @login_required
 def add_chapters(request, book_id: int):
     book = get_object_or_404(Book, id=book_id)
-    uk = _get_uk_language()
+    uk = get_language("uk")
 
     if request.method == "POST":
         form = BulkChaptersForm(request.POST)
@@ -628,17 +647,10 @@ def like_music(request, music_id: int):
         return HttpResponseNotAllowed(["POST"])
 
     music = get_object_or_404(MusicRecommendation, id=music_id)
-    like, created = Like.objects.get_or_create(user=request.user, music_recommendation=music)
-
-    if created:
-        MusicRecommendation.objects.filter(pk=music_id).update(likes_count=F("likes_count") + 1)
-    else:
-        like.delete()
-        MusicRecommendation.objects.filter(pk=music_id).update(likes_count=F("likes_count") - 1)
+    result = toggle_like(request.user, music)
 
     if request.headers.get("X-Requested-With") == "XMLHttpRequest":
-        music.refresh_from_db(fields=["likes_count"])
-        return JsonResponse({"likes_count": music.likes_count, "liked": created})
+        return JsonResponse({"likes_count": result.likes_count, "liked": result.liked})
 
     return redirect(request.META.get("HTTP_REFERER", "/"))
 
@@ -714,12 +726,7 @@ def like_playlist(request, playlist_id: int):
     if request.method != "POST":
         return HttpResponseNotAllowed(["POST"])
     playlist = get_object_or_404(Playlist, id=playlist_id)
-    like, created = Like.objects.get_or_create(user=request.user, playlist=playlist)
-    if created:
-        Playlist.objects.filter(pk=playlist_id).update(likes_count=F("likes_count") + 1)
-    else:
-        like.delete()
-        Playlist.objects.filter(pk=playlist_id).update(likes_count=F("likes_count") - 1)
+    toggle_like(request.user, playlist)
     return redirect(request.META.get("HTTP_REFERER", "/"))
 
 
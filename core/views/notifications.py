@@ -2,6 +2,7 @@ from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse, HttpResponseNotAllowed
 from django.shortcuts import get_object_or_404
 
+from core import unread
 from core.models.notification import Notification
 
 
@@ -19,6 +20,7 @@ def notification_list(request):
             "type": n.type,
             "type_display": n.get_type_display(),
             "is_read": n.is_read,
+            "count": n.count,
             "created_at": n.created_at.isoformat(),
         }
         for n in notifications
@@ -32,11 +34,20 @@ def notification_mark_read(request, pk: int):
     if request.method != "POST":
         return HttpResponseNotAllowed(["POST"])
     notification = get_object_or_404(Notification, pk=pk, recipient=request.user)
-    notification.is_read = True
-    notification.save(update_fields=["is_read"])
+    notification.mark_read()
     return JsonResponse({"ok": True})
 
 
+@login_required
+def notification_count(request):
+    """Unread count for badge polling, served from the Redis counter; the table is only counted on a miss."""
+    count = unread.peek(request.user.pk)
+    if count is None:
+        # Re-read (an eager seed job has already run), else count the table once rather than report 0.
+        count = Notification.unread_count(request.user)
+    return JsonResponse({"unread_count": count})
+
+
 @login_required
 def notification_mark_all_read(request):
     """Mark all unread notifications for the current user as read."""
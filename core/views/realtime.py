@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+
+from core import realtime
+
+_HEARTBEAT = 15
+_RETRY_MS = 5000
+
+
+async def event_stream(request):
+    """
+    Server-Sent Events: the signed-in user's new notifications and, with
+    ``?chapter=<id>``, live like counts for that chapter's tracks. Only
+    with ``REALTIME_EVENTS`` and under the ASGI server — under WSGI a
+    stream would hold a worker for as long as the page is open.
+    """
+    if not realtime.enabled() or not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    user = await request.auser()
+    channels = []
+    if user.is_authenticated:
+        channels.append(realtime.user_channel(user.pk))
+    chapter = request.GET.get("chapter", "")
+    if chapter.isdigit():
+        channels.append(realtime.chapter_channel(int(chapter)))
+
+    hub = realtime.hub() if channels else None
+    if hub is None:
+        return HttpResponse(status=204)  # nothing to stream; EventSource stops reconnecting
+
+    response = StreamingHttpResponse(_events(hub, channels), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def _events(hub, channels: list[str]):
+    queue = await hub.subscribe(channels)
+    try:
+        yield f"retry: {_RETRY_MS}\n\n"
+        while True:
+            try:
+                data = await asyncio.wait_for(queue.get(), _HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"  # keeps proxies from closing an idle stream
+                continue
+            yield f"event: {json.loads(data)['event']}\ndata: {data}\n\n"
+    finally:
+        await hub.unsubscribe(channels, queue)
@@ -3,6 +3,16 @@ ASGI config for songstery project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with gunicorn and the uvicorn worker (see the README)::
+
+    gunicorn songstery.asgi:application -k uvicorn_worker.UvicornWorker
+
+so the async search endpoints — ``/api/v1/search/all/``,
+``/api/v1/search/{music,books}/async/`` and ``/youtube-search/async/`` —
+wait on Spotify, YouTube and Open Library without holding a thread per
+request, and (with ``REALTIME_EVENTS``) the ``/events/`` Server-Sent
+Events stream (``core.realtime``) can stay open while a page is.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -23,6 +23,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sitemaps",
+    "django.contrib.postgres",
     # Third-party
     "rest_framework",
     "rest_framework_simplejwt",
@@ -138,7 +139,23 @@ CACHES = {
     }
 }
 
+# Buffer likes_count deltas in Redis and apply them via `manage.py flush_counters`
+LIKES_WRITE_BEHIND = env.bool("LIKES_WRITE_BEHIND", default=False)
+
+# Run background jobs (emails, notifications) inline after commit. Set to False once a
+# `manage.py run_jobs` worker is deployed (see README) — otherwise queued jobs never run.
+JOBS_EAGER = env.bool("JOBS_EAGER", default=True)
+
+# Live notifications and like counts over /events/ (Server-Sent Events). Needs the ASGI
+# server (see README): under WSGI every open page would hold a worker.
+REALTIME_EVENTS = env.bool("REALTIME_EVENTS", default=False)
+
+# Read notifications older than this are moved to the archive by `manage.py archive_notifications`
+NOTIFICATION_READ_TTL_DAYS = env.int("NOTIFICATION_READ_TTL_DAYS", default=90)
+
 YOUTUBE_API_KEY = env("YOUTUBE_API_KEY", default="")
+# Data API units per day (search.list costs 100); searches stop at this budget
+YOUTUBE_DAILY_QUOTA = env.int("YOUTUBE_DAILY_QUOTA", default=10000)
 
 SPOTIFY_CLIENT_ID = env("SPOTIFY_CLIENT_ID", default="")
 SPOTIFY_CLIENT_SECRET = env("SPOTIFY_CLIENT_SECRET", default="")